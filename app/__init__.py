@@ -1,69 +1,102 @@
 import os
+import io
 import sys
+import time
 import logging
 import logging.config
-import pkgutil
-import importlib
-import pandas as pd
-from dotenv import load_dotenv
+from contextlib import contextmanager
+from calculator.cache import ResultCache
+from calculator.calculation import Calculation
+from calculator.numeric import NumericMode
 from app.commands import Command, CommandHandler
+from app.history.backends import BACKENDS
+from app.history.store import COLUMNS, HistoryStore
+from app.metrics import METRICS
+from app.plugin_manifest import load_manifest
 from app.plugins.menu import MenuCommand
 
+BATCH_FLUSH_LINES = 1000  # Lines processed between output/history flushes in batch mode
+
 class ShowHistoryManager:
     FILE_PATH = "calculation_history.csv"
-    history_df = pd.DataFrame(columns=["Operation", "Operand1", "Operand2", "Result"])
+    BACKEND = "csv"
+    history_df = None  # Built on demand; pandas is only imported when history is displayed
+    store = None
+
+    @classmethod
+    def get_store(cls) -> HistoryStore:
+        """Return the store backing the history, creating it for the configured backend and path."""
+        if cls.store is None or cls.store.file_path != cls.FILE_PATH or cls.store.backend.name != cls.BACKEND:
+            cls.store = HistoryStore(cls.FILE_PATH, backend=cls.BACKEND)
+        return cls.store
 
     @classmethod
     def load_history(cls):
-        """Load history from a CSV file into a Pandas DataFrame."""
-        if os.path.exists(cls.FILE_PATH):
-            cls.history_df = pd.read_csv(cls.FILE_PATH)
-        else:
-            cls.history_df = pd.DataFrame(columns=["Operation", "Operand1", "Operand2", "Result"])
+        """Load history from the backend into a Pandas DataFrame."""
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        store = cls.get_store()
+        with METRICS.timed("history.load"):
+            store.load()
+        cls.history_df = pd.DataFrame(store.rows, columns=COLUMNS)
 
     @classmethod
-    def show_history(cls):
-        """Display the calculation history in tabular form using Pandas."""
-        cls.load_history()  # Load history to ensure it is up to date
+    def show_history(cls, start: int = 0, count: int = None):
+        """Display the calculation history in tabular form using Pandas.
+
+        ``start`` and ``count`` select a page of rows; a negative start shows the
+        last -start rows. Pages are read from the backend without loading the
+        whole history.
+        """
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        store = cls.get_store()
+        stop = None if count is None or start < 0 else start + count
+        with METRICS.timed("history.read"):
+            rows, total = store.read_range(start, stop)
+        first = max(total + start, 0) if start < 0 else start
+        cls.history_df = pd.DataFrame(rows, columns=COLUMNS, index=range(first, first + len(rows)))
         logging.info("Displaying calculation history.")  # Log message for showing history
         print("\nCalculation History:")
         if cls.history_df.empty:
-            print("No history available.")
+            print("No history available." if total == 0 else f"No rows in that range ({total} rows in history).")
         else:
             print(cls.history_df)
+            if len(rows) < total:
+                print(f"Showing rows {first}-{first + len(rows) - 1} of {total}.")
 
     @classmethod
     def add_calculation(cls, operation, operand1, operand2, result):
-        """Add a new calculation to the history."""
-        new_entry = pd.DataFrame({
-            "Operation": [operation],
-            "Operand1": [operand1],
-            "Operand2": [operand2],
-            "Result": [result]
-        })
-
-        # Only concatenate if history_df is not empty or new_entry contains valid data
-        if not new_entry.isnull().all().all() and not cls.history_df.isnull().all().all():
-            cls.history_df = pd.concat([cls.history_df, new_entry], ignore_index=True)
-        elif not new_entry.isnull().all().all():  # If only new_entry has valid data
-            cls.history_df = new_entry
-
-        cls.history_df.to_csv(cls.FILE_PATH, index=False)  # Save to CSV
+        """Add a new calculation to the history by appending a single record."""
+        with METRICS.timed("history.add"):
+            cls.get_store().append(operation, operand1, operand2, result)
 
     @classmethod
     def delete_calculation(cls, index):
         """Delete a calculation from the history by index."""
-        cls.load_history()  # Load history to ensure it is up to date
-        if index < 0 or index >= len(cls.history_df):
+        store = cls.get_store()
+        with METRICS.timed("history.delete"):
+            deleted_row = store.delete(index)
+        if deleted_row is None:
             logging.error("Invalid index for deletion: %d", index)
-            print(f"Invalid index: {index}. Please provide a valid index between 0 and {len(cls.history_df) - 1}.")
+            print(f"Invalid index: {index}. Please provide a valid index between 0 and {len(store) - 1}.")
             return
 
-        deleted_row = cls.history_df.iloc[index]
-        cls.history_df = cls.history_df.drop(index).reset_index(drop=True)
-        cls.history_df.to_csv(cls.FILE_PATH, index=False)  # Save updated history
-        logging.info("Deleted calculation at index %d: %s", index, deleted_row.to_dict())
-        print(f"Deleted row at index {index}: {deleted_row.to_dict()}")
+        deleted_row = dict(zip(COLUMNS, deleted_row))
+        logging.info("Deleted calculation at index %d: %s", index, deleted_row)
+        print(f"Deleted row at index {index}: {deleted_row}")
+
+    @classmethod
+    def show_summary(cls):
+        """Display count, sum, min, max and mean of the results per operation from the running aggregates."""
+        with METRICS.timed("history.summary"):
+            summary = cls.get_store().summarize()
+        logging.info("Displaying history summary.")
+        if not summary.operations:
+            print("No history available.")
+            return
+        print(f"{'operation':<10} {'count':>8} {'sum':>16} {'min':>16} {'max':>16} {'mean':>16}")
+        for name, stats in sorted(summary.operations.items()):
+            print(f"{name:<10} {stats.count:>8} {stats.total:>16.12g} {stats.minimum:>16.12g} "
+                  f"{stats.maximum:>16.12g} {stats.mean:>16.12g}")
 
 class ClearHistoryManager:
     FILE_PATH = "calculation_history.csv"
@@ -71,29 +104,81 @@ class ClearHistoryManager:
     @classmethod
     def clear_history(cls):
         """Clear the history both in memory and in the file."""
-        if os.path.exists(cls.FILE_PATH):
-            os.remove(cls.FILE_PATH)
+        store = ShowHistoryManager.get_store()
+        if store.backend.exists():
             logging.info("Calculation history cleared.")  # Log message for clearing history
         else:
             logging.warning("Attempted to clear history, but no history file exists.")
+        with METRICS.timed("history.clear"):
+            store.clear()
         print("History cleared.")
 
+class ShowHistoryCommand(Command):
+    """Command to display the calculation history: 'history', 'history <start> <count>' or 'history tail <count>'."""
+
+    def execute(self, *args):
+        """Execute the history command."""
+        try:
+            if not args:
+                ShowHistoryManager.show_history()
+            elif len(args) == 2 and args[0].lower() == "tail" and int(args[1]) > 0:
+                ShowHistoryManager.show_history(-int(args[1]))
+            elif len(args) == 2 and int(args[0]) >= 0 and int(args[1]) >= 0:
+                ShowHistoryManager.show_history(int(args[0]), int(args[1]))
+            else:
+                raise ValueError(args)
+        except ValueError:
+            print("Invalid format. Please use 'history', 'history <start> <count>' or 'history tail <count>'.")
+
+class ClearHistoryCommand(Command):
+    """Command to clear the calculation history ('clear history')."""
+
+    def execute(self, *args):
+        """Execute the clear command."""
+        if list(args) != ["history"]:
+            print("Invalid format. Please use 'clear history'.")
+            return
+        ClearHistoryManager.clear_history()
+
 class DeleteHistoryCommand(Command):
     """Command to delete a specific entry from the calculation history."""
 
-    def execute(self, index):
+    def execute(self, *args):
         """Execute the delete command."""
+        try:
+            index, = args
+            index = int(index)
+        except ValueError:
+            print("Invalid format. Please use 'delete <index>'.")
+            return
         ShowHistoryManager.delete_calculation(index)
 
+class SummaryCommand(Command):
+    """Command to show per-operation totals of the calculation history ('summary')."""
+
+    def execute(self, *args):
+        """Execute the summary command."""
+        if args:
+            print("Invalid format. Please use 'summary'.")
+            return
+        ShowHistoryManager.show_summary()
+
 class App:
     def __init__(self):  # Constructor
         os.makedirs('logs', exist_ok=True)
         self.configure_logging()
-        load_dotenv()
+        self.load_dotenv()
         self.settings = self.load_environment_variables()
         self.settings.setdefault('ENVIRONMENT', 'PRODUCTION')
+        self.configure_log_queue()
         self.command_handler = CommandHandler()
-        ShowHistoryManager.load_history()  # Load history when initializing the app
+        self.configure_cache()
+        self.configure_numeric_mode()
+        self.configure_number_files()
+        self.configure_history()
+        self.history_writer = None
+        self.configure_history_writer()
+        self.configure_metrics()
 
     def configure_logging(self):
         logging_conf_path = 'logging.conf'
@@ -103,115 +188,270 @@ class App:
             logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
         logging.info("Logging configured.")
 
+    def configure_log_queue(self):
+        """Hand log records to a background thread when LOG_QUEUE is enabled (1, true, yes or on).
+
+        The configured handlers (log file and stderr) then run on a QueueListener
+        thread, so commands only pay for putting a record on a queue.
+        """
+        if not self.env_flag('LOG_QUEUE'):
+            return
+        from app.log_queue import start_queue_logging  # pylint: disable=import-outside-toplevel
+        if start_queue_logging():
+            logging.info("Logging through a background queue.")
+
+    def load_dotenv(self):
+        """Load a .env file if there is one, importing python-dotenv only when needed."""
+        directory = os.path.dirname(os.path.abspath(__file__))
+        while True:
+            env_path = os.path.join(directory, '.env')
+            if os.path.isfile(env_path):
+                from dotenv import load_dotenv  # pylint: disable=import-outside-toplevel
+                load_dotenv(env_path)
+                logging.info("Loaded environment file %s.", env_path)
+                return
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return
+            directory = parent
+
     def load_environment_variables(self):
         settings = {key: value for key, value in os.environ.items()}
         logging.info("Environment variables loaded.")
         return settings
 
+    def configure_cache(self):
+        """Enable the calculation result cache when CALCULATION_CACHE_SIZE is a positive number."""
+        cache_size = self.get_environment_variable('CALCULATION_CACHE_SIZE')
+        if not cache_size:
+            return
+        try:
+            Calculation.cache = ResultCache(int(cache_size))
+            logging.info("Result cache enabled with %s entries.", cache_size)
+        except ValueError:
+            logging.warning("Ignoring invalid CALCULATION_CACHE_SIZE: %s", cache_size)
+
+    def configure_numeric_mode(self):
+        """Select decimal or float arithmetic from NUMERIC_MODE and the decimal precision from DECIMAL_PRECISION."""
+        mode = self.get_environment_variable('NUMERIC_MODE')
+        precision = self.get_environment_variable('DECIMAL_PRECISION')
+        if not mode and not precision:
+            return
+        mode = mode or NumericMode.mode
+        try:
+            NumericMode.configure(mode.lower(), int(precision) if precision else None)
+            logging.info("Numeric mode: %s (precision %s).", NumericMode.mode, NumericMode.precision)
+        except ValueError:
+            logging.warning("Ignoring invalid NUMERIC_MODE/DECIMAL_PRECISION: %s/%s", mode, precision)
+
+    def configure_number_files(self):
+        """Limit the files that '@path' statistics arguments may read to STATS_DATA_DIR, if set."""
+        directory = self.get_environment_variable('STATS_DATA_DIR')
+        if directory:
+            from calculator.statistics import NumberFiles  # pylint: disable=import-outside-toplevel
+            NumberFiles.configure(directory=directory)
+            logging.info("Statistics files are read from %s.", directory)
+
+    def configure_history(self):
+        """Select the history backend from HISTORY_BACKEND (csv, sqlite, columnar) and HISTORY_FILE."""
+        backend = self.get_environment_variable('HISTORY_BACKEND')
+        history_file = self.get_environment_variable('HISTORY_FILE')
+        if backend:
+            if backend not in BACKENDS:
+                logging.warning("Ignoring unknown HISTORY_BACKEND: %s", backend)
+                return
+            ShowHistoryManager.BACKEND = backend
+            if not history_file:  # Keep the file name, switch to the backend's extension
+                history_file = os.path.splitext(ShowHistoryManager.FILE_PATH)[0] + BACKENDS[backend].extension
+        if history_file:
+            ShowHistoryManager.FILE_PATH = history_file
+        logging.info("History stored in %s using the %s backend.", ShowHistoryManager.FILE_PATH, ShowHistoryManager.BACKEND)
+
+    @contextmanager
+    def profiling(self, label: str):
+        """Profile the enclosed session when PROFILE is enabled (1, true, yes or on).
+
+        The pstats and collapsed-stack output goes to logs/ and the PROFILE_TOP
+        (default 20) hottest functions are printed to stderr when the session ends.
+        """
+        if not self.env_flag('PROFILE'):
+            yield
+            return
+        from app.profiler import DEFAULT_TOP, SessionProfiler  # pylint: disable=import-outside-toplevel
+        try:
+            top = int(self.get_environment_variable('PROFILE_TOP') or DEFAULT_TOP)
+        except ValueError:
+            logging.warning("Ignoring invalid PROFILE_TOP: %s", self.get_environment_variable('PROFILE_TOP'))
+            top = DEFAULT_TOP
+        profiler = SessionProfiler('logs', top)
+        logging.info("Profiling the %s session.", label)
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop(label)
+
+    def configure_history_writer(self):
+        """Write history in the background when HISTORY_WRITE_BEHIND is enabled (1, true, yes or on).
+
+        HISTORY_BATCH_SIZE and HISTORY_FLUSH_MS bound each group of records;
+        HISTORY_FSYNC (batch, interval or exit) and HISTORY_FSYNC_MS set when
+        the groups are fsynced.
+        """
+        if not self.env_flag('HISTORY_WRITE_BEHIND'):
+            return
+        from app.history.writer import WriteBehindWriter  # pylint: disable=import-outside-toplevel
+        try:
+            writer = WriteBehindWriter(
+                ShowHistoryManager.get_store(),
+                batch_size=int(self.get_environment_variable('HISTORY_BATCH_SIZE') or 1000),
+                flush_interval=float(self.get_environment_variable('HISTORY_FLUSH_MS') or 50) / 1000,
+                durability=(self.get_environment_variable('HISTORY_FSYNC') or 'batch').lower(),
+                fsync_interval=float(self.get_environment_variable('HISTORY_FSYNC_MS') or 1000) / 1000,
+            )
+        except ValueError as e:
+            logging.warning("History writer disabled: %s", e)
+            return
+        self.history_writer = writer.start()
+        logging.info("Writing history in the background (fsync: %s).", writer.durability)
+
+    def stop_history_writer(self):
+        """Write out and fsync any history still queued by the background writer."""
+        if self.history_writer is not None:
+            self.history_writer.stop()
+            self.history_writer = None
+
+    def configure_metrics(self):
+        """Command and history latency metrics are on unless METRICS is set to 0, false, no or off."""
+        METRICS.enabled = str(self.get_environment_variable('METRICS')).lower() not in ('0', 'false', 'no', 'off')
+        if not METRICS.enabled:
+            logging.info("Latency metrics disabled.")
+
     def get_environment_variable(self, env_var: str = 'ENVIRONMENT'):
         return self.settings.get(env_var, None)
 
+    def env_flag(self, env_var: str) -> bool:
+        """Whether a setting is switched on: 1, true, yes or on, in any case."""
+        return str(self.get_environment_variable(env_var)).lower() in ('1', 'true', 'yes', 'on')
+
     def load_plugins(self):
-        # Dynamically load all plugins in the plugins directory
+        """Register every plugin command by name from the plugin manifest; modules are imported on first use."""
         plugins_package = 'app.plugins'
         plugins_path = plugins_package.replace('.', '/')
         if not os.path.exists(plugins_path):
-            logging.warning(f"Plugins directory '{plugins_path}' not found.")
-            return
-        for _, plugin_name, is_pkg in pkgutil.iter_modules([plugins_path]):
-            if is_pkg:  # Ensure it's a package
-                try:
-                    plugin_module = importlib.import_module(f'{plugins_package}.{plugin_name}')
-                    self.register_plugin_commands(plugin_module, plugin_name)
-                except ImportError as e:
-                    logging.error(f"Error importing plugin {plugin_name}: {e}")
-
-    def register_plugin_commands(self, plugin_module, plugin_name):
-        for item_name in dir(plugin_module):
-            item = getattr(plugin_module, item_name)
-            try:
-                if isinstance(item, type) and issubclass(item, Command) and item is not Command:
-                    self.command_handler.register_command(plugin_name, item())
-                    logging.info(f"Command '{plugin_name}' from plugin '{plugin_name}' registered.")
-            except TypeError:
-                continue
-        
+            logging.warning("Plugins directory '%s' not found.", plugins_path)
+        for plugin_name, class_name in load_manifest(plugins_package, plugins_path).items():
+            self.command_handler.register_lazy_command(plugin_name, f'{plugins_package}.{plugin_name}', class_name)
+            logging.debug("Command '%s' from plugin '%s' registered.", plugin_name, plugin_name)
+        self.register_builtin_commands()
+        self.command_handler.build_dispatch_table()
+
+    def register_builtin_commands(self):
         # Register the MenuCommand
         self.command_handler.register_command("menu", MenuCommand(self.command_handler))
 
-        # Register the DeleteHistoryCommand
+        # Register the history commands
+        self.command_handler.register_command("history", ShowHistoryCommand())
+        self.command_handler.register_command("clear", ClearHistoryCommand())
         self.command_handler.register_command("delete", DeleteHistoryCommand())
+        self.command_handler.register_command("summary", SummaryCommand())
+
+    def handle_command(self, cmd_input: str):
+        """Execute a single REPL line through the command dispatch table."""
+        with METRICS.timed("app.dispatch"):
+            self.command_handler.execute_command(cmd_input)
 
     def start(self):
         self.load_plugins()
         logging.info("Application started. Type 'exit' to exit.")
         print("Usage: <command> <num1> <num2> | eg: add 2 3")
         print("Type 'menu' to see all available commands.")
+        print("Type 'eval <expression>' to evaluate an expression | eg: eval (1 + 2) * 3")
         print("Type 'exit' to exit.")
-        print("Type 'history' to see calculation history.")
+        print("Type 'history' to see calculation history ('history <start> <count>' or 'history tail <count>' for a page).")
         print("Type 'clear history' to clear calculation history.")
         print("Type 'delete <index>' to delete a specific entry from history.")
+        print("Type 'summary' to see count, sum, min, max and mean of the results per operation.")
+        print("Type 'mean', 'var', 'stddev', 'median' or 'percentile <p>' with numbers or @file | eg: median 3 1 2")
+        print("Type 'cache' to see result cache statistics.")
+        print("Type 'stats' to see per-command latency ('stats json' or 'stats prometheus' to export).")
 
         try:
-            while True:  # REPL Read, Evaluate, Print, Loop
-                cmd_input = input(">>> ").strip()
-
-                # Handle commands without numbers
-                if cmd_input.lower() == 'exit':
-                    logging.info("Application exit.")
-                    sys.exit(0)  # Use sys.exit(0) for a clean exit, indicating success.
-                elif cmd_input.lower() == "menu":
-                    self.command_handler.commands["menu"].execute()  # Execute the menu command
-                elif cmd_input.lower() == "history":
-                    ShowHistoryManager.show_history()  # Show history
-                elif cmd_input.lower() == "clear history":
-                    ClearHistoryManager.clear_history()  # Clear history
-                elif cmd_input.lower().startswith("delete "):
-                    try:
-                        index = int(cmd_input.split()[1])
-                        self.command_handler.commands["delete"].execute(index)  # Delete specific entry
-                    except (IndexError, ValueError):
-                        print("Invalid format. Please use 'delete <index>'.")
-                else:
-                    # Handle regular calculator operations here (add, subtract, multiply, divide)
-                    try:
-                        operation, operand1, operand2 = cmd_input.split()
-                        operand1 = float(operand1)
-                        operand2 = float(operand2)
-
-                        if operation == "add":
-                            result = operand1 + operand2
-                            logging.info(f"Performed addition: {operand1} + {operand2} = {result}")
-                            print(f"{operand1} + {operand2} = {result}")
-                        elif operation == "subtract":
-                            result = operand1 - operand2
-                            logging.info(f"Performed subtraction: {operand1} - {operand2} = {result}")
-                            print(f"{operand1} - {operand2} = {result}")
-                        elif operation == "multiply":
-                            result = operand1 * operand2
-                            logging.info(f"Performed multiplication: {operand1} * {operand2} = {result}")
-                            print(f"{operand1} * {operand2} = {result}")
-                        elif operation == "divide":
-                            if operand2 == 0:
-                                raise ZeroDivisionError("Cannot divide by zero.")
-                            result = operand1 / operand2
-                            logging.info(f"Performed division: {operand1} / {operand2} = {result}")
-                            print(f"{operand1} / {operand2} = {result}")
-                        else:
-                            raise ValueError(f"No such command: {operation}")  # New error handling
-
-                        # Save to history
-                        ShowHistoryManager.add_calculation(operation, operand1, operand2, result)
-                    except ValueError as e:
-                        logging.error(f"Invalid command format or operation. Error: {e}")
-                        print(f"Invalid command format. Please try again. Error: {e}")  # Updated error message
-                    except ZeroDivisionError as e:
-                        logging.error(str(e))
-                        print(str(e))
+            with self.profiling("repl"):  # Stopped by exit, Ctrl-C or end of input alike
+                while True:  # REPL Read, Evaluate, Print, Loop
+                    cmd_input = input(">>> ").strip()
+                    self.handle_command(cmd_input)
         except KeyboardInterrupt:
             logging.info("Application interrupted and exiting gracefully.")
             sys.exit(0)  # Assuming a KeyboardInterrupt should also result in a clean exit.
         finally:
+            self.stop_history_writer()
+            logging.info("Application shutdown.")
+
+    def run_batch(self, source: str):
+        """Run commands from a file (or stdin when source is '-') without prompting.
+
+        Lines go through the same parsing as the REPL. Output and history writes
+        are buffered and flushed every BATCH_FLUSH_LINES lines. Exits with status 1
+        if the file cannot be read.
+        """
+        self.load_plugins()
+        with self.profiling("batch"):
+            logging.info("Batch run started from %s.", source)
+            store = ShowHistoryManager.get_store()
+            real_stdout = sys.stdout
+            output = io.StringIO()
+            count = 0
+            start_time = time.perf_counter()
+            try:
+                stream = sys.stdin if source == '-' else open(source, encoding='utf-8')
+            except OSError as e:
+                logging.error("Cannot read batch file %s: %s", source, e)
+                print(f"Cannot read batch file {source}: {e.strerror}.", file=sys.stderr)
+                sys.exit(1)
+            store.begin_batch(BATCH_FLUSH_LINES)
+            try:
+                sys.stdout = output
+                for line in stream:
+                    cmd_input = line.strip()
+                    if not cmd_input or cmd_input.startswith('#'):
+                        continue  # Skip blank lines and comments
+                    self.handle_command(cmd_input)
+                    count += 1
+                    if count % BATCH_FLUSH_LINES == 0:
+                        real_stdout.write(output.getvalue())
+                        output.seek(0)
+                        output.truncate()
+            finally:
+                sys.stdout = real_stdout
+                real_stdout.write(output.getvalue())
+                real_stdout.flush()
+                store.end_batch()
+                if stream is not sys.stdin:
+                    stream.close()
+                elapsed = time.perf_counter() - start_time
+                rate = count / elapsed if elapsed > 0 else 0.0
+                logging.info("Batch run processed %d lines in %.3fs (%.0f lines/s).", count, elapsed, rate)
+                print(f"Processed {count} lines in {elapsed:.3f}s ({rate:.0f} lines/s).", file=sys.stderr)
+            return count
+
+    def serve(self, host: str = "127.0.0.1", port: int = 8765):
+        """Serve the calculator to TCP clients until interrupted. Each line is run like a REPL line."""
+        import asyncio  # pylint: disable=import-outside-toplevel
+        from app.server import CalculatorServer  # pylint: disable=import-outside-toplevel
+        from calculator.statistics import NumberFiles  # pylint: disable=import-outside-toplevel
+        self.load_plugins()
+        server = CalculatorServer(self.command_handler, ShowHistoryManager.get_store(), host, port)
+        file_access = NumberFiles.enabled
+        NumberFiles.enabled = NumberFiles.directory is not None  # Clients may only read from the data directory
+        try:
+            with self.profiling("server"):
+                asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            logging.info("Server interrupted and exiting gracefully.")
+        finally:
+            NumberFiles.enabled = file_access
+            self.stop_history_writer()
             logging.info("Application shutdown.")
 
 if __name__ == "__main__":
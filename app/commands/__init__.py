@@ -1,31 +1,73 @@
+import importlib
+import time
 from abc import ABC, abstractmethod
 
+from app.metrics import METRICS
+
 class Command(ABC):
     @abstractmethod
     def execute(self, *args):
         pass
 
+class LazyCommand(Command):
+    """Placeholder for a plugin command whose module is imported on first use.
+
+    The first call imports the module, instantiates ``class_name`` and registers
+    the real command in place of the placeholder, so later calls go straight to it.
+    """
+
+    def __init__(self, command_handler, command_name: str, module_name: str, class_name: str):
+        self.command_handler = command_handler
+        self.command_name = command_name
+        self.module_name = module_name
+        self.class_name = class_name
+
+    def load(self) -> Command:
+        command = getattr(importlib.import_module(self.module_name), self.class_name)()
+        if self.command_handler.commands.get(self.command_name) is self:
+            self.command_handler.register_command(self.command_name, command)
+        return command
+
+    def execute(self, *args):
+        return self.load().execute(*args)
+
 class CommandHandler:
     def __init__(self):
         self.commands = {}
+        self.dispatch = {}  # Lower-cased command name -> bound execute method
+        self.metrics = METRICS  # Per-command counts and latencies
 
     def register_command(self, command_name: str, command: Command):
         self.commands[command_name] = command
+        self.dispatch[command_name.lower()] = command.execute
+
+    def register_lazy_command(self, command_name: str, module_name: str, class_name: str):
+        """Register a command by name; its module is only imported when the command is first run."""
+        self.register_command(command_name, LazyCommand(self, command_name, module_name, class_name))
+
+    def build_dispatch_table(self):
+        """Rebuild the dispatch table from the registered commands."""
+        self.dispatch = {name.lower(): command.execute for name, command in self.commands.items()}
 
     def execute_command(self, input_str: str):
         # Split the input into command and arguments
-        parts = input_str.strip().split()
+        parts = input_str.split()
         if len(parts) == 0:
             print("No command entered.")
             return
-        
-        command_name = parts[0]  # First word is the command
-        args = parts[1:]  # The rest are arguments
 
+        name = parts[0].lower()  # First word is the command
+        execute = self.dispatch.get(name)
+        if execute is None:
+            print(f"No such command: {parts[0]}")
+            return
+        start = time.perf_counter()
+        error = False
         try:
-            if command_name in self.commands:
-                self.commands[command_name].execute(*args)  # Pass arguments to the command
-            else:
-                print(f"No such command: {command_name}")
+            execute(*parts[1:])  # Pass the rest as arguments to the command
         except Exception as e:
-            print(f"An error occurred: {e}")
\ No newline at end of file
+            error = True
+            print(f"An error occurred: {e}")
+        finally:
+            if self.metrics.enabled:
+                self.metrics.record(f"command.{name}", time.perf_counter() - start, error)
@@ -0,0 +1,698 @@
+import csv
+import mmap
+import os
+import shutil
+import sqlite3
+import struct
+import logging
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from itertools import accumulate, islice
+
+COLUMNS = ["Operation", "Operand1", "Operand2", "Result"]
+DELETE_MARKER = "!delete"
+
+def position_to_row_id(tombstones, position: int) -> int:
+    """Translate the position of a live row into its stable row id, given the sorted tombstones."""
+    row_id = position
+    for tombstone in tombstones:
+        if tombstone > row_id:
+            break
+        row_id += 1
+    return row_id
+
+def remap_tombstones(tombstones, compacted):
+    """Renumber row ids for a history from which the ``compacted`` row ids were dropped."""
+    return [row_id - bisect_left(compacted, row_id) for row_id in tombstones]
+
+def file_signature(path: str):
+    """Return (inode, size) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_size
+
+def fsync_path(path: str):
+    """Force a file (or directory entry) that may have been written through another handle onto disk."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class LegacyLogError(Exception):
+    """Raised when a CSV log still holds inline delete markers from an older version."""
+
+class RowIndex:
+    """Persisted byte offsets of the data lines of an append-only CSV log.
+
+    The index file starts with the inode of the log it describes, the number
+    of log bytes it covers and the number of rows it holds, followed by the
+    offset at which each of those rows starts. Lines appended since are
+    indexed by the next reader, so finding a row takes two small reads no
+    matter how long the log is. A log replaced under another inode, or cut
+    shorter than the index, is indexed again from the start.
+    """
+    HEADER = struct.Struct("<QQQ")
+    OFFSET = struct.Struct("<Q")
+    CHUNK_SIZE = 1 << 20  # Log bytes indexed at a time
+
+    def __init__(self, path: str, fd: int):
+        self.path = path
+        self.fd = fd
+        self.rows = 0
+        self.size = 0  # Bytes of the log covered by the index
+
+    def update(self, log, inode: int):
+        """Index the whole lines added to the mapped log since the index was last written.
+
+        Raises LegacyLogError if they hold inline delete markers.
+        """
+        header = self.read_at(0, self.HEADER.size)
+        indexed_inode = None
+        if len(header) == self.HEADER.size:
+            indexed_inode, self.size, self.rows = self.HEADER.unpack(header)
+        if indexed_inode != inode or self.size > len(log):
+            self.size = log.find(b"\n") + 1  # Start after the header line
+            self.rows = 0
+        end = log.rfind(b"\n") + 1  # A line is indexed once it is complete
+        if end <= self.size:
+            return
+        if log.find(CsvBackend.LEGACY_MARKER, self.size - 1, end) != -1:
+            raise LegacyLogError(self.path)
+        start = self.size
+        while start < end:
+            stop = log.rfind(b"\n", start, min(start + self.CHUNK_SIZE, end)) + 1
+            if stop <= start:  # A line longer than a chunk
+                stop = log.find(b"\n", start, end) + 1
+            lengths = [len(line) + 1 for line in log[start:stop].split(b"\n")[:-1]]
+            offsets = list(islice(accumulate(lengths, initial=start), len(lengths)))
+            self.write_at(self.HEADER.size + self.rows * self.OFFSET.size, struct.pack(f"<{len(offsets)}Q", *offsets))
+            self.rows += len(offsets)
+            start = stop
+        self.size = end
+        self.write_at(0, self.HEADER.pack(inode, self.size, self.rows))  # Written last, so a crash only loses work
+
+    def offset(self, row_id: int) -> int:
+        """Return where the row starts in the log; for row_id == rows, where the indexed lines end."""
+        if row_id >= self.rows:
+            return self.size
+        return self.OFFSET.unpack(self.read_at(self.HEADER.size + row_id * self.OFFSET.size, self.OFFSET.size))[0]
+
+    def read_at(self, position: int, size: int) -> bytes:
+        os.lseek(self.fd, position, os.SEEK_SET)
+        return os.read(self.fd, size)
+
+    def write_at(self, position: int, data: bytes):
+        os.lseek(self.fd, position, os.SEEK_SET)
+        os.write(self.fd, data)
+
+class HistoryBackend(ABC):
+    """Persistence for the calculation history.
+
+    Every stored row has a stable row id: its position among the rows appended
+    since the last compaction. Records passed to ``write`` are either a row (the
+    four column values, kept as text so Decimal operands round-trip exactly) or a
+    deletion ``[DELETE_MARKER, row_id, position, ""]``. Log-structured backends
+    only record the row id as a tombstone; the row is dropped when the history
+    is next compacted.
+    """
+    name = None
+    extension = None
+    needs_compaction = True  # Whether deletions leave tombstones that must eventually be compacted away
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @abstractmethod
+    def state(self):
+        """Return (row_count, tombstones): the number of stored rows and the sorted ids of deleted ones."""
+
+    @abstractmethod
+    def read_rows(self, stop_id=None):
+        """Return the stored rows with ids below stop_id (all rows if None), deleted ones included."""
+
+    @abstractmethod
+    def write(self, records):
+        """Persist rows and deletion records."""
+
+    @abstractmethod
+    def prepare_rewrite(self, rows):
+        """Write a compacted copy holding ``rows`` beside the live history and return a handle to it."""
+
+    @abstractmethod
+    def commit_rewrite(self, handle, tail_rows, tombstones):
+        """Append ``tail_rows`` and ``tombstones`` to a prepared copy and swap it in for the live history."""
+
+    def discard_rewrite(self, handle):
+        """Throw away a prepared copy that will not be committed."""
+
+    def fingerprint(self):
+        """Return a cheap value that changes whenever any process writes to, rewrites or clears the history."""
+        return file_signature(self.path)
+
+    def fsync(self):
+        """Make everything written so far durable."""
+        fsync_path(self.path)
+
+    def read_ids(self, first_id: int, stop_id=None):
+        """Return the stored rows with ids in [first_id, stop_id), deleted ones included.
+
+        The default reads every row up to stop_id; backends override it to read only those rows.
+        """
+        return self.read_rows(stop_id)[first_id:]
+
+    def read_tail(self, first_id: int):
+        """Return the stored rows with ids from first_id on, deleted ones included."""
+        return self.read_ids(first_id)
+
+    def iter_rows(self):
+        """Yield every stored row in id order, deleted ones included. Backends override it to stream."""
+        yield from self.read_rows()
+
+    def iter_live_rows(self):
+        """Yield the live rows one at a time, without holding the whole history in memory."""
+        _, tombstones = self.state()
+        dead = set(tombstones)
+        for row_id, row in enumerate(self.iter_rows()):
+            if row_id not in dead:
+                yield row
+
+    def rewrite(self, rows):
+        """Replace the stored history with exactly these rows."""
+        self.commit_rewrite(self.prepare_rewrite(rows), [], [])
+
+    def load(self):
+        """Return (rows, tombstones, row_count) with the deleted rows left out of rows."""
+        _, tombstones = self.state()
+        stored = self.read_rows()
+        dead = set(tombstones)
+        return [row for row_id, row in enumerate(stored) if row_id not in dead], tombstones, len(stored)
+
+    def read_range(self, start: int, stop=None):
+        """Return (rows, total): the live rows in [start, stop) and the number of live rows.
+
+        A negative start selects the last -start rows.
+        """
+        row_count, tombstones = self.state()
+        total = row_count - len(tombstones)
+        if start < 0:
+            start = max(total + start, 0)
+        stop = total if stop is None else min(stop, total)
+        if start >= stop:
+            return [], total
+        first_id = position_to_row_id(tombstones, start)
+        stop_id = position_to_row_id(tombstones, stop - 1) + 1
+        dead = set(tombstones)
+        rows = self.read_ids(first_id, stop_id)
+        return [row for row_id, row in enumerate(rows, first_id) if row_id not in dead], total
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def clear(self):
+        """Remove the stored history."""
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+        elif os.path.exists(self.path):
+            os.remove(self.path)
+
+class CsvBackend(HistoryBackend):
+    """Append-only CSV log with one line per calculation.
+
+    The log itself stays plain CSV; deleted row ids are appended to a
+    ``.tombstones`` file next to it until the log is compacted. Reads
+    memory-map the log and find rows through a RowIndex kept in ``.index``,
+    so they never parse or hold more of the log than the rows asked for.
+    """
+    name = "csv"
+    extension = ".csv"
+    LEGACY_MARKER = b"\n" + DELETE_MARKER.encode("utf-8") + b","
+
+    @property
+    def tombstone_path(self) -> str:
+        return f"{self.path}.tombstones"
+
+    @property
+    def index_path(self) -> str:
+        return f"{self.path}.index"
+
+    def read_tombstones(self):
+        if not os.path.exists(self.tombstone_path):
+            return []
+        with open(self.tombstone_path, encoding="utf-8") as handle:
+            return sorted({int(line) for line in handle if line.strip()})
+
+    @contextmanager
+    def mapped(self):
+        """Yield (log, index): the memory-mapped log and its RowIndex, brought up to date."""
+        with open(self.path, "rb") as handle:
+            stat = os.fstat(handle.fileno())
+            log = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+            fd = os.open(self.index_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                index = RowIndex(self.index_path, fd)
+                index.update(log, stat.st_ino)
+                yield log, index
+            finally:
+                os.close(fd)
+                if stat.st_size:
+                    log.close()
+
+    def upgrade_legacy_log(self):
+        """Replay the inline delete markers written by older versions and rewrite the log without them."""
+        rows = []
+        with open(self.path, newline="", encoding="utf-8") as handle:
+            reader = csv.reader(handle)
+            next(reader, None)  # Skip the header
+            for record in reader:
+                if record and record[0] == DELETE_MARKER:
+                    if 0 <= int(record[1]) < len(rows):
+                        del rows[int(record[1])]
+                elif record:
+                    rows.append(record)
+        self.rewrite(rows)
+        logging.info("Upgraded %s to the tombstone format.", self.path)
+
+    def state(self):
+        if not os.path.exists(self.path):
+            return 0, []
+        try:
+            with self.mapped() as (_, index):
+                return index.rows, self.read_tombstones()
+        except LegacyLogError:
+            self.upgrade_legacy_log()
+            return self.state()
+
+    def read_rows(self, stop_id=None):
+        if not os.path.exists(self.path):
+            return []
+        self.state()  # Upgrades a legacy log before its markers could be read as rows
+        with open(self.path, newline="", encoding="utf-8") as handle:
+            reader = csv.reader(handle)
+            next(reader, None)  # Skip the header
+            return [record for record in islice(reader, stop_id) if record]
+
+    def iter_rows(self):
+        if not os.path.exists(self.path):
+            return
+        self.state()  # Upgrades a legacy log before its markers could be read as rows
+        with open(self.path, newline="", encoding="utf-8") as handle:
+            reader = csv.reader(handle)
+            next(reader, None)  # Skip the header
+            yield from (record for record in reader if record)
+
+    def read_ids(self, first_id: int, stop_id=None):
+        """Slice the rows out of the mapped log at the offsets the index gives, and parse only those."""
+        if not os.path.exists(self.path):
+            return []
+        with self.mapped() as (log, index):
+            stop_id = index.rows if stop_id is None else min(stop_id, index.rows)
+            if first_id >= stop_id:
+                return []
+            lines = log[index.offset(first_id):index.offset(stop_id)].split(b"\n")[:-1]
+        return [record for record in csv.reader(line.decode("utf-8") for line in lines) if record]
+
+    def fingerprint(self):
+        return file_signature(self.path), file_signature(self.tombstone_path)
+
+    def fsync(self):
+        fsync_path(self.path)
+        fsync_path(self.tombstone_path)
+
+    def write(self, records):
+        rows = [record for record in records if record[0] != DELETE_MARKER]
+        tombstones = [record[1] for record in records if record[0] == DELETE_MARKER]
+        if rows:
+            new_file = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, "a", newline="", encoding="utf-8") as handle:
+                writer = csv.writer(handle)
+                if new_file:
+                    writer.writerow(COLUMNS)
+                writer.writerows(rows)
+        if tombstones:
+            with open(self.tombstone_path, "a", encoding="utf-8") as handle:
+                handle.write("".join(f"{row_id}\n" for row_id in tombstones))
+
+    def prepare_rewrite(self, rows):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"  # Per process, as several may compact at once
+        with open(tmp_path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(COLUMNS)
+            writer.writerows(rows)
+        return tmp_path
+
+    def commit_rewrite(self, handle, tail_rows, tombstones):
+        if tail_rows:
+            with open(handle, "a", newline="", encoding="utf-8") as tmp:
+                csv.writer(tmp).writerows(tail_rows)
+        # Old tombstones go first, so a crash mid-swap can at worst bring deleted rows back
+        for path in (self.tombstone_path, self.index_path):
+            if os.path.exists(path):
+                os.remove(path)
+        os.replace(handle, self.path)
+        if tombstones:
+            self.write([[DELETE_MARKER, row_id, None, ""] for row_id in tombstones])
+
+    def discard_rewrite(self, handle):
+        if os.path.exists(handle):
+            os.remove(handle)
+
+    def clear(self):
+        super().clear()
+        for path in (self.tombstone_path, self.index_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+class SqliteBackend(HistoryBackend):
+    """SQLite table with one row per calculation. Deletions are applied directly.
+
+    sqlite3 connections may only be used by the thread that opened them, so
+    every thread (the REPL and a background history writer, say) gets its own.
+    """
+    name = "sqlite"
+    extension = ".db"
+    needs_compaction = False
+
+    TIMEOUT = 30.0  # Seconds to wait for another process's write transaction
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.local = threading.local()  # This thread's connection and the inode of the file it was opened on
+
+    def connect(self) -> sqlite3.Connection:
+        connection = getattr(self.local, "connection", None)
+        signature = file_signature(self.path)
+        if connection is not None and (signature is None or signature[0] != self.local.inode):
+            connection.close()  # The database was removed or replaced; open the new one
+            connection = None
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.TIMEOUT)
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS history ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, operation TEXT NOT NULL, "
+                    "operand1 TEXT, operand2 TEXT, result TEXT)"
+                )
+                # Bumped by every write, so other processes can tell the table changed
+                connection.execute("CREATE TABLE IF NOT EXISTS history_version (version INTEGER NOT NULL)")
+                connection.execute(
+                    "INSERT INTO history_version SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM history_version)"
+                )
+            self.local.connection = connection
+            self.local.inode = os.stat(self.path).st_ino
+        return connection
+
+    def fsync(self):
+        pass  # Every write is a transaction, which SQLite already syncs on commit
+
+    def fingerprint(self):
+        if not os.path.exists(self.path):
+            return None
+        (version,) = self.connect().execute("SELECT version FROM history_version").fetchone()
+        return self.local.inode, version
+
+    def state(self):
+        if not os.path.exists(self.path):
+            return 0, []
+        (row_count,) = self.connect().execute("SELECT COUNT(*) FROM history").fetchone()
+        return row_count, []
+
+    def read_rows(self, stop_id=None):
+        if not os.path.exists(self.path):
+            return []
+        cursor = self.connect().execute(
+            "SELECT operation, operand1, operand2, result FROM history ORDER BY id LIMIT ?",
+            (-1 if stop_id is None else stop_id,),
+        )
+        return [list(row) for row in cursor]
+
+    def read_range(self, start: int, stop=None):
+        if not os.path.exists(self.path):
+            return [], 0
+        total, _ = self.state()
+        if start < 0:
+            start = max(total + start, 0)
+        limit = -1 if stop is None else max(stop - start, 0)
+        cursor = self.connect().execute(
+            "SELECT operation, operand1, operand2, result FROM history ORDER BY id LIMIT ? OFFSET ?", (limit, start)
+        )
+        return [list(row) for row in cursor], total
+
+    def iter_rows(self):
+        if os.path.exists(self.path):
+            cursor = self.connect().execute("SELECT operation, operand1, operand2, result FROM history ORDER BY id")
+            yield from (list(row) for row in cursor)
+
+    def write(self, records):
+        with self.connect() as connection:  # One transaction per write
+            connection.execute("UPDATE history_version SET version = version + 1")
+            for record in records:
+                if record[0] == DELETE_MARKER:
+                    connection.execute(
+                        "DELETE FROM history WHERE id = (SELECT id FROM history ORDER BY id LIMIT 1 OFFSET ?)",
+                        (int(record[2]),),
+                    )
+                else:
+                    connection.execute(
+                        "INSERT INTO history (operation, operand1, operand2, result) VALUES (?, ?, ?, ?)",
+                        record,
+                    )
+
+    def prepare_rewrite(self, rows):
+        return list(rows)
+
+    def commit_rewrite(self, handle, tail_rows, tombstones):
+        with self.connect() as connection:
+            connection.execute("UPDATE history_version SET version = version + 1")
+            connection.execute("DELETE FROM history")
+            connection.executemany(
+                "INSERT INTO history (operation, operand1, operand2, result) VALUES (?, ?, ?, ?)",
+                handle + list(tail_rows),
+            )
+
+    def clear(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is not None:  # Other threads reconnect once they notice the file is gone
+            connection.close()
+            self.local.connection = None
+        super().clear()
+
+class ColumnarBackend(HistoryBackend):
+    """Binary columnar store: a directory with one append-only file per column.
+
+    Operations are dictionary encoded as one byte per row. Operands and results
+    are length-prefixed UTF-8 text of at most 65,535 bytes. Deleted row ids go
+    to their own file as 8-byte tombstones until the store is compacted.
+    """
+    name = "columnar"
+    extension = ".col"
+    VALUE_COLUMNS = ("operand1", "operand2", "result")
+    COLUMN_FILES = ("operation.dict", "operation.bin", *(f"{name}.bin" for name in VALUE_COLUMNS), "deletes.bin")
+    LENGTH = struct.Struct("<H")
+    MAX_VALUE_SIZE = (1 << 16) - 1
+    TOMBSTONE = struct.Struct("<Q")
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.operations = None  # Dictionary of operation names, index = code
+        self.operations_size = 0  # Size of operation.dict when it was read; other processes may extend it
+
+    def column_path(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def read_column(self, name: str, first: int = 0, size: int = -1) -> bytes:
+        """Return the bytes of a column file, or none if it is missing (a store left half-created)."""
+        try:
+            with open(self.column_path(name), "rb") as handle:
+                handle.seek(first)
+                return handle.read(size)
+        except FileNotFoundError:
+            return b""
+
+    def create(self):
+        """Create the store directory with every column file, so readers never find one missing."""
+        os.makedirs(self.path, exist_ok=True)
+        for name in self.COLUMN_FILES:
+            with open(self.column_path(name), "ab"):
+                pass
+
+    def read_operations(self):
+        path = self.column_path("operation.dict")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as handle:
+                text = handle.read()
+            self.operations = text.splitlines()
+            self.operations_size = len(text.encode("utf-8"))
+        else:
+            self.operations = []
+            self.operations_size = 0
+
+    def iter_values(self, name: str, chunk_size: int = 1 << 16):
+        """Yield the values of a column, reading the file in chunks."""
+        try:
+            handle = open(self.column_path(f"{name}.bin"), "rb")  # pylint: disable=consider-using-with
+        except FileNotFoundError:
+            return
+        with handle:
+            data = b""
+            offset = 0
+            while True:
+                if len(data) - offset < self.LENGTH.size:
+                    chunk = handle.read(chunk_size)
+                    if not chunk:
+                        return
+                    data, offset = data[offset:] + chunk, 0
+                    continue
+                (length,) = self.LENGTH.unpack_from(data, offset)
+                end = offset + self.LENGTH.size + length
+                if end > len(data):
+                    chunk = handle.read(max(chunk_size, length))
+                    if not chunk:
+                        return  # Torn last value
+                    data, offset = data[offset:] + chunk, 0
+                    continue
+                yield data[offset + self.LENGTH.size:end].decode("utf-8")
+                offset = end
+
+    def state(self):
+        if not os.path.isdir(self.path):
+            return 0, []
+        tombstones = sorted({row_id for (row_id,) in self.TOMBSTONE.iter_unpack(self.read_column("deletes.bin"))})
+        signature = file_signature(self.column_path("operation.bin"))
+        return (signature[1] if signature else 0), tombstones
+
+    def read_rows(self, stop_id=None):
+        return self.read_slice(0, stop_id)
+
+    def read_tail(self, first_id: int):
+        return self.read_slice(first_id)
+
+    def iter_rows(self):
+        if not os.path.isdir(self.path):
+            return
+        self.read_operations()
+        codes = self.read_column("operation.bin")  # One byte per row
+        columns = [self.iter_values(name) for name in self.VALUE_COLUMNS]
+        for code, *values in zip(codes, *columns):  # zip stops at a torn last row
+            yield [self.operations[code], *values]
+
+    def fingerprint(self):
+        return file_signature(self.column_path("operation.bin")), file_signature(self.column_path("deletes.bin"))
+
+    def fsync(self):
+        if os.path.isdir(self.path):
+            for name in os.listdir(self.path):
+                fsync_path(self.column_path(name))
+
+    def read_slice(self, first_id: int, stop_id=None):
+        """Return the stored rows with ids in [first_id, stop_id)."""
+        if not os.path.isdir(self.path):
+            return []
+        self.read_operations()
+        codes = self.read_column("operation.bin", first_id, -1 if stop_id is None else max(stop_id - first_id, 0))
+        columns = [list(islice(self.iter_values(name), first_id, stop_id)) for name in self.VALUE_COLUMNS]
+        return [[self.operations[code]] + [column[i] for column in columns]
+                for i, code in zip(range(min(map(len, columns))), codes)]  # Ignore a torn last row
+
+    def read_range(self, start: int, stop=None):
+        """Read only the stored rows spanning the requested live positions."""
+        row_count, tombstones = self.state()
+        total = row_count - len(tombstones)
+        if start < 0:
+            start = max(total + start, 0)
+        stop = total if stop is None else min(stop, total)
+        if start >= stop:
+            return [], total
+        first_id = position_to_row_id(tombstones, start)
+        stop_id = position_to_row_id(tombstones, stop - 1) + 1
+        dead = set(tombstones)
+        rows = self.read_slice(first_id, stop_id)
+        return [row for row_id, row in enumerate(rows, first_id) if row_id not in dead], total
+
+    def write(self, records):
+        """Append the records. All of them are encoded first, so a value that does not fit writes nothing."""
+        signature = file_signature(self.column_path("operation.dict"))
+        if self.operations is None or (signature[1] if signature else 0) != self.operations_size:
+            self.read_operations()
+        operations = list(self.operations)
+        codes = bytearray()
+        values = {name: bytearray() for name in self.VALUE_COLUMNS}
+        tombstones = bytearray()
+        for record in records:
+            if record[0] == DELETE_MARKER:
+                tombstones += self.TOMBSTONE.pack(int(record[1]))
+                continue
+            if record[0] not in operations:
+                operations.append(record[0])
+            codes.append(operations.index(record[0]))
+            for name, value in zip(self.VALUE_COLUMNS, record[1:]):
+                encoded = value.encode("utf-8")
+                if len(encoded) > self.MAX_VALUE_SIZE:
+                    raise ValueError(f"History value too long for the columnar backend: "
+                                     f"{len(encoded)} bytes in {name} (at most {self.MAX_VALUE_SIZE}).")
+                values[name] += self.LENGTH.pack(len(encoded)) + encoded
+
+        if not os.path.isdir(self.path):
+            self.create()
+        new_operations = operations[len(self.operations):]
+        self.operations = operations
+        if new_operations:
+            text = "".join(f"{name}\n" for name in new_operations)
+            with open(self.column_path("operation.dict"), "a", encoding="utf-8") as handle:
+                handle.write(text)
+            self.operations_size += len(text.encode("utf-8"))
+        with open(self.column_path("operation.bin"), "ab") as handle:
+            handle.write(codes)
+        for name, data in values.items():
+            with open(self.column_path(f"{name}.bin"), "ab") as handle:
+                handle.write(data)
+        with open(self.column_path("deletes.bin"), "ab") as handle:
+            handle.write(tombstones)
+
+    def prepare_rewrite(self, rows):
+        fresh = ColumnarBackend(f"{self.path}.{os.getpid()}.tmp")
+        fresh.clear()
+        fresh.operations = []
+        fresh.write(rows)
+        return fresh
+
+    def commit_rewrite(self, handle, tail_rows, tombstones):
+        handle.write(list(tail_rows) + [[DELETE_MARKER, row_id, None, ""] for row_id in tombstones])
+        old_path = f"{self.path}.old"
+        if os.path.exists(self.path):
+            os.replace(self.path, old_path)
+        os.replace(handle.path, self.path)
+        shutil.rmtree(old_path, ignore_errors=True)
+        self.operations = handle.operations
+        self.operations_size = handle.operations_size
+
+    def discard_rewrite(self, handle):
+        handle.clear()
+
+    def clear(self):
+        super().clear()
+        self.operations = []
+        self.operations_size = 0
+
+BACKENDS = {backend.name: backend for backend in (CsvBackend, SqliteBackend, ColumnarBackend)}
+
+def create_backend(name: str, path: str) -> HistoryBackend:
+    """Create the history backend registered under ``name``."""
+    try:
+        return BACKENDS[name](path)
+    except KeyError:
+        raise ValueError(f"Unknown history backend: {name}. Choose one of {', '.join(BACKENDS)}.") from None
+
+def migrate_history(source: HistoryBackend, target: HistoryBackend) -> int:
+    """Copy the live history rows from one backend to another. Returns the number of rows copied."""
+    rows, _, _ = source.load()
+    target.rewrite(rows)
+    logging.info("Migrated %d history rows from %s to %s.", len(rows), source.path, target.path)
+    return len(rows)
@@ -1,12 +1,11 @@
-import pandas as pd
-import os
+from app.history.store import HistoryStore
 
 class HistoryManager:
     FILE_PATH = "calculation_history.csv"
+    BACKEND = "csv"
 
     @classmethod
     def clear_history(cls):
         """Clear the history both in memory and in the file."""
-        if os.path.exists(cls.FILE_PATH):
-            os.remove(cls.FILE_PATH)
-        print("History cleared.")
\ No newline at end of file
+        HistoryStore(cls.FILE_PATH, backend=cls.BACKEND).clear()
+        print("History cleared.")
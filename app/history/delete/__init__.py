@@ -1,32 +1,31 @@
-import os
-import pandas as pd
 import logging
+from app.history.store import COLUMNS, HistoryStore
 
 class ShowHistoryManager:
     FILE_PATH = "calculation_history.csv"
-    history_df = pd.DataFrame(columns=["Operation", "Operand1", "Operand2", "Result"])
+    BACKEND = "csv"
+    history_df = None  # Loaded on demand so importing this module does not import pandas
 
     @classmethod
     def load_history(cls):
-        """Load history from a CSV file into a Pandas DataFrame."""
-        if os.path.exists(cls.FILE_PATH):
-            cls.history_df = pd.read_csv(cls.FILE_PATH)
-        else:
-            cls.history_df = pd.DataFrame(columns=["Operation", "Operand1", "Operand2", "Result"])
+        """Load history from the backend into a Pandas DataFrame."""
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        store = HistoryStore(cls.FILE_PATH, backend=cls.BACKEND)
+        store.load()
+        cls.history_df = pd.DataFrame(store.rows, columns=COLUMNS)
 
     @classmethod
     def delete_calculation(cls, index):
         """Delete a calculation from the history by index."""
-        cls.load_history()  # Load history to ensure it is up to date
-        if index < 0 or index >= len(cls.history_df):
+        store = HistoryStore(cls.FILE_PATH, backend=cls.BACKEND)
+        deleted_row = store.delete(index)
+        if deleted_row is None:
             logging.error("Invalid index for deletion: %d", index)
-            return f"Invalid index: {index}. Please provide a valid index between 0 and {len(cls.history_df) - 1}."
+            return f"Invalid index: {index}. Please provide a valid index between 0 and {len(store) - 1}."
 
-        deleted_row = cls.history_df.iloc[index]
-        cls.history_df = cls.history_df.drop(index).reset_index(drop=True)
-        cls.history_df.to_csv(cls.FILE_PATH, index=False)  # Save updated history
-        logging.info("Deleted calculation at index %d: %s", index, deleted_row.to_dict())
-        return f"Deleted row at index {index}: {deleted_row.to_dict()}"
+        deleted_row = dict(zip(COLUMNS, deleted_row))
+        logging.info("Deleted calculation at index %d: %s", index, deleted_row)
+        return f"Deleted row at index {index}: {deleted_row}"
 
 
 class DeleteHistoryCommand:
@@ -34,4 +33,4 @@ class DeleteHistoryCommand:
 
     def execute(self, index):
         """Execute the delete command."""
-        return ShowHistoryManager.delete_calculation(index)
\ No newline at end of file
+        return ShowHistoryManager.delete_calculation(index)
@@ -0,0 +1,92 @@
+import os
+import struct
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of one process are kept apart
+    fcntl = None
+
+COUNTER = struct.Struct("<Q")
+
+class FileLock:
+    """Advisory reader/writer lock on a sidecar file, shared by every process that uses it.
+
+    Any number of processes may hold the lock shared, or one process may hold it
+    exclusively. Within a process the lock is re-entrant: a nested request is
+    free while the lock is already held exclusively, or shared for a shared
+    request. Asking for an exclusive lock while only holding a shared one is an
+    error, as upgrading could deadlock two readers.
+
+    The lock file also holds a counter that writers bump whenever they rewrite
+    the data it guards, so other processes can tell that their view is stale
+    even when the rewritten file happens to reuse the old one's inode and size.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        self.fd = None
+        self.pid = None  # Process that opened fd; a forked child must open its own
+        self.depth = 0
+        self.exclusive_held = False
+
+    def shared(self):
+        return self.hold(exclusive=False)
+
+    def exclusive(self):
+        return self.hold(exclusive=True)
+
+    @contextmanager
+    def hold(self, exclusive: bool):
+        with self.thread_lock:
+            if self.depth == 0:
+                self.acquire(exclusive)
+            elif exclusive and not self.exclusive_held:
+                raise RuntimeError(f"Cannot upgrade the shared lock on {self.path} to an exclusive one")
+            self.depth += 1
+            try:
+                yield
+            finally:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.release()
+
+    def open(self) -> int:
+        if self.fd is not None and self.pid != os.getpid():
+            os.close(self.fd)  # Inherited across fork, so it shares the parent's lock
+            self.fd = None
+        if self.fd is None:
+            self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self.pid = os.getpid()
+        return self.fd
+
+    def acquire(self, exclusive: bool):
+        self.exclusive_held = exclusive
+        fd = self.open()
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+    def release(self):
+        if fcntl is not None and self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+
+    def rewrites(self) -> int:
+        """Return how often the guarded data has been rewritten. Call with the lock held."""
+        fd = self.open()
+        os.lseek(fd, 0, os.SEEK_SET)
+        data = os.read(fd, COUNTER.size)
+        return COUNTER.unpack(data)[0] if len(data) == COUNTER.size else 0
+
+    def count_rewrite(self):
+        """Record a rewrite of the guarded data. Call with the lock held exclusively."""
+        count = self.rewrites() + 1
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        os.write(self.fd, COUNTER.pack(count))
+
+    def close(self):
+        with self.thread_lock:
+            if self.fd is not None and self.pid == os.getpid():
+                os.close(self.fd)
+            self.fd = None
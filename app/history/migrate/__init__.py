@@ -0,0 +1,34 @@
+"""Copy calculation history between backends.
+
+Usage: python -m app.history.migrate [--from csv] [--source calculation_history.csv] --to sqlite [--target PATH]
+
+The target defaults to the source file name with the target backend's extension,
+e.g. calculation_history.csv -> calculation_history.db.
+"""
+import argparse
+import os
+import sys
+
+from app.history.backends import BACKENDS, create_backend, migrate_history
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Copy calculation history between backends.")
+    parser.add_argument("--from", dest="source_backend", choices=sorted(BACKENDS), default="csv")
+    parser.add_argument("--source", default="calculation_history.csv", help="history to read")
+    parser.add_argument("--to", dest="target_backend", choices=sorted(BACKENDS), required=True)
+    parser.add_argument("--target", help="where to write the migrated history")
+    args = parser.parse_args(argv)
+
+    target = args.target or os.path.splitext(args.source)[0] + BACKENDS[args.target_backend].extension
+    if os.path.abspath(target) == os.path.abspath(args.source):
+        parser.error("source and target must be different paths")
+    if not os.path.exists(args.source):
+        print(f"No history found at {args.source}.")
+        return 1
+    count = migrate_history(create_backend(args.source_backend, args.source),
+                            create_backend(args.target_backend, target))
+    print(f"Migrated {count} rows from {args.source} ({args.source_backend}) to {target} ({args.target_backend}).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
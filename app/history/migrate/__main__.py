@@ -0,0 +1,4 @@
+import sys
+from app.history.migrate import main
+
+sys.exit(main())
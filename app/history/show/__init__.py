@@ -1,16 +1,16 @@
-import pandas as pd
-import os
+from app.history.store import COLUMNS, HistoryStore
 
 class ShowHistoryManager:
     FILE_PATH = "calculation_history.csv"
+    BACKEND = "csv"
 
     @classmethod
     def load_history(cls):
-        """Load history from a CSV file into a Pandas DataFrame."""
-        if os.path.exists(cls.FILE_PATH):
-            cls.history_df = pd.read_csv(cls.FILE_PATH)
-        else:
-            cls.history_df = pd.DataFrame(columns=["Operation", "Operand1", "Operand2", "Result"])
+        """Load history from the backend into a Pandas DataFrame."""
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        store = HistoryStore(cls.FILE_PATH, backend=cls.BACKEND)
+        store.load()
+        cls.history_df = pd.DataFrame(store.rows, columns=COLUMNS)
 
     @classmethod
     def show_history(cls):
@@ -21,6 +21,3 @@ class ShowHistoryManager:
             print("No history available.")
         else:
             print(cls.history_df)
-
-# Ensure history is loaded on import
-ShowHistoryManager.load_history()
\ No newline at end of file
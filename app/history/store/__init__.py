@@ -0,0 +1,382 @@
+import logging
+import threading
+from bisect import insort
+
+from app.history.backends import COLUMNS, DELETE_MARKER, create_backend, position_to_row_id, remap_tombstones
+from app.history.locking import FileLock
+from app.history.summary import HistorySummary
+
+class HistoryStore:
+    """Calculation history persisted through a pluggable backend.
+
+    Every calculation is handed to the backend as a single appended record, so
+    adding an entry costs the same no matter how large the history grows, and
+    the rows are only read into memory when something needs all of them.
+    Deleting a row records a tombstone for its row id instead of rewriting the
+    history. Once ``compact_threshold`` tombstones pile up, a background thread
+    rewrites the history without the deleted rows while new records keep being
+    appended; they are carried over into the compacted copy before it is
+    swapped in.
+
+    Several processes may share one history. Writes happen under an exclusive
+    advisory lock on ``<file>.lock`` and reads under a shared one, so each
+    append only holds the lock for one small write. A background compaction
+    takes the exclusive lock just to swap its copy in, carrying over whatever
+    any process appended or deleted meanwhile. Cached rows and counts are
+    dropped as soon as another process has changed the history.
+
+    Per-operation aggregates of the results (see HistorySummary) are kept in
+    ``<file>.summary`` and updated with every write, so ``summarize`` only
+    scans the history when that file is missing or out of date.
+    """
+
+    def __init__(self, file_path: str, compact_threshold: int = 100, backend: str = "csv"):
+        self.backend = create_backend(backend, file_path)
+        self.compact_threshold = compact_threshold
+        self.rows = []
+        self.loaded = False
+        self.row_count = None  # Rows stored in the backend, deleted ones included; None until read
+        self.tombstones = []  # Sorted row ids of deleted rows not compacted yet
+        self.buffer = None  # Records waiting to be written while batching
+        self.buffer_size = 0
+        self.batch_depth = 0  # Nested begin_batch() calls still open
+        self.on_buffer_full = None  # Called instead of flushing when a background writer owns the buffer
+        self.lock = threading.RLock()
+        self.generation = 0  # Bumped by clear() so a running compaction knows to give up
+        self.compactor = None  # Background compaction thread
+        self.file_lock = FileLock(f"{file_path}.lock")  # Shared with other processes using the same history
+        self.fingerprint = None  # Backend fingerprint as of the last time this store read or wrote it
+        self.summary = None  # HistorySummary of the stored rows, while this store keeps it up to date
+        self.summary_checked = False  # Whether the persisted summary was looked for since the last change
+
+    @property
+    def file_path(self) -> str:
+        return self.backend.path
+
+    @property
+    def summary_path(self) -> str:
+        return f"{self.file_path}.summary"
+
+    @property
+    def pending_deletes(self) -> int:
+        return len(self.tombstones)
+
+    def current_fingerprint(self):
+        """Return (rewrite count, backend fingerprint). Call with the file lock held."""
+        return self.file_lock.rewrites(), self.backend.fingerprint()
+
+    def sync(self):
+        """Forget cached rows, counts and aggregates if another process changed the history. Call with the file lock held."""
+        if self.fingerprint is not None and not self.buffer and self.current_fingerprint() != self.fingerprint:
+            self.rows = []
+            self.loaded = False
+            self.row_count = None
+            self.tombstones = []
+            self.fingerprint = None
+            self.summary = None
+            self.summary_checked = False
+
+    def check_summary(self):
+        """Pick up the persisted summary once, if it describes the history as stored. Call with the file lock held."""
+        if self.summary is None and not self.summary_checked:
+            if self.backend.exists():
+                self.summary = HistorySummary.read(self.summary_path, self.current_fingerprint())
+            else:
+                self.summary = HistorySummary()  # A new history starts with an empty summary
+            self.summary_checked = True
+
+    def write_records(self, records, removed=()):
+        """Write records to the backend and bring the persisted summary up to date. Call with the exclusive file lock held.
+
+        ``removed`` holds the rows that the deletion records among ``records`` remove.
+        """
+        self.check_summary()
+        self.backend.write(records)
+        fingerprint = self.current_fingerprint()
+        if self.row_count is not None or self.summary is not None:
+            self.fingerprint = fingerprint
+        if self.summary is not None:
+            for record in records:
+                if record[0] != DELETE_MARKER:
+                    self.summary.add(record)
+            for row in removed:
+                self.summary.remove(row)
+            self.summary.write(self.summary_path, fingerprint)
+
+    def load(self):
+        """Read the live rows into memory."""
+        with self.lock:
+            self.flush()
+            with self.file_lock.shared():
+                self.rows, self.tombstones, self.row_count = self.backend.load()
+                self.loaded = True
+                self.fingerprint = self.current_fingerprint()
+
+    def ensure_loaded(self):
+        """Load the history the first time all rows are needed."""
+        if not self.loaded:
+            self.load()
+
+    def ensure_state(self):
+        """Read the row count and tombstones the first time the store is written to."""
+        if self.row_count is None:
+            with self.file_lock.shared():
+                self.sync()  # A cached summary may be out of date too
+                self.row_count, self.tombstones = self.backend.state()
+                self.fingerprint = self.current_fingerprint()
+
+    def __len__(self):
+        with self.lock, self.file_lock.shared():
+            self.sync()
+            if self.loaded:
+                return len(self.rows)
+            self.ensure_state()
+            return self.row_count - len(self.tombstones)
+
+    def read_range(self, start: int, stop=None):
+        """Return (rows, total) for the live rows in [start, stop); a negative start selects the last rows.
+
+        Uses the in-memory rows once they are loaded, otherwise reads only the
+        requested rows from the backend.
+        """
+        with self.lock:
+            self.flush()
+            with self.file_lock.shared():
+                self.sync()
+                if not self.loaded:
+                    return self.backend.read_range(start, stop)
+            total = len(self.rows)
+            if start < 0:
+                start = max(total + start, 0)
+            return self.rows[start:stop], total
+
+    def append(self, operation, operand1, operand2, result):
+        """Append a calculation to the backend (and to the in-memory rows once they are loaded)."""
+        row = [str(operation), str(operand1), str(operand2), str(result)]
+        with self.lock:
+            if self.buffer is not None:  # Batching: other processes' changes are picked up on flush
+                self.ensure_state()
+                self.buffer.append(row)
+                self.add_to_cache(row)
+                if len(self.buffer) >= self.buffer_size:
+                    if self.on_buffer_full is None:
+                        self.flush()
+                    else:
+                        self.on_buffer_full()
+                return row
+            with self.file_lock.exclusive():
+                self.sync()
+                self.ensure_state()
+                self.write_records([row])
+                self.add_to_cache(row)
+        return row
+
+    def add_to_cache(self, row):
+        self.row_count += 1
+        if self.loaded:
+            self.rows.append(row)
+
+    def delete(self, index: int):
+        """Remove the row at the given index. Returns the row, or None if the index is invalid."""
+        with self.lock:
+            self.flush()
+            with self.file_lock.exclusive():
+                if index < 0 or index >= len(self):
+                    return None
+                if self.loaded:
+                    row = self.rows.pop(index)
+                else:
+                    row = self.backend.read_range(index, index + 1)[0][0]
+                row_id = position_to_row_id(self.tombstones, index)
+                self.write_records([[DELETE_MARKER, row_id, index, ""]], removed=[row])
+                if not self.backend.needs_compaction:
+                    self.row_count -= 1  # The backend removed the row itself
+                    return row
+                insort(self.tombstones, row_id)
+                if self.compactor is None and len(self.tombstones) >= self.compact_threshold:
+                    self.start_compaction()
+        return row
+
+    def begin_batch(self, buffer_size: int = 1000):
+        """Start buffering writes, flushing them every ``buffer_size`` records.
+
+        Batches nest: while one is open, another begin_batch() keeps the
+        current buffer and its size.
+        """
+        with self.lock:
+            if self.buffer is None:
+                self.buffer = []
+                self.buffer_size = buffer_size
+            self.batch_depth += 1
+
+    def flush(self) -> int:
+        """Write any buffered records to the backend. Returns the number of records written.
+
+        If the write fails with an OSError (a full disk, say), the records stay
+        buffered for the next flush. Any other error means some record can never
+        be written, so the records are written one by one and those that fail
+        are dropped and logged.
+        """
+        with self.lock:
+            if not self.buffer:
+                return 0
+            records, self.buffer = self.buffer, []
+            try:
+                with self.file_lock.exclusive():
+                    self.sync()  # The counts already include the records, so drop them if others wrote too
+                    self.write_records(records)
+            except OSError:
+                self.rebuffer(records)
+                raise
+            except Exception:  # pylint: disable=broad-exception-caught
+                return self.write_each(records)
+            return len(records)
+
+    def rebuffer(self, records):
+        """Put records that could not be written yet back at the front of the buffer."""
+        if self.buffer is not None:
+            self.buffer[:0] = records
+
+    def write_each(self, records) -> int:
+        """Write buffered records one at a time, dropping the ones the backend rejects. Call with the lock held."""
+        written = 0
+        with self.file_lock.exclusive():
+            self.sync()
+            for position, record in enumerate(records):
+                try:
+                    self.write_records([record])
+                    written += 1
+                except OSError:
+                    self.rebuffer(records[position:])
+                    raise
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logging.error("Dropped a %s history record that cannot be written: %s", record[0], e)
+                    if self.row_count is not None:
+                        self.row_count -= 1  # It was counted when it was buffered
+                    if self.loaded:
+                        self.rows = [row for row in self.rows if row is not record]
+        return written
+
+    def fsync(self):
+        """Flush buffered records and make the whole history durable on disk."""
+        with self.lock:
+            self.flush()
+            with self.file_lock.shared():
+                self.backend.fsync()
+
+    def end_batch(self):
+        """Flush buffered records; once the outermost batch ends, write every record immediately again."""
+        with self.lock:
+            self.flush()
+            self.batch_depth = max(self.batch_depth - 1, 0)
+            if self.batch_depth == 0:
+                self.buffer = None
+
+    def start_compaction(self):
+        """Compact the history on a background thread. Call with the lock and the exclusive file lock held."""
+        rows = list(self.rows) if self.loaded else None
+        self.compactor = threading.Thread(
+            target=self._compact_in_background,
+            args=(rows, self.row_count, list(self.tombstones), self.generation, self.file_lock.rewrites()),
+            name="history-compaction",
+        )
+        self.compactor.start()
+
+    def _compact_in_background(self, rows, row_count, tombstones, generation, rewrites):
+        handle = None
+        try:
+            if rows is None:
+                dead = set(tombstones)
+                rows = [row for row_id, row in enumerate(self.backend.read_rows(row_count)) if row_id not in dead]
+            handle = self.backend.prepare_rewrite(rows)
+            with self.lock:
+                self.flush()
+                with self.file_lock.exclusive():
+                    if generation != self.generation or self.file_lock.rewrites() != rewrites:
+                        logging.info("Skipped compaction: the history was cleared or compacted meanwhile.")
+                        return
+                    self.sync()
+                    self.check_summary()
+                    # Rows and deletions any process added since the snapshot go into the compacted copy
+                    tail = self.backend.read_tail(row_count)
+                    known = set(tombstones)
+                    new_tombstones = [row_id for row_id in self.backend.state()[1] if row_id not in known]
+                    new_tombstones = remap_tombstones(new_tombstones, tombstones)
+                    self.backend.commit_rewrite(handle, tail, new_tombstones)
+                    self.file_lock.count_rewrite()
+                    handle = None
+                    self.row_count = len(rows) + len(tail)
+                    self.tombstones = sorted(new_tombstones)
+                    self.rewritten()
+                    logging.info("Compacted history after %d deletions.", len(tombstones))
+        except OSError as e:
+            logging.error("History compaction failed: %s", e)
+        finally:
+            with self.lock:
+                if handle is not None:
+                    self.backend.discard_rewrite(handle)
+                self.compactor = None
+
+    def wait_for_compaction(self):
+        """Block until a running background compaction has finished."""
+        compactor = self.compactor
+        if compactor is not None:
+            compactor.join()
+
+    def compact(self):
+        """Rewrite the stored history so it only holds the live rows."""
+        self.wait_for_compaction()
+        with self.lock:
+            self.flush()
+            with self.file_lock.exclusive():
+                self.sync()
+                self.check_summary()
+                rows = self.rows if self.loaded else self.backend.load()[0]
+                self.backend.rewrite(rows)
+                self.file_lock.count_rewrite()
+                logging.info("Compacted history after %d deletions.", len(self.tombstones))
+                self.row_count = len(rows)
+                self.tombstones = []
+                self.rewritten()
+
+    def rewritten(self):
+        """Re-stamp the cached state and summary after a rewrite that kept the live rows. Call with the exclusive file lock held."""
+        self.fingerprint = self.current_fingerprint()
+        if self.summary is not None:
+            self.summary.write(self.summary_path, self.fingerprint)
+
+    def summarize(self) -> HistorySummary:
+        """Return the per-operation aggregates of the live rows.
+
+        Uses the summary kept up to date by every write; the history is only
+        scanned, one row at a time, when it is missing, out of date, or
+        deletions used up the lowest or highest results kept for an operation.
+        """
+        with self.lock:
+            self.flush()
+            with self.file_lock.exclusive():
+                self.sync()
+                self.check_summary()
+                if self.summary is None or self.summary.stale:
+                    self.summary = HistorySummary.build(self.backend.iter_live_rows())
+                    self.fingerprint = self.current_fingerprint()
+                    self.summary.write(self.summary_path, self.fingerprint)
+                    logging.info("Rebuilt the history summary from %d rows.", self.summary.count)
+                return self.summary
+
+    def clear(self):
+        """Remove every row, both in memory and in the backend."""
+        with self.lock, self.file_lock.exclusive():
+            self.generation += 1
+            self.backend.clear()
+            self.file_lock.count_rewrite()
+            self.rows = []
+            self.loaded = True
+            self.row_count = 0
+            self.tombstones = []
+            self.fingerprint = self.current_fingerprint()
+            self.summary = HistorySummary()
+            self.summary_checked = True
+            self.summary.write(self.summary_path, self.fingerprint)
+            if self.buffer:
+                self.buffer = []
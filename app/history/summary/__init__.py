@@ -0,0 +1,155 @@
+import json
+import logging
+import os
+from bisect import bisect_left, insort
+from decimal import Context, Decimal, InvalidOperation
+
+SUM_CONTEXT = Context(prec=100)  # Wide enough that adding and later removing results does not drift
+EXTREMES = 16  # Lowest and highest results kept per operation
+
+def parse_result(text):
+    """Return a history result as a finite Decimal, or None for anything else."""
+    try:
+        value = Decimal(text)
+    except (InvalidOperation, ValueError, TypeError):
+        return None
+    return value if value.is_finite() else None
+
+class OperationStats:
+    """Count, sum and the lowest and highest results of one operation.
+
+    ``lowest`` holds the smallest results in ascending order and ``highest``
+    the largest, up to EXTREMES each. Removing the minimum or maximum moves on
+    to the next value in the list. Only once one list has lost all its values
+    to deletions is the next extreme unknown (``stale``) until a rescan.
+    """
+    __slots__ = ("count", "total", "lowest", "highest")
+
+    def __init__(self, count: int = 0, total: Decimal = Decimal(0), lowest=None, highest=None):
+        self.count = count
+        self.total = total
+        self.lowest = lowest or []
+        self.highest = highest or []
+
+    @property
+    def minimum(self):
+        return self.lowest[0] if self.lowest else None
+
+    @property
+    def maximum(self):
+        return self.highest[-1] if self.highest else None
+
+    @property
+    def stale(self) -> bool:
+        return self.count > 0 and not (self.lowest and self.highest)
+
+    @property
+    def mean(self) -> Decimal:
+        return self.total / self.count
+
+    def add(self, value: Decimal):
+        # A list takes the value if it held every result so far, or if the value falls inside it
+        lowest_held_all = len(self.lowest) == self.count
+        highest_held_all = len(self.highest) == self.count
+        self.count += 1
+        self.total = SUM_CONTEXT.add(self.total, value)
+        if lowest_held_all or (self.lowest and value <= self.lowest[-1]):
+            insort(self.lowest, value)
+            if len(self.lowest) > EXTREMES:
+                self.lowest.pop()
+        if highest_held_all or (self.highest and value >= self.highest[0]):
+            insort(self.highest, value)
+            if len(self.highest) > EXTREMES:
+                del self.highest[0]
+
+    def remove(self, value: Decimal):
+        self.count -= 1
+        self.total = SUM_CONTEXT.subtract(self.total, value)
+        for values in (self.lowest, self.highest):
+            index = bisect_left(values, value)
+            if index < len(values) and values[index] == value:
+                del values[index]
+
+class HistorySummary:
+    """Running aggregates of the history results, per operation.
+
+    Appends and deletes update the aggregates in constant time, deletes of an
+    operation's minimum or maximum included (see OperationStats). The aggregates are
+    persisted next to the history together with the fingerprint of the history
+    they describe, so a later process can reuse them as long as the history
+    has not changed since.
+    """
+
+    def __init__(self):
+        self.operations = {}
+
+    @classmethod
+    def build(cls, rows) -> "HistorySummary":
+        summary = cls()
+        for row in rows:
+            summary.add(row)
+        return summary
+
+    @property
+    def stale(self) -> bool:
+        return any(stats.stale for stats in self.operations.values())
+
+    @property
+    def count(self) -> int:
+        return sum(stats.count for stats in self.operations.values())
+
+    def add(self, row):
+        value = parse_result(row[3])
+        if value is not None:
+            self.operations.setdefault(row[0], OperationStats()).add(value)
+
+    def remove(self, row):
+        value = parse_result(row[3])
+        stats = self.operations.get(row[0])
+        if value is None or stats is None:
+            return
+        stats.remove(value)
+        if stats.count == 0:
+            del self.operations[row[0]]
+
+    def to_dict(self) -> dict:
+        return {name: {"count": stats.count, "sum": str(stats.total),
+                       "lowest": [str(value) for value in stats.lowest],
+                       "highest": [str(value) for value in stats.highest]}
+                for name, stats in self.operations.items()}
+
+    def write(self, path: str, fingerprint):
+        """Persist the aggregates for the history with this fingerprint."""
+        data = json.dumps({"fingerprint": fingerprint, "operations": self.to_dict()}).encode()
+        try:
+            # Runs after every history write: overwrite in place, as truncating first costs more than the write
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+            try:
+                os.pwrite(fd, data, 0)
+                if os.fstat(fd).st_size > len(data):
+                    os.ftruncate(fd, len(data))
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logging.warning("Could not save the history summary %s: %s", path, e)
+
+    @classmethod
+    def read(cls, path: str, fingerprint):
+        """Return the persisted aggregates if they describe the history with this fingerprint, else None."""
+        try:
+            with open(path, encoding="utf-8") as handle:
+                data = json.load(handle)
+            if data["fingerprint"] != json.loads(json.dumps(fingerprint)):  # Tuples come back as lists
+                return None
+            summary = cls()
+            for name, values in data["operations"].items():
+                summary.operations[name] = OperationStats(
+                    values["count"], Decimal(values["sum"]),
+                    [Decimal(value) for value in values["lowest"]], [Decimal(value) for value in values["highest"]])
+            return summary
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, InvalidOperation) as e:
+            logging.warning("Ignoring unreadable history summary %s: %s", path, e)
+            return None
+
@@ -0,0 +1,84 @@
+import atexit
+import logging
+import threading
+import time
+
+DURABILITY_MODES = ("batch", "interval", "exit")
+
+class WriteBehindWriter:
+    """Background thread that writes a store's history records in groups.
+
+    While running, appends only add the record to the store's buffer and
+    return. The thread writes the buffer as one group when it reaches
+    ``batch_size`` records or ``flush_interval`` seconds after the last group,
+    whichever comes first. ``durability`` decides when the written groups are
+    fsynced: after every group ("batch"), at most every ``fsync_interval``
+    seconds ("interval"), or only when the writer stops ("exit"). Stopping
+    flushes and fsyncs whatever is left; it runs at interpreter exit too, so
+    records survive ``exit``, Ctrl-C and ``sys.exit``.
+    """
+
+    def __init__(self, store, batch_size: int = 1000, flush_interval: float = 0.05,
+                 durability: str = "batch", fsync_interval: float = 1.0):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown durability: {durability}. Choose one of {', '.join(DURABILITY_MODES)}.")
+        if batch_size <= 0 or flush_interval <= 0 or fsync_interval < 0:
+            raise ValueError("Batch size and flush interval must be positive numbers")
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.fsync_interval = fsync_interval
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = None
+        self.unsynced = False  # Records written since the last fsync
+        self.last_fsync = time.monotonic()
+        self.groups = 0
+        self.records = 0
+
+    def start(self):
+        self.store.begin_batch(self.batch_size)
+        self.store.on_buffer_full = self.wake.set
+        self.thread = threading.Thread(target=self.run, name="history-writer", daemon=True)
+        self.thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def run(self):
+        while not self.stopping.is_set():
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            try:
+                self.write_group()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Records that failed with an OSError stay buffered, so keep running and retry them
+                logging.error("Writing history in the background failed: %s", e)
+
+    def write_group(self, final: bool = False):
+        """Write the buffered records and fsync them if the durability setting asks for it."""
+        written = self.store.flush()
+        if written:
+            self.groups += 1
+            self.records += written
+            self.unsynced = True
+        now = time.monotonic()
+        if self.unsynced and (final or self.durability == "batch" or
+                              (self.durability == "interval" and now - self.last_fsync >= self.fsync_interval)):
+            self.store.fsync()
+            self.unsynced = False
+            self.last_fsync = now
+
+    def stop(self):
+        """Stop the thread, then write and fsync everything still buffered."""
+        if self.thread is None:
+            return
+        self.stopping.set()
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
+        atexit.unregister(self.stop)
+        self.store.on_buffer_full = None
+        self.write_group(final=True)
+        self.store.end_batch()
+        logging.info("History writer stopped after %d records in %d groups.", self.records, self.groups)
@@ -0,0 +1,49 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves message formatting to the listener thread.
+
+    The stock QueueHandler formats every record before queueing it so the
+    record can be pickled. This queue never leaves the process, so records are
+    queued untouched and the %-style arguments are only merged by the handlers
+    on the listener thread.
+    """
+
+    def prepare(self, record):
+        return record
+
+def start_queue_logging(logger: logging.Logger = None) -> QueueListener:
+    """Move the handlers of ``logger`` (the root logger by default) behind a queue.
+
+    The caller only puts records on the queue. A background QueueListener
+    formats them and hands them to the original handlers (files, stderr). The
+    listener is stopped, and the queue drained, at interpreter exit. Returns
+    None if the handlers are already queued or there are none.
+    """
+    logger = logger or logging.getLogger()
+    handlers = list(logger.handlers)
+    if not handlers or any(isinstance(handler, QueueHandler) for handler in handlers):
+        return None
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    logger.addHandler(DeferredQueueHandler(log_queue))
+    listener.start()
+    atexit.register(stop_queue_logging, listener, logger)
+    return listener
+
+def stop_queue_logging(listener: QueueListener, logger: logging.Logger = None):
+    """Flush the queue and put the original handlers back on ``logger``."""
+    logger = logger or logging.getLogger()
+    if listener._thread is None:  # pylint: disable=protected-access
+        return  # Already stopped
+    listener.stop()
+    for handler in list(logger.handlers):
+        if isinstance(handler, DeferredQueueHandler) and handler.queue is listener.queue:
+            logger.removeHandler(handler)
+    for handler in listener.handlers:
+        logger.addHandler(handler)
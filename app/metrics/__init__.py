@@ -0,0 +1,121 @@
+import json
+import math
+import time
+from contextlib import contextmanager
+
+BUCKETS_PER_DECADE = 8
+MIN_LATENCY = 1e-6  # Upper bound of the first bucket, in seconds
+BUCKET_COUNT = 8 * BUCKETS_PER_DECADE  # Buckets up to 100 s; slower samples go to the overflow bucket
+BUCKET_BOUNDS = tuple(MIN_LATENCY * 10 ** (i / BUCKETS_PER_DECADE) for i in range(BUCKET_COUNT))
+PERCENTILES = (50, 95, 99)
+
+class LatencyHistogram:
+    """Latency distribution in fixed log-spaced buckets (8 per decade, 1 us to 100 s).
+
+    Recording is O(1) and memory is constant. Percentiles are interpolated
+    inside the matching bucket, so they are accurate to about 15%.
+    """
+    __slots__ = ("counts", "count", "errors", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = [0] * (BUCKET_COUNT + 1)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, seconds: float, error: bool = False):
+        index = math.ceil(math.log10(seconds / MIN_LATENCY) * BUCKETS_PER_DECADE) if seconds > MIN_LATENCY else 0
+        self.counts[min(index, BUCKET_COUNT)] += 1
+        self.count += 1
+        self.errors += error
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent: float) -> float:
+        """Estimate the latency below which ``percent`` percent of the samples fall."""
+        if not self.count:
+            return 0.0
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                low = BUCKET_BOUNDS[index - 1] if index else 0.0
+                high = BUCKET_BOUNDS[index] if index < BUCKET_COUNT else self.max
+                estimate = low + (high - low) * (rank - seen) / count
+                return min(max(estimate, self.min), self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> dict:
+        summary = {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_s": self.total / self.count if self.count else 0.0,
+            "min_s": self.min if self.count else 0.0,
+            "max_s": self.max,
+        }
+        summary.update({f"p{percent}_s": self.percentile(percent) for percent in PERCENTILES})
+        return summary
+
+class Metrics:
+    """Per-name call counts and latency histograms for commands and history I/O."""
+
+    def __init__(self):
+        self.enabled = True
+        self.histograms = {}
+
+    def record(self, name: str, seconds: float, error: bool = False):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(seconds, error)
+
+    @contextmanager
+    def timed(self, name: str):
+        """Record how long the block takes under ``name``; exceptions count as errors."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, error)
+
+    def reset(self):
+        self.histograms = {}
+
+    def snapshot(self) -> dict:
+        return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """Render the histograms in the Prometheus text exposition format."""
+        lines = [
+            "# HELP calculator_latency_seconds Latency of calculator commands and history operations.",
+            "# TYPE calculator_latency_seconds histogram",
+        ]
+        for name, histogram in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, count in zip(BUCKET_BOUNDS, histogram.counts):
+                cumulative += count
+                lines.append(f'calculator_latency_seconds_bucket{{name="{name}",le="{bound:.3g}"}} {cumulative}')
+            lines.append(f'calculator_latency_seconds_bucket{{name="{name}",le="+Inf"}} {histogram.count}')
+            lines.append(f'calculator_latency_seconds_sum{{name="{name}"}} {histogram.total!r}')
+            lines.append(f'calculator_latency_seconds_count{{name="{name}"}} {histogram.count}')
+        lines.append("# HELP calculator_errors_total Calls that ended in an error.")
+        lines.append("# TYPE calculator_errors_total counter")
+        for name, histogram in sorted(self.histograms.items()):
+            lines.append(f'calculator_errors_total{{name="{name}"}} {histogram.errors}')
+        return "\n".join(lines) + "\n"
+
+METRICS = Metrics()  # Shared by the command handler, the app and the history managers
@@ -0,0 +1,77 @@
+import importlib
+import json
+import logging
+import os
+
+from app.commands import Command
+
+MANIFEST_FILE = ".manifest.json"
+MANIFEST_VERSION = 1
+
+def plugin_fingerprint(plugins_path: str) -> dict:
+    """Return {plugin name: [mtime_ns, size]} of each plugin package's __init__.py, without importing it."""
+    fingerprint = {}
+    try:
+        entries = list(os.scandir(plugins_path))
+    except FileNotFoundError:
+        return fingerprint
+    for entry in entries:
+        if entry.name.startswith(("_", ".")) or not entry.is_dir():
+            continue
+        try:
+            stat = os.stat(os.path.join(entry.path, "__init__.py"))
+        except FileNotFoundError:
+            continue  # Not a package
+        fingerprint[entry.name] = [stat.st_mtime_ns, stat.st_size]
+    return fingerprint
+
+def find_command_class(plugin_module):
+    """Return the name of the Command subclass a plugin module provides, or None."""
+    found = None
+    for item_name in dir(plugin_module):
+        item = getattr(plugin_module, item_name)
+        if isinstance(item, type) and issubclass(item, Command) and item is not Command:
+            found = item_name
+    return found
+
+def scan_plugins(plugins_package: str, fingerprint: dict) -> dict:
+    """Import every plugin once and return {plugin name: command class name}."""
+    commands = {}
+    for plugin_name in sorted(fingerprint):
+        try:
+            plugin_module = importlib.import_module(f'{plugins_package}.{plugin_name}')
+        except ImportError as e:
+            logging.error("Error importing plugin %s: %s", plugin_name, e)
+            continue
+        class_name = find_command_class(plugin_module)
+        if class_name is not None:
+            commands[plugin_name] = class_name
+    return commands
+
+def load_manifest(plugins_package: str, plugins_path: str) -> dict:
+    """Return {plugin name: command class name} for the plugins in ``plugins_path``.
+
+    The mapping is cached in ``.manifest.json`` next to the plugins together with
+    the size and modification time of every plugin. While those match, startup
+    only stats the plugin files; when a plugin is added, removed or edited, all
+    plugins are imported once to rebuild the manifest.
+    """
+    fingerprint = plugin_fingerprint(plugins_path)
+    manifest_path = os.path.join(plugins_path, MANIFEST_FILE)
+    try:
+        with open(manifest_path, encoding="utf-8") as handle:
+            manifest = json.load(handle)
+        if manifest.get("version") == MANIFEST_VERSION and manifest.get("fingerprint") == fingerprint:
+            return manifest["commands"]
+    except (OSError, ValueError, AttributeError):
+        pass  # Missing or unreadable manifest: rebuild it
+    commands = scan_plugins(plugins_package, fingerprint)
+    temporary_path = f"{manifest_path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "w", encoding="utf-8") as handle:
+            json.dump({"version": MANIFEST_VERSION, "fingerprint": fingerprint, "commands": commands}, handle)
+        os.replace(temporary_path, manifest_path)  # Concurrent rebuilds never leave a half-written manifest
+        logging.info("Plugin manifest rebuilt with %s plugins.", len(commands))
+    except OSError as e:
+        logging.warning("Could not write the plugin manifest %s: %s", manifest_path, e)
+    return commands
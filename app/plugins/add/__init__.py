@@ -1,6 +1,9 @@
 import logging
+from app import ShowHistoryManager
 from app.commands import Command
-from decimal import Decimal, InvalidOperation
+from calculator.calculation import Calculation
+from calculator.operations import add
+from calculator.numeric import NumericMode
 
 class AddCommand(Command):
     def execute(self, *args):
@@ -10,12 +13,13 @@ class AddCommand(Command):
             raise TypeError("Error: 'add' command requires exactly 2 arguments.")
 
         try:
-            a = Decimal(args[0])
-            b = Decimal(args[1])
-            result = a + b
-            logging.info(f"The result of {a} + {b} is {result}")
+            a = NumericMode.parse(args[0])
+            b = NumericMode.parse(args[1])
+            result = Calculation.create(a, b, add).perform()
+            logging.info("The result of %s + %s is %s", a, b, result)
             print(f"The result of {a} + {b} is {result}")
-        except InvalidOperation:
+            ShowHistoryManager.add_calculation("add", a, b, result)
+        except ValueError:
             logging.error("Invalid input: Please provide valid numbers.")
             # Raising ValueError as per test requirement
-            raise ValueError("Invalid input: Please provide valid numbers.")
\ No newline at end of file
+            raise ValueError("Invalid input: Please provide valid numbers.")
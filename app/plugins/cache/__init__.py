@@ -0,0 +1,20 @@
+import logging
+from app.commands import Command
+from calculator.calculation import Calculation
+
+class CacheCommand(Command):
+    def execute(self, *args):
+        """Shows result cache statistics, or clears the cache with 'cache clear'."""
+        cache = Calculation.cache
+        if cache is None:
+            print("Result cache is disabled. Set CALCULATION_CACHE_SIZE to enable it.")
+            return
+        if args and args[0] == "clear":
+            cache.clear()
+            logging.info("Result cache cleared.")
+            print("Result cache cleared.")
+            return
+        stats = cache.stats()
+        logging.info("Displaying result cache statistics.")
+        print(f"Result cache: {stats['size']}/{stats['maxsize']} entries, "
+              f"{stats['hits']} hits, {stats['misses']} misses, hit rate {stats['hit_rate']:.1%}")
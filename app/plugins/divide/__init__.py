@@ -1,19 +1,24 @@
 import logging
+from app import ShowHistoryManager
 from app.commands import Command
+from calculator.calculation import Calculation
+from calculator.numeric import NumericMode
+from calculator.operations import divide
 
 class DivideCommand(Command):
     def execute(self, a: str, b: str):
         """Divides two numbers."""
         try:
-            a = int(a)
-            b = int(b)
+            a = NumericMode.parse(a)
+            b = NumericMode.parse(b)
             if b == 0:
                 logging.error("Error: cannot do division by zero.")
                 # Raising ZeroDivisionError as required by the test
                 raise ZeroDivisionError("Error: cannot do division by zero.")
-            result = a / b
-            logging.info(f"The result of {a} / {b} is {result}")
+            result = Calculation.create(a, b, divide).perform()
+            logging.info("The result of %s / %s is %s", a, b, result)
             print(f"The result of {a} / {b} is {result}")
+            ShowHistoryManager.add_calculation("divide", a, b, result)
         except ValueError:
-            logging.error("Invalid input: Please provide valid integers.")
-            raise ValueError("Invalid input: Please provide valid integers.")
\ No newline at end of file
+            logging.error("Invalid input: Please provide valid numbers.")
+            raise ValueError("Invalid input: Please provide valid numbers.")
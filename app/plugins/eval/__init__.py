@@ -0,0 +1,16 @@
+import logging
+from app import ShowHistoryManager
+from app.commands import Command
+from calculator.expression import evaluate_expression
+
+class EvalCommand(Command):
+    def execute(self, *args):
+        """Evaluates an arithmetic expression, e.g. 'eval (1 + 2) * 3 / 4'."""
+        if not args:
+            logging.error("Error: 'eval' command requires an expression.")
+            raise TypeError("Error: 'eval' command requires an expression, e.g. 'eval (1 + 2) * 3'.")
+        expression = " ".join(args)
+        result = evaluate_expression(expression)
+        logging.info("The result of %s is %s", expression, result)
+        print(f"The result of {expression} is {result}")
+        ShowHistoryManager.add_calculation("eval", expression, "", result)  # One entry for the whole expression
@@ -0,0 +1,16 @@
+import logging
+from app import ShowHistoryManager
+from app.commands import Command
+from calculator.statistics import RunningMoments, describe_inputs, iter_numbers
+
+class MeanCommand(Command):
+    def execute(self, *args):
+        """Mean of the numbers given as arguments or in files: 'mean 1 2 3' or 'mean @numbers.txt'."""
+        if not args:
+            logging.error("Error: 'mean' command requires numbers.")
+            raise TypeError("Error: 'mean' command requires numbers or @file arguments, e.g. 'mean 1 2 3'.")
+        moments = RunningMoments.of(iter_numbers(args))
+        result = moments.mean
+        logging.info("The mean of %d numbers is %s", moments.count, result)
+        print(f"The mean of {moments.count} numbers is {result}")
+        ShowHistoryManager.add_calculation("mean", describe_inputs(args, moments.count), "", result)
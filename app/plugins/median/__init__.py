@@ -0,0 +1,17 @@
+import logging
+from app import ShowHistoryManager
+from app.commands import Command
+from calculator.numeric import NumericMode
+from calculator.statistics import QuantileSketch, describe_inputs, iter_numbers
+
+class MedianCommand(Command):
+    def execute(self, *args):
+        """Median of the numbers given as arguments or in files: 'median 3 1 2' or 'median @numbers.txt'."""
+        if not args:
+            logging.error("Error: 'median' command requires numbers.")
+            raise TypeError("Error: 'median' command requires numbers or @file arguments, e.g. 'median 1 2 3'.")
+        sketch = QuantileSketch.of(iter_numbers(args))
+        result = sketch.quantile(NumericMode.parse("0.5"))
+        logging.info("The median of %d numbers is %s", sketch.count, result)
+        print(f"The median of {sketch.count} numbers is {result}")
+        ShowHistoryManager.add_calculation("median", describe_inputs(args, sketch.count), "", result)
@@ -1,11 +1,20 @@
 import logging
+from app import ShowHistoryManager
 from app.commands import Command
+from calculator.calculation import Calculation
+from calculator.numeric import NumericMode
+from calculator.operations import multiply
 
 class MultiplyCommand(Command):
     def execute(self, a: str, b: str):
         """Multiplies two numbers."""
-        a = int(a)
-        b = int(b)
-        result = a * b
-        logging.info(f"The result of {a} * {b} is {result}")
-        print(f"The result of {a} * {b} is {result}")
\ No newline at end of file
+        try:
+            a = NumericMode.parse(a)
+            b = NumericMode.parse(b)
+        except ValueError:
+            logging.error("Invalid input: Please provide valid numbers.")
+            raise ValueError("Invalid input: Please provide valid numbers.")
+        result = Calculation.create(a, b, multiply).perform()
+        logging.info("The result of %s * %s is %s", a, b, result)
+        print(f"The result of {a} * {b} is {result}")
+        ShowHistoryManager.add_calculation("multiply", a, b, result)
@@ -0,0 +1,20 @@
+import logging
+from app import ShowHistoryManager
+from app.commands import Command
+from calculator.numeric import NumericMode
+from calculator.statistics import QuantileSketch, describe_inputs, iter_numbers
+
+class PercentileCommand(Command):
+    def execute(self, *args):
+        """Percentile (0 to 100) of the numbers given as arguments or in files: 'percentile 90 @latencies.txt'."""
+        if len(args) < 2:
+            logging.error("Error: 'percentile' command requires a percentile and numbers.")
+            raise TypeError("Error: 'percentile' command requires a percentile and numbers, e.g. 'percentile 90 1 2 3'.")
+        percent = NumericMode.parse(args[0])
+        if not 0 <= percent <= 100:
+            raise ValueError("Percentile must be between 0 and 100.")
+        sketch = QuantileSketch.of(iter_numbers(args[1:]))
+        result = sketch.quantile(percent / 100)
+        logging.info("The percentile %s of %d numbers is %s", percent, sketch.count, result)
+        print(f"The percentile {percent} of {sketch.count} numbers is {result}")
+        ShowHistoryManager.add_calculation("percentile", describe_inputs(args[1:], sketch.count), percent, result)
@@ -0,0 +1,33 @@
+import logging
+from app.commands import Command
+from app.metrics import METRICS
+
+class StatsCommand(Command):
+    def execute(self, *args):
+        """Shows per-command latency: 'stats', 'stats json', 'stats prometheus' or 'stats reset'."""
+        if not METRICS.enabled:
+            print("Latency metrics are disabled. Unset METRICS to enable them.")
+            return
+        action = args[0].lower() if args else "table"
+        if action == "reset" and len(args) == 1:
+            METRICS.reset()
+            logging.info("Latency metrics reset.")
+            print("Latency metrics reset.")
+            return
+        if action in ("json", "prometheus") and len(args) == 1:
+            # Printed only: server clients reach this command too, so it must not write files
+            text = METRICS.to_json() if action == "json" else METRICS.to_prometheus()
+            print(text.rstrip("\n"))
+            return
+        if action != "table" or len(args) > 1:
+            print("Invalid format. Please use 'stats', 'stats json', 'stats prometheus' or 'stats reset'.")
+            return
+        snapshot = METRICS.snapshot()
+        logging.info("Displaying latency metrics.")
+        if not snapshot:
+            print("No metrics recorded yet.")
+            return
+        print(f"{'name':<20} {'count':>8} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for name, summary in snapshot.items():
+            print(f"{name:<20} {summary['count']:>8} {summary['errors']:>7} {summary['p50_s'] * 1000:>9.3f} "
+                  f"{summary['p95_s'] * 1000:>9.3f} {summary['p99_s'] * 1000:>9.3f}")
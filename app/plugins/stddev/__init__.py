@@ -0,0 +1,16 @@
+import logging
+from app import ShowHistoryManager
+from app.commands import Command
+from calculator.statistics import RunningMoments, describe_inputs, iter_numbers
+
+class StddevCommand(Command):
+    def execute(self, *args):
+        """Sample standard deviation of the numbers given as arguments or in files: 'stddev 1 2 3'."""
+        if not args:
+            logging.error("Error: 'stddev' command requires numbers.")
+            raise TypeError("Error: 'stddev' command requires numbers or @file arguments, e.g. 'stddev 1 2 3'.")
+        moments = RunningMoments.of(iter_numbers(args))
+        result = moments.stddev
+        logging.info("The standard deviation of %d numbers is %s", moments.count, result)
+        print(f"The standard deviation of {moments.count} numbers is {result}")
+        ShowHistoryManager.add_calculation("stddev", describe_inputs(args, moments.count), "", result)
@@ -1,5 +1,9 @@
 import logging
+from app import ShowHistoryManager
 from app.commands import Command
+from calculator.calculation import Calculation
+from calculator.numeric import NumericMode
+from calculator.operations import subtract
 
 class SubtractCommand(Command):
     def execute(self, *args):
@@ -9,12 +13,13 @@ class SubtractCommand(Command):
             raise TypeError("Error: 'subtract' command requires exactly 2 arguments.")
 
         try:
-            a = int(args[0])
-            b = int(args[1])
-            result = a - b
-            logging.info(f"The result of {a} - {b} is {result}")
+            a = NumericMode.parse(args[0])
+            b = NumericMode.parse(args[1])
+            result = Calculation.create(a, b, subtract).perform()
+            logging.info("The result of %s - %s is %s", a, b, result)
             print(f"The result of {a} - {b} is {result}")
+            ShowHistoryManager.add_calculation("subtract", a, b, result)
         except ValueError:
             # Raising ValueError for invalid input
-            logging.error("Invalid input: Please provide valid integers.")
-            raise ValueError("Invalid input: Please provide valid integers.")
\ No newline at end of file
+            logging.error("Invalid input: Please provide valid numbers.")
+            raise ValueError("Invalid input: Please provide valid numbers.")
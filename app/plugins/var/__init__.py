@@ -0,0 +1,16 @@
+import logging
+from app import ShowHistoryManager
+from app.commands import Command
+from calculator.statistics import RunningMoments, describe_inputs, iter_numbers
+
+class VarCommand(Command):
+    def execute(self, *args):
+        """Sample variance of the numbers given as arguments or in files: 'var 1 2 3' or 'var @numbers.txt'."""
+        if not args:
+            logging.error("Error: 'var' command requires numbers.")
+            raise TypeError("Error: 'var' command requires numbers or @file arguments, e.g. 'var 1 2 3'.")
+        moments = RunningMoments.of(iter_numbers(args))
+        result = moments.variance
+        logging.info("The variance of %d numbers is %s", moments.count, result)
+        print(f"The variance of {moments.count} numbers is {result}")
+        ShowHistoryManager.add_calculation("var", describe_inputs(args, moments.count), "", result)
@@ -0,0 +1,74 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import time
+import logging
+
+DEFAULT_TOP = 20
+MAX_STACK_DEPTH = 64
+
+def frame_label(func) -> str:
+    filename, line, name = func
+    if filename == "~":  # Built-in functions have no source file
+        return name
+    return f"{os.path.basename(filename)}:{line}:{name}"
+
+def collapsed_stacks(stats: pstats.Stats) -> list:
+    """Turn profile statistics into collapsed-stack lines ("a;b;c microseconds") for flame graph tools.
+
+    cProfile only records caller -> callee edges, not whole stacks, so each
+    function's own time is attributed to one stack built by repeatedly following
+    the caller that spent the most time in it.
+    """
+    lines = []
+    for func, (_, _, own_time, _, callers) in stats.stats.items():
+        microseconds = int(own_time * 1e6)
+        if microseconds <= 0:
+            continue
+        stack = [func]
+        while callers and len(stack) < MAX_STACK_DEPTH:
+            cumulative = {candidate: timing[3] for candidate, timing in callers.items()}
+            caller = max(cumulative, key=cumulative.get)
+            if caller in stack:
+                break  # Recursion
+            stack.append(caller)
+            callers = stats.stats[caller][4] if caller in stats.stats else {}
+        lines.append(";".join(frame_label(frame) for frame in reversed(stack)) + f" {microseconds}")
+    return sorted(lines)
+
+class SessionProfiler:
+    """cProfile wrapper for whole REPL, batch or server sessions.
+
+    On stop the raw statistics are written as ``<name>.pstats`` (load them with
+    ``python -m pstats``) and ``<name>.collapsed`` (for flamegraph.pl or
+    speedscope) in ``directory``, and the ``top`` functions by cumulative time
+    are printed to stderr.
+    """
+
+    def __init__(self, directory: str = "logs", top: int = DEFAULT_TOP):
+        self.directory = directory
+        self.top = top
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self, label: str = "session") -> str:
+        """Stop profiling, write the output files and print the summary. Returns the output path prefix."""
+        self.profile.disable()
+        os.makedirs(self.directory, exist_ok=True)
+        prefix = os.path.join(self.directory, f"profile-{label}-{time.strftime('%Y%m%d-%H%M%S')}")
+        self.profile.dump_stats(f"{prefix}.pstats")
+        stats = pstats.Stats(self.profile)
+        with open(f"{prefix}.collapsed", "w", encoding="utf-8") as handle:
+            handle.write("\n".join(collapsed_stacks(stats)) + "\n")
+
+        summary = io.StringIO()
+        stats.stream = summary
+        stats.sort_stats("cumulative").print_stats(self.top)
+        print(f"Profile written to {prefix}.pstats and {prefix}.collapsed", file=sys.stderr)
+        print(summary.getvalue().strip("\n"), file=sys.stderr)
+        logging.info("Profile written to %s.pstats.", prefix)
+        return prefix
@@ -0,0 +1,101 @@
+import asyncio
+import io
+import logging
+from contextlib import redirect_stdout
+
+from app.commands import CommandHandler
+
+PROMPT = ">>> "  # Sent after the greeting and after every response; clients read up to it
+FLUSH_INTERVAL = 0.05  # Seconds between flushes of the shared history buffer
+HISTORY_BUFFER_SIZE = 1000  # Buffered history records that force an early flush
+
+class CalculatorServer:
+    """Line-protocol TCP front end for the calculator.
+
+    Every connection is a session: each line a client sends is run through the
+    same ``CommandHandler`` as the REPL and the printed output is sent back,
+    followed by ``PROMPT``. Commands run one at a time on the event loop, so the
+    history store is shared by all sessions without extra locking; its writes
+    are buffered and flushed together every ``FLUSH_INTERVAL`` seconds.
+    """
+
+    def __init__(self, command_handler: CommandHandler, store, host: str = "127.0.0.1", port: int = 8765,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.command_handler = command_handler
+        self.store = store
+        self.host = host
+        self.port = port
+        self.flush_interval = flush_interval
+        self.server = None
+        self.sessions = 0  # Connected clients
+        self.commands_run = 0
+
+    def run_line(self, line: str):
+        """Run one line and return (output, keep_open)."""
+        output = io.StringIO()
+        keep_open = True
+        with redirect_stdout(output):
+            try:
+                self.command_handler.execute_command(line)
+            except SystemExit:  # 'exit' ends this session, not the server
+                keep_open = False
+        self.commands_run += 1
+        return output.getvalue(), keep_open
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        peer = writer.get_extra_info("peername")
+        self.sessions += 1
+        logging.info("Client %s connected (%d sessions).", peer, self.sessions)
+        try:
+            writer.write(f"Calculator server. Type 'menu' to see all available commands.\n{PROMPT}".encode("utf-8"))
+            while True:
+                data = await reader.readline()
+                if not data:
+                    break
+                output, keep_open = self.run_line(data.decode("utf-8", errors="replace").strip())
+                writer.write((output + PROMPT if keep_open else output).encode("utf-8"))
+                await writer.drain()
+                if not keep_open:
+                    break
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError) as e:
+            logging.warning("Client %s dropped: %s", peer, e)
+        finally:
+            self.sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            logging.info("Client %s disconnected.", peer)
+
+    async def flush_history(self):
+        """Write buffered history records to the backend at a fixed interval."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.store.flush()
+
+    async def start(self):
+        """Start listening. ``port`` is updated with the bound port (useful when it is 0)."""
+        self.store.begin_batch(HISTORY_BUFFER_SIZE)
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port, backlog=1024)
+        self.port = self.server.sockets[0].getsockname()[1]
+        logging.info("Calculator server listening on %s:%d.", self.host, self.port)
+        return self.server
+
+    async def serve_forever(self):
+        await self.start()
+        flusher = asyncio.create_task(self.flush_history())
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            flusher.cancel()
+            self.store.end_batch()
+            logging.info("Calculator server stopped after %d commands.", self.commands_run)
+
+    async def close(self):
+        """Stop accepting clients and write any buffered history."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.store.end_batch()
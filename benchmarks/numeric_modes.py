@@ -0,0 +1,81 @@
+"""Throughput benchmark for the decimal and float numeric modes.
+
+Runs the same random operands through parsing plus Calculation.perform, the
+add/divide command plugins and the expression evaluator in each mode (decimal
+at a few precisions, then float) and reports calculations per second.
+
+Usage: python benchmarks/numeric_modes.py [--size N] [--precisions P [P ...]]
+"""
+import argparse
+import contextlib
+import io
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from app import ShowHistoryManager
+from app.commands import CommandHandler
+from app.plugins.add import AddCommand
+from app.plugins.divide import DivideCommand
+from calculator.calculation import Calculation
+from calculator.expression import evaluate_expression
+from calculator.numeric import NumericMode
+from calculator.operations import OPERATIONS
+
+def make_operands(size: int, seed: int = 601) -> list:
+    rng = random.Random(seed)
+    return [(f"{rng.uniform(1, 10**6):.6f}", f"{rng.uniform(1, 10**3):.3f}") for _ in range(size)]
+
+def bench_calculations(operands: list) -> None:
+    for position, (a, b) in enumerate(operands):
+        Calculation.create(NumericMode.parse(a), NumericMode.parse(b), OPERATIONS[position % 4]).perform()
+
+def bench_commands(operands: list) -> None:
+    handler = CommandHandler()
+    handler.register_command("add", AddCommand())
+    handler.register_command("divide", DivideCommand())
+    with contextlib.redirect_stdout(io.StringIO()):
+        for position, (a, b) in enumerate(operands):
+            handler.execute_command(f"{'divide' if position % 2 else 'add'} {a} {b}")
+
+def bench_expressions(operands: list) -> None:
+    for a, b in operands:
+        evaluate_expression(f"({a} + {b}) * {b} / {a}")
+
+BENCHMARKS = {"calculation": bench_calculations, "command": bench_commands, "expression": bench_expressions}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=100_000, help="calculations per benchmark")
+    parser.add_argument("--precisions", type=int, nargs="+", default=[28, 50, 100],
+                        help="decimal precisions to measure")
+    args = parser.parse_args()
+
+    operands = make_operands(args.size)
+    logging.disable()  # Measure arithmetic, not log formatting
+    modes = [("decimal", precision) for precision in args.precisions] + [("float", None)]
+    print(f"{args.size} calculations per benchmark")
+    print(f"{'mode':<14}" + "".join(f"{name + ' calc/s':>20}" for name in BENCHMARKS))
+    with tempfile.TemporaryDirectory(prefix="calc-bench-") as directory:
+        ShowHistoryManager.FILE_PATH = os.path.join(directory, "history.csv")
+        ShowHistoryManager.store = None
+        for mode, precision in modes:
+            NumericMode.configure(mode, precision)
+            row = []
+            for run in BENCHMARKS.values():
+                start = time.perf_counter()
+                run(operands)
+                row.append(args.size / (time.perf_counter() - start))
+            label = f"{mode}/{precision}" if precision else mode
+            print(f"{label:<14}" + "".join(f"{rate:>20.0f}" for rate in row))
+        if ShowHistoryManager.store is not None:
+            ShowHistoryManager.store.wait_for_compaction()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Scaling benchmark for process-pool parallel evaluation.
+
+Evaluates the same batch of Decimal calculations with 1, 2, 4, ... workers (up
+to the number of cores) and reports throughput and speedup over one worker.
+
+Usage: python benchmarks/parallel.py [--size N] [--chunk-size N] [--max-workers N] [--precision P]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal, localcontext
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculator.parallel import DEFAULT_CHUNK_SIZE, ParallelEvaluator  # pylint: disable=wrong-import-position
+
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+def make_batch(size: int, seed: int = 601) -> list:
+    rng = random.Random(seed)
+    return [(Decimal(rng.randint(1, 10**12)) / 7, Decimal(rng.randint(1, 10**6)), rng.choice(OPERATIONS))
+            for _ in range(size)]
+
+def worker_counts(max_workers: int) -> list:
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=500_000, help="calculations per batch")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--precision", type=int, default=50, help="decimal precision used for the run")
+    args = parser.parse_args()
+
+    batch = make_batch(args.size)
+    print(f"{args.size} calculations, chunk size {args.chunk_size}, precision {args.precision}, "
+          f"{os.cpu_count()} cores")
+    baseline = None
+    with localcontext() as context:
+        context.prec = args.precision
+        for workers in worker_counts(args.max_workers):
+            with ParallelEvaluator(workers, args.chunk_size) as evaluator:
+                evaluator.evaluate(batch[:args.chunk_size * workers])  # Warm up the pool
+                start = time.perf_counter()
+                evaluator.evaluate(batch)
+                elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"workers={workers:<3} {elapsed:8.3f}s {args.size / elapsed:12.0f} calc/s "
+                  f"speedup x{baseline / elapsed:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Load-test client for the calculator server (``python main.py --serve``).
+
+Opens many concurrent sessions, sends each one a stream of calculation
+commands and reports throughput and per-command latency percentiles.
+
+Usage: python benchmarks/server_load.py [--clients N] [--commands N] [--host H] [--port P] [--spawn]
+With --spawn a server is started in a subprocess (history in a temporary
+directory) and stopped when the run finishes.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = b">>> "
+COMMANDS = ("add {i} 2", "subtract {i} 2", "multiply {i} 2", "divide {i} 2")
+
+async def session(host: str, port: int, commands: int, offset: int, latencies: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    await reader.readuntil(PROMPT)  # Greeting
+    for i in range(commands):
+        line = COMMANDS[(offset + i) % len(COMMANDS)].format(i=offset + i + 1)
+        start = time.perf_counter()
+        writer.write(f"{line}\n".encode("utf-8"))
+        await writer.drain()
+        await reader.readuntil(PROMPT)
+        latencies.append(time.perf_counter() - start)
+    writer.write(b"exit\n")
+    await writer.drain()
+    await reader.read()
+    writer.close()
+
+async def run(host: str, port: int, clients: int, commands: int) -> dict:
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*(session(host, port, commands, n * commands, latencies) for n in range(clients)),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    failures = [result for result in results if isinstance(result, Exception)]
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+    return {
+        "clients": clients,
+        "failed_sessions": len(failures),
+        "commands": len(latencies),
+        "seconds": elapsed,
+        "commands_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+
+def spawn_server(port: int, directory: str) -> subprocess.Popen:
+    env = dict(os.environ, HISTORY_FILE=os.path.join(directory, "history.csv"))
+    server = subprocess.Popen([sys.executable, "main.py", "--serve", "--port", str(port)], cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("Server did not start.")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--commands", type=int, default=20, help="commands sent by each client")
+    parser.add_argument("--spawn", action="store_true", help="start a server subprocess for the run")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        server = spawn_server(args.port, directory) if args.spawn else None
+        try:
+            report = asyncio.run(run(args.host, args.port, args.clients, args.commands))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+    print(f"{report['clients']} clients ({report['failed_sessions']} failed), {report['commands']} commands "
+          f"in {report['seconds']:.2f}s: {report['commands_per_second']:.0f} commands/s")
+    print(f"latency p50 {report['p50_ms']:.2f} ms, p95 {report['p95_ms']:.2f} ms, p99 {report['p99_ms']:.2f} ms")
+    return 1 if report["failed_sessions"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""Cold-start benchmark for the calculator CLI.
+
+Measures two things in fresh interpreters:
+
+* the cumulative ``-X importtime`` cost of ``import main``, with the slowest
+  modules listed so regressions are easy to trace;
+* the wall-clock time of ``python main.py`` answering ``exit`` at the first prompt.
+
+Usage: python benchmarks/startup.py [--runs N] [--target-ms MS]
+Exits with status 1 when the median import time misses the target or a heavy
+module (pandas, numpy, dotenv) is imported at startup.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pandas", "numpy", "dotenv")
+DEFAULT_TARGET_MS = 150.0
+
+def parse_importtime(stderr: str) -> dict:
+    """Return {module: (self_us, cumulative_us)} from -X importtime output."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+def measure_imports() -> dict:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    return parse_importtime(result.stderr)
+
+def measure_cold_start() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "main.py"], cwd=ROOT, input="exit\n",
+                   capture_output=True, text=True, check=False)
+    return (time.perf_counter() - start) * 1000
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target-ms", type=float, default=DEFAULT_TARGET_MS,
+                        help="maximum median import time of main.py in milliseconds")
+    args = parser.parse_args(argv)
+
+    import_times = []
+    timings = {}
+    for _ in range(args.runs):
+        timings = measure_imports()
+        import_times.append(timings["main"][1] / 1000)
+    cold_starts = [measure_cold_start() for _ in range(args.runs)]
+
+    median_import = statistics.median(import_times)
+    print(f"import main:      median {median_import:.1f} ms over {args.runs} runs (target {args.target_ms:.0f} ms)")
+    print(f"main.py -> exit:  median {statistics.median(cold_starts):.1f} ms")
+    print("Slowest modules by self time (last run):")
+    for name, (self_us, cumulative_us) in sorted(timings.items(), key=lambda item: -item[1][0])[:10]:
+        print(f"  {self_us / 1000:7.2f} ms self {cumulative_us / 1000:8.2f} ms cumulative  {name}")
+
+    heavy = sorted(name for name in timings if name.split(".")[0] in HEAVY_MODULES)
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy[:5])}")
+        return 1
+    if median_import > args.target_ms:
+        print("FAIL: startup is slower than the target")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
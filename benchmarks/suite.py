@@ -0,0 +1,222 @@
+"""Benchmark suite for the calculator core, REPL dispatch and history persistence.
+
+Runs each benchmark a few times and keeps the median. The results can be
+written as JSON and compared against a saved baseline, which fails the run
+when a benchmark got slower than the allowed threshold.
+
+Benchmarks:
+
+* ``calculator.<operation>``: Calculator.add/subtract/multiply/divide on Decimals;
+* ``command.execute``: CommandHandler.execute_command with the plugins loaded;
+* ``history.add[N]``, ``history.load[N]``, ``history.delete[N]``: ShowHistoryManager
+  on a history that already holds N rows, for every N in --sizes;
+* ``startup.import`` and ``startup.cold_start``: see benchmarks/startup.py.
+
+Usage:
+    python benchmarks/suite.py [--sizes 1000,100000,1000000] [--only PREFIX] [--runs N]
+                               [--json results.json] [--baseline baseline.json] [--threshold 0.2]
+
+Logging is disabled while benchmarking so the numbers measure the code, not the
+log handlers; pass --with-logging to keep it.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# pylint: disable=wrong-import-position
+from app import App, ShowHistoryManager
+from app.history.backends import BACKENDS, create_backend
+from benchmarks import startup
+from calculator import Calculator
+from calculator.calculation_history import Calculations
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+DEFAULT_THRESHOLD = 0.2  # Allowed slowdown before a benchmark counts as a regression
+OPERATIONS_PER_RUN = 10_000
+HISTORY_OPERATIONS_PER_RUN = 100
+
+class Benchmark:
+    """A named workload of ``operations`` operations.
+
+    ``setup`` runs untimed before every run and its return value is passed to
+    ``run``. A run that measures itself (such as a subprocess) returns its own
+    duration in seconds instead of None.
+    """
+
+    def __init__(self, name: str, run, operations: int = 1, setup=None):
+        self.name = name
+        self.run = run
+        self.operations = operations
+        self.setup = setup
+
+    def measure(self, runs: int) -> dict:
+        timings = []
+        for _ in range(runs):
+            state = self.setup() if self.setup else None
+            start = time.perf_counter()
+            measured = self.run(state)
+            timings.append(time.perf_counter() - start if measured is None else measured)
+        median = statistics.median(timings)
+        return {
+            "runs": runs,
+            "operations": self.operations,
+            "median_s": median,
+            "min_s": min(timings),
+            "per_op_us": median / self.operations * 1e6,
+            "ops_per_s": self.operations / median if median else 0.0,
+        }
+
+def calculator_benchmarks():
+    operands = [(Decimal(i) / 7, Decimal(i % 97 + 1)) for i in range(OPERATIONS_PER_RUN)]
+
+    def make(name):
+        operation = getattr(Calculator, name)
+
+        def run(_):
+            for a, b in operands:
+                operation(a, b)
+            Calculations.clear_history()
+        return Benchmark(f"calculator.{name}", run, OPERATIONS_PER_RUN)
+
+    return [make(name) for name in ("add", "subtract", "multiply", "divide")]
+
+def command_benchmarks(app: App):
+    lines = [f"{op} {i} {i % 9 + 1}" for i in range(OPERATIONS_PER_RUN)
+             for op in ("add", "subtract", "multiply", "divide")][:OPERATIONS_PER_RUN]
+
+    def run(_):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for line in lines:
+                app.command_handler.execute_command(line)
+
+    return [Benchmark("command.execute", run, OPERATIONS_PER_RUN, setup=fresh_history)]
+
+def fresh_history(size: int = 0):
+    """Replace the benchmark history with a new one holding ``size`` rows."""
+    if ShowHistoryManager.store is not None:
+        ShowHistoryManager.store.wait_for_compaction()
+        ShowHistoryManager.store.backend.clear()
+    backend = create_backend(ShowHistoryManager.BACKEND, ShowHistoryManager.FILE_PATH)
+    backend.clear()
+    backend.rewrite([["add", str(i), "1", str(i + 1)] for i in range(size)])
+    ShowHistoryManager.store = None
+    return size
+
+def history_benchmarks(sizes):
+    benchmarks = []
+    for size in sizes:
+        def add(_):
+            for i in range(HISTORY_OPERATIONS_PER_RUN):
+                ShowHistoryManager.add_calculation("add", i, 1, i + 1)
+
+        def load(_):
+            ShowHistoryManager.load_history()
+
+        def delete(rows):
+            with contextlib.redirect_stdout(io.StringIO()):
+                for i in range(HISTORY_OPERATIONS_PER_RUN):
+                    ShowHistoryManager.delete_calculation((i * 7919) % (rows - i))
+
+        def setup(size=size):
+            return fresh_history(size)
+
+        benchmarks.append(Benchmark(f"history.add[{size}]", add, HISTORY_OPERATIONS_PER_RUN, setup))
+        benchmarks.append(Benchmark(f"history.load[{size}]", load, 1, setup))
+        if size > HISTORY_OPERATIONS_PER_RUN:
+            benchmarks.append(Benchmark(f"history.delete[{size}]", delete, HISTORY_OPERATIONS_PER_RUN, setup))
+    return benchmarks
+
+def startup_benchmarks():
+    return [
+        Benchmark("startup.import", lambda _: startup.measure_imports()["main"][1] / 1e6),
+        Benchmark("startup.cold_start", lambda _: startup.measure_cold_start() / 1000),
+    ]
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """Return (name, baseline_s, current_s, change) for benchmarks slower than the baseline by more than threshold."""
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous or not previous["median_s"]:
+            continue
+        change = result["median_s"] / previous["median_s"] - 1
+        if change > threshold:
+            regressions.append((name, previous["median_s"], result["median_s"], change))
+    return regressions
+
+def run_suite(sizes=DEFAULT_SIZES, runs: int = 5, only=None) -> dict:
+    app = App()
+    app.load_plugins()
+    benchmarks = (calculator_benchmarks() + command_benchmarks(app) + history_benchmarks(sizes)
+                  + startup_benchmarks())
+    if only:
+        benchmarks = [benchmark for benchmark in benchmarks if benchmark.name.startswith(tuple(only))]
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="calc-bench-") as directory:
+        extension = BACKENDS[ShowHistoryManager.BACKEND].extension
+        ShowHistoryManager.FILE_PATH = os.path.join(directory, f"history{extension}")
+        ShowHistoryManager.store = None
+        for benchmark in benchmarks:
+            results[benchmark.name] = benchmark.measure(runs)
+            print(f"{benchmark.name:<28} {results[benchmark.name]['median_s'] * 1000:10.2f} ms"
+                  f" {results[benchmark.name]['per_op_us']:10.2f} us/op", file=sys.stderr)
+        if ShowHistoryManager.store is not None:
+            ShowHistoryManager.store.wait_for_compaction()
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "history_backend": ShowHistoryManager.BACKEND,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "benchmarks": results,
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated history sizes for the history benchmarks")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--only", action="append", help="only run benchmarks whose name starts with this prefix")
+    parser.add_argument("--json", metavar="FILE", help="write the results as JSON ('-' for stdout)")
+    parser.add_argument("--baseline", metavar="FILE", help="compare the results against a saved JSON baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown against the baseline, as a fraction (default 0.2)")
+    parser.add_argument("--with-logging", action="store_true", help="keep application logging enabled")
+    args = parser.parse_args(argv)
+
+    if not args.with_logging:
+        logging.disable(logging.CRITICAL)
+    results = run_suite([int(size) for size in args.sizes.split(",") if size], args.runs, args.only)
+
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            regressions = compare(results, json.load(handle), args.threshold)
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: {before * 1000:.2f} ms -> {after * 1000:.2f} ms (+{change:.0%})",
+                  file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
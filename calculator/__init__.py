@@ -1,6 +1,7 @@
 from calculator.calculation_history import Calculations
-from calculator.operations import add, subtract, multiply, divide
+from calculator.operations import OPERATIONS, add, subtract, multiply, divide
 from calculator.calculation import Calculation
+from calculator.numeric import NumericMode
 from decimal import Decimal
 from typing import Callable
 
@@ -8,8 +9,13 @@ class Calculator:
     @staticmethod
     def _perform_operation(a: Decimal, b: Decimal, operation: Callable[[Decimal, Decimal], Decimal]) -> Decimal:
         calculation = Calculation.create(a, b, operation)
-        Calculations.add_calculation(calculation)
-        return calculation.perform()
+        try:
+            result = calculation.perform()
+        except (ValueError, ArithmeticError):
+            Calculations.add_calculation(calculation, None)  # Failed calculations are recorded too
+            raise
+        Calculations.add_calculation(calculation, result)
+        return result
 
     @staticmethod
     def add(a: Decimal, b: Decimal) -> Decimal:
@@ -25,4 +31,32 @@ class Calculator:
 
     @staticmethod
     def divide(a: Decimal, b: Decimal) -> Decimal:
-        return Calculator._perform_operation(a, b, divide)
\ No newline at end of file
+        return Calculator._perform_operation(a, b, divide)
+
+    @staticmethod
+    def evaluate_bulk(a, b, operations):
+        """Evaluate arrays of operands and operation names/codes in one vectorized pass.
+
+        The batch is recorded in history as a single columnar block. Divisions by
+        zero are masked in the returned array.
+        """
+        from calculator.vectorized import CalculationBatch  # pylint: disable=import-outside-toplevel
+        batch = CalculationBatch.create(a, b, operations)
+        Calculations.add_batch(batch)
+        return batch.perform()
+
+    @staticmethod
+    def evaluate_parallel(calculations, workers=None, chunk_size=None):
+        """Evaluate (a, b, operation) triples in the active numeric mode across worker processes.
+
+        Results and history entries keep the input order. Failed calculations
+        (e.g. division by zero) yield the exception instead of a result.
+        """
+        from calculator.parallel import DEFAULT_CHUNK_SIZE, ParallelEvaluator, to_code  # pylint: disable=import-outside-toplevel
+        calculations = [(NumericMode.parse(a), NumericMode.parse(b), OPERATIONS[to_code(op)]) for a, b, op in calculations]
+        with ParallelEvaluator(workers, chunk_size or DEFAULT_CHUNK_SIZE) as evaluator:
+            results = evaluator.evaluate(calculations)
+        # The workers' results are indexed as they are, so the batch is not computed again here
+        Calculations.add_calculations(
+            (Calculation.create(a, b, operation), result) for (a, b, operation), result in zip(calculations, results))
+        return results
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from decimal import getcontext
+from typing import Callable
+
+class ResultCache:
+    """Bounded LRU cache of calculation results.
+
+    Entries are keyed on the operation, both operands (type and exact text, so
+    2, 2.0 and Decimal('2.0') stay distinct) and the active decimal precision and
+    rounding. Errors such as division by zero are cached too and raised again on
+    every hit.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize <= 0:
+            raise ValueError("Cache size must be a positive number")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(operation: Callable, a, b) -> tuple:
+        context = getcontext()
+        return (operation, type(a), str(a), type(b), str(b), context.prec, context.rounding)
+
+    def perform(self, operation: Callable, a, b):
+        """Return operation(a, b), computing it only on a cache miss."""
+        key = self.make_key(operation, a, b)
+        try:
+            succeeded, value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            try:
+                succeeded, value = True, operation(a, b)
+            except (ValueError, ArithmeticError) as e:
+                succeeded, value = False, e
+            self.entries[key] = (succeeded, value)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)  # Evict the least recently used entry
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        if succeeded:
+            return value
+        raise type(value)(*value.args)
+
+    def clear(self):
+        """Drop all entries and reset the statistics."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -2,6 +2,9 @@ from decimal import Decimal
 from typing import Callable
 
 class Calculation:
+    __slots__ = ("a", "b", "operation")
+    cache = None  # Optional ResultCache shared by all calculations
+
     def __init__(self, a: Decimal, b: Decimal, operation: Callable[[Decimal, Decimal], Decimal]):
         self.a = a
         self.b = b
@@ -12,6 +15,8 @@ class Calculation:
         return Calculation(a, b, operation)
 
     def perform(self) -> Decimal:
+        if Calculation.cache is not None:
+            return Calculation.cache.perform(self.operation, self.a, self.b)
         return self.operation(self.a, self.b)
 
     def __repr__(self):
@@ -1,15 +1,76 @@
+import sys
+from collections import deque
 from decimal import Decimal
-from typing import Callable, List
+from typing import TYPE_CHECKING, Callable, List, Optional
 
 from calculator.calculation import Calculation
+from calculator.columnar_history import ColumnarHistory
+from calculator.history_index import HistoryIndex, result_of
+
+if TYPE_CHECKING:  # NumPy is only imported once bulk evaluation is used
+    from calculator.vectorized import CalculationBatch
+
+EVICTION_POLICIES = ("drop_oldest", "ignore_new")
+NOT_PERFORMED = object()  # Result argument for calculations the caller has not performed
 
 class Calculations:
     history: List[Calculation] = []
+    batches: List["CalculationBatch"] = []
+    max_size: Optional[int] = None
+    eviction: str = "drop_oldest"
+    index = HistoryIndex()
+
+    @classmethod
+    def configure(cls, max_size: Optional[int] = None, eviction: str = "drop_oldest", columnar: bool = False):
+        """Choose the history representation, size cap and eviction policy. Existing history is discarded.
+
+        Once ``max_size`` entries are stored, "drop_oldest" evicts the oldest
+        calculation to make room and "ignore_new" stops recording new ones.
+        """
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction}")
+        if max_size is not None and max_size <= 0:
+            raise ValueError("max_size must be a positive number")
+        cls.max_size = max_size
+        cls.eviction = eviction
+        if columnar:
+            cls.history = ColumnarHistory(max_size)
+        elif max_size is not None:
+            cls.history = deque(maxlen=max_size)
+        else:
+            cls.history = []
+        cls.batches.clear()
+        cls.index.clear()
+
+    @classmethod
+    def add_calculation(cls, calculation: Calculation, result=NOT_PERFORMED):
+        """Add a new calculation to the history.
+
+        Callers that already performed the calculation pass its result (None if
+        it failed), so indexing does not compute it a second time.
+        """
+        if cls.max_size is not None and cls.eviction == "ignore_new" and len(cls.history) >= cls.max_size:
+            return
+        cls.history.append(calculation)  # Capped containers evict the oldest entry themselves
+        cls.index.add(calculation, result_of(calculation) if result is NOT_PERFORMED else result)
+        if cls.index.stale(len(cls.history)):
+            cls.index.rebuild(cls.history, cls.first_seq())
+
+    @classmethod
+    def add_calculations(cls, entries):
+        """Add (calculation, result) pairs in order; a result that is an exception marks a failed calculation."""
+        for calculation, result in entries:
+            cls.add_calculation(calculation, None if isinstance(result, Exception) else result)
+
+    @classmethod
+    def add_batch(cls, batch: "CalculationBatch"):
+        """Add a block of vectorized calculations to the history."""
+        cls.batches.append(batch)
 
     @classmethod
-    def add_calculation(cls, calculation: Calculation):
-        """Add a new calculation to the history."""
-        cls.history.append(calculation)
+    def get_batches(cls) -> List["CalculationBatch"]:
+        """Retrieve the blocks of vectorized calculations."""
+        return cls.batches
 
     @classmethod
     def get_history(cls) -> List[Calculation]:
@@ -20,6 +81,8 @@ class Calculations:
     def clear_history(cls):
         """Clear the history of calculations."""
         cls.history.clear()
+        cls.batches.clear()
+        cls.index.clear()
 
     @classmethod
     def get_latest(cls) -> Calculation:
@@ -28,7 +91,59 @@ class Calculations:
             return cls.history[-1]
         return None
 
+    @classmethod
+    def get_latest_n(cls, count: int) -> List[Calculation]:
+        """Get the latest ``count`` calculations, oldest first."""
+        size = len(cls.history)
+        return [cls.history[i] for i in range(max(size - count, 0), size)]
+
     @classmethod
     def find_by_operation(cls, operation_name: str) -> List[Calculation]:
         """Find and return a list of calculations by operation name."""
-        return [calc for calc in cls.history if calc.operation.__name__ == operation_name]
+        return cls._entries(cls.index.find_operation(operation_name, cls.first_seq()))
+
+    @classmethod
+    def find_in_range(cls, field: str, low: Optional[Decimal] = None, high: Optional[Decimal] = None) -> List[Calculation]:
+        """Find calculations whose operand ("a", "b") or "result" lies between low and high (inclusive)."""
+        return cls._entries(cls.index.find_range(field, low, high, cls.first_seq()))
+
+    @classmethod
+    def query(cls, operation: Optional[str] = None, field: Optional[str] = None,
+              low: Optional[Decimal] = None, high: Optional[Decimal] = None,
+              latest: Optional[int] = None) -> List[Calculation]:
+        """Filter history by operation and/or a value range, optionally keeping only the latest matches."""
+        first_seq = cls.first_seq()
+        if operation is None and field is None:
+            return cls.get_latest_n(latest) if latest is not None else list(cls.history)
+        if field is None:
+            seqs = cls.index.find_operation(operation, first_seq)
+        else:
+            seqs = cls.index.find_range(field, low, high, first_seq)
+            if operation is not None:
+                wanted = set(cls.index.find_operation(operation, first_seq))
+                seqs = [seq for seq in seqs if seq in wanted]
+        if latest is not None:
+            seqs = seqs[-latest:] if latest > 0 else []
+        return cls._entries(seqs)
+
+    @classmethod
+    def first_seq(cls) -> int:
+        """Sequence number of the oldest calculation still in history."""
+        return cls.index.next_seq - len(cls.history)
+
+    @classmethod
+    def _entries(cls, seqs: List[int]) -> List[Calculation]:
+        first_seq = cls.first_seq()
+        return [cls.history[seq - first_seq] for seq in seqs]
+
+    @classmethod
+    def memory_usage(cls) -> dict:
+        """Report how much memory the in-memory history takes, in total and per entry."""
+        if isinstance(cls.history, ColumnarHistory):
+            total = cls.history.nbytes()
+        else:
+            total = sys.getsizeof(cls.history) + sum(
+                sys.getsizeof(calc) + sys.getsizeof(calc.a) + sys.getsizeof(calc.b) for calc in cls.history
+            )
+        entries = len(cls.history)
+        return {"entries": entries, "bytes": total, "bytes_per_entry": total / entries if entries else 0.0}
@@ -0,0 +1,76 @@
+import sys
+from array import array
+from decimal import Decimal
+from typing import Iterator, Optional
+
+from calculator.calculation import Calculation
+from calculator.operations import OPERATIONS, OPERATION_CODES
+
+class ColumnarHistory:
+    """Array-backed calculation history.
+
+    Operands are stored as doubles and operations as one-byte codes, so each
+    entry costs 17 bytes instead of a Calculation object plus two Decimals.
+    Calculations are rebuilt on access; operands that do not fit in a double
+    lose precision. With ``max_size`` set the arrays act as a ring buffer and
+    the oldest entry is overwritten once the cap is reached.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size
+        self.a = array("d")
+        self.b = array("d")
+        self.codes = array("B")
+        self.start = 0  # Position of the oldest entry once the ring buffer is full
+
+    def append(self, calculation: Calculation):
+        """Store a calculation, overwriting the oldest one when the cap is reached."""
+        code = OPERATION_CODES[calculation.operation.__name__]
+        if self.max_size is not None and len(self.codes) >= self.max_size:
+            self.a[self.start] = float(calculation.a)
+            self.b[self.start] = float(calculation.b)
+            self.codes[self.start] = code
+            self.start = (self.start + 1) % self.max_size
+            return
+        self.a.append(float(calculation.a))
+        self.b.append(float(calculation.b))
+        self.codes.append(code)
+
+    def clear(self):
+        """Remove every entry."""
+        self.a = array("d")
+        self.b = array("d")
+        self.codes = array("B")
+        self.start = 0
+
+    def position(self, index: int) -> int:
+        """Translate a history index into a position in the underlying arrays."""
+        size = len(self.codes)
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError("history index out of range")
+        return (self.start + index) % size
+
+    def entry(self, position: int) -> Calculation:
+        """Rebuild the Calculation stored at an array position."""
+        return Calculation(Decimal(repr(self.a[position])),
+                           Decimal(repr(self.b[position])),
+                           OPERATIONS[self.codes[position]])
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __bool__(self):
+        return len(self.codes) > 0
+
+    def __getitem__(self, index: int) -> Calculation:
+        return self.entry(self.position(index))
+
+    def __iter__(self) -> Iterator[Calculation]:
+        for index in range(len(self.codes)):
+            yield self[index]
+
+    def nbytes(self) -> int:
+        """Memory used by the container and its arrays, in bytes."""
+        return sys.getsizeof(self) + sum(sys.getsizeof(column) for column in (self.a, self.b, self.codes))
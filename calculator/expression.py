@@ -0,0 +1,51 @@
+import ast
+from decimal import Decimal
+from functools import lru_cache
+from typing import Callable
+
+from calculator.numeric import NumericMode
+from calculator.operations import add, subtract, multiply, divide
+
+EXPRESSION_CACHE_SIZE = 1024
+BINARY_OPERATIONS = {ast.Add: add, ast.Sub: subtract, ast.Mult: multiply, ast.Div: divide}
+
+def compile_node(node: ast.AST, text: str) -> Callable[[], Decimal]:
+    """Compile one AST node into a function that evaluates it with calculator.operations."""
+    if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATIONS:
+        operation = BINARY_OPERATIONS[type(node.op)]
+        left = compile_node(node.left, text)
+        right = compile_node(node.right, text)
+        return lambda: operation(left(), right())
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        operand = compile_node(node.operand, text)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        zero = NumericMode.number_type(0)
+        return lambda: subtract(zero, operand())
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = NumericMode.parse(ast.get_source_segment(text, node))  # From the literal text, so 0.1 stays exact
+        return lambda: value
+    raise ValueError(f"Unsupported syntax in expression: {ast.get_source_segment(text, node) or text}")
+
+def compile_expression(text: str) -> Callable[[], Decimal]:
+    """Parse an arithmetic expression (+ - * /, unary minus, parentheses) and compile it.
+
+    Compiled expressions are cached by their text and the numeric mode; call the
+    returned function to evaluate it under the current decimal context.
+    """
+    return compile_cached(text.strip(), NumericMode.mode)
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_cached(text: str, mode: str) -> Callable[[], Decimal]:  # pylint: disable=unused-argument
+    try:
+        return compile_node(ast.parse(text, mode="eval").body, text)
+    except (SyntaxError, RecursionError, MemoryError):
+        raise ValueError(f"Invalid expression: {text}") from None
+
+def evaluate_expression(text: str) -> Decimal:
+    """Evaluate an arithmetic expression in the active numeric mode."""
+    evaluate = compile_expression(text)
+    try:
+        return evaluate()
+    except RecursionError:
+        raise ValueError(f"Expression is nested too deeply: {text}") from None
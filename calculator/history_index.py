@@ -0,0 +1,131 @@
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from calculator.calculation import Calculation
+
+RANGE_FIELDS = ("a", "b", "result")
+
+def orderable(value) -> bool:
+    """Whether a value can be sorted against others: NaN (quiet or signaling) cannot."""
+    is_nan = getattr(value, "is_nan", None)  # Decimal; comparing a signaling NaN would raise
+    return not is_nan() if is_nan is not None else value == value  # pylint: disable=comparison-with-itself
+
+class RangeIndex:
+    """Sorted index over one numeric field, kept as tiers of sorted runs.
+
+    New entries collect in a small unsorted buffer. A full buffer is sorted into
+    a run, and once a tier holds FANOUT runs they are merged into one run on the
+    next tier, so inserts are cheap amortized and a range query only needs a
+    bisect per run plus a scan of the buffer.
+    """
+    BUFFER_SIZE = 64
+    FANOUT = 8
+
+    def __init__(self):
+        self.pending = []  # Unsorted (key, seq) pairs
+        self.tiers = []  # tiers[i] is a list of (keys, seqs) runs
+
+    def add(self, value, seq: int):
+        """Index a value; NaN has no place in the order, so it is left out like a missing result."""
+        if not orderable(value):
+            return
+        self.pending.append((value, seq))
+        if len(self.pending) >= self.BUFFER_SIZE:
+            self.pending.sort()
+            self._push([key for key, _ in self.pending], [s for _, s in self.pending], 0)
+            self.pending = []
+
+    def _push(self, keys, seqs, tier: int):
+        if tier == len(self.tiers):
+            self.tiers.append([])
+        runs = self.tiers[tier]
+        runs.append((keys, seqs))
+        if len(runs) >= self.FANOUT:
+            pairs = []
+            for run_keys, run_seqs in runs:
+                pairs.extend(zip(run_keys, run_seqs))
+            pairs.sort()  # Timsort merges the already sorted runs
+            self.tiers[tier] = []
+            self._push([key for key, _ in pairs], [s for _, s in pairs], tier + 1)
+
+    def items(self) -> List[tuple]:
+        """Return every indexed (value, seq) pair, in no particular order."""
+        pairs = list(self.pending)
+        for runs in self.tiers:
+            for keys, seqs in runs:
+                pairs.extend(zip(keys, seqs))
+        return pairs
+
+    def find(self, low=None, high=None) -> List[int]:
+        """Return the sequence numbers of values between low and high (inclusive), in order."""
+        found = [seq for key, seq in self.pending
+                 if (low is None or key >= low) and (high is None or key <= high)]
+        for runs in self.tiers:
+            for keys, seqs in runs:
+                start = bisect_left(keys, low) if low is not None else 0
+                stop = bisect_right(keys, high) if high is not None else len(keys)
+                found.extend(seqs[start:stop])
+        found.sort()
+        return found
+
+def result_of(calculation: Calculation):
+    """Compute a calculation's result for indexing, or None if it fails (e.g. division by zero)."""
+    try:
+        # Call the operation directly so indexing does not skew result cache statistics
+        return calculation.operation(calculation.a, calculation.b)
+    except (ValueError, ArithmeticError):
+        return None
+
+class HistoryIndex:
+    """Secondary indexes over the calculation history.
+
+    Every indexed calculation gets a sequence number. Entries evicted from a
+    capped history stay in the indexes until ``stale`` says it is time to rebuild.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self, next_seq: int = 0):
+        self.next_seq = next_seq
+        self.size = 0
+        self.by_operation: Dict[str, List[int]] = {}
+        self.ranges = {field: RangeIndex() for field in RANGE_FIELDS}
+
+    def add(self, calculation: Calculation, result):
+        """Index a calculation and its already computed result (None if it failed)."""
+        seq = self.next_seq
+        self.next_seq += 1
+        self.size += 1
+        self.by_operation.setdefault(calculation.operation.__name__, []).append(seq)
+        self.ranges["a"].add(calculation.a, seq)
+        self.ranges["b"].add(calculation.b, seq)
+        if result is not None:  # Failed calculations have no result to index
+            self.ranges["result"].add(result, seq)
+
+    def rebuild(self, history: Iterable[Calculation], first_seq: int):
+        """Re-index the live history so evicted entries are dropped from the indexes.
+
+        Live entries keep their sequence numbers, so their indexed results are
+        carried over rather than computed again.
+        """
+        results = {seq: value for value, seq in self.ranges["result"].items() if seq >= first_seq}
+        self.clear(first_seq)
+        for seq, calculation in enumerate(history, first_seq):
+            self.add(calculation, results.get(seq))
+
+    def stale(self, live_entries: int) -> bool:
+        """Whether evicted entries outnumber live ones enough to justify a rebuild."""
+        return self.size > 2 * live_entries + 1024
+
+    def find_operation(self, operation_name: str, first_seq: int = 0) -> List[int]:
+        seqs = self.by_operation.get(operation_name, [])
+        return seqs[bisect_left(seqs, first_seq):]
+
+    def find_range(self, field: str, low: Optional[Decimal] = None, high: Optional[Decimal] = None,
+                   first_seq: int = 0) -> List[int]:
+        if field not in self.ranges:
+            raise ValueError(f"Unknown field: {field}. Choose one of {', '.join(RANGE_FIELDS)}.")
+        seqs = self.ranges[field].find(low, high)
+        return seqs[bisect_left(seqs, first_seq):]
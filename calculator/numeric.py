@@ -0,0 +1,38 @@
+import decimal
+from decimal import Decimal, InvalidOperation
+from typing import Optional
+
+NUMERIC_MODES = ("decimal", "float")
+DEFAULT_PRECISION = 28
+
+class NumericMode:
+    """Process-wide choice of number type for calculator operands.
+
+    "decimal" (the default) parses operands as exact Decimals and computes with
+    the configured precision. "float" parses them as native floats, which is
+    faster but rounds to binary (0.1 + 0.2 == 0.30000000000000004).
+    """
+    mode: str = "decimal"
+    number_type = Decimal
+    precision: int = DEFAULT_PRECISION
+
+    @classmethod
+    def configure(cls, mode: str = "decimal", precision: Optional[int] = None):
+        """Select the numeric mode and, for decimal mode, the number of significant digits."""
+        if mode not in NUMERIC_MODES:
+            raise ValueError(f"Unknown numeric mode: {mode}. Choose one of {', '.join(NUMERIC_MODES)}.")
+        if precision is not None and precision <= 0:
+            raise ValueError("Decimal precision must be a positive number")
+        cls.mode = mode
+        cls.number_type = Decimal if mode == "decimal" else float
+        cls.precision = precision or DEFAULT_PRECISION
+        decimal.getcontext().prec = cls.precision
+        decimal.DefaultContext.prec = cls.precision  # Threads started later inherit it
+
+    @classmethod
+    def parse(cls, text):
+        """Convert an operand to the active number type. Raises ValueError for invalid input."""
+        try:
+            return cls.number_type(text)
+        except (ValueError, TypeError, InvalidOperation):
+            raise ValueError(f"Invalid number: {text}") from None
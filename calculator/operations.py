@@ -12,4 +12,8 @@ def multiply(a: Decimal, b: Decimal) -> Decimal:
 def divide(a: Decimal, b: Decimal) -> Decimal:
     if b == 0:
         raise ValueError("Cannot divide by zero")
-    return a / b
\ No newline at end of file
+    return a / b
+
+# Operation codes used for compact (columnar) storage of calculations
+OPERATIONS = (add, subtract, multiply, divide)
+OPERATION_CODES = {operation.__name__: code for code, operation in enumerate(OPERATIONS)}
@@ -0,0 +1,114 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, getcontext
+from itertools import islice
+from typing import Iterable, List, Optional, Tuple
+
+from calculator.calculation import Calculation
+from calculator.numeric import NumericMode
+from calculator.operations import OPERATIONS, OPERATION_CODES
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+def to_code(operation) -> int:
+    """Return the operation code for an operation function or name."""
+    name = operation if isinstance(operation, str) else getattr(operation, "__name__", None)
+    try:
+        return OPERATION_CODES[name]
+    except KeyError:
+        raise ValueError(f"Unknown operation: {operation}") from None
+
+def perform(a: Decimal, b: Decimal, operation):
+    """Return the result of one calculation, or the exception it raised."""
+    try:
+        return Calculation.create(a, b, operation).perform()
+    except (ValueError, ArithmeticError) as e:
+        return e
+
+def evaluate_chunk(a_values: List[str], b_values: List[str], codes: bytes, prec: int, rounding: str,
+                   mode: str = "decimal"):
+    """Evaluate one chunk in a worker, under the caller's numeric mode and decimal context.
+
+    Operands and results cross the process boundary as text, which pickles far
+    faster than Decimal objects. Returns (results, errors): results holds the
+    text of each result (None for failures) and errors maps positions of failed
+    calculations to their exceptions.
+    """
+    context = getcontext()
+    context.prec = prec
+    context.rounding = rounding
+    number_type = Decimal if mode == "decimal" else float
+    results = []
+    errors = {}
+    for position, (a, b, code) in enumerate(zip(a_values, b_values, codes)):
+        result = perform(number_type(a), number_type(b), OPERATIONS[code])
+        if isinstance(result, Exception):
+            errors[position] = result
+            results.append(None)
+        else:
+            results.append(repr(result) if mode == "float" else str(result))  # repr round-trips floats exactly
+    return results, errors
+
+class ParallelEvaluator:
+    """Evaluate large batches of calculations across a pool of worker processes.
+
+    Inputs are cut into chunks of ``chunk_size`` calculations; each chunk is
+    evaluated in a worker with ``Calculation.perform`` and the results come back
+    in input order. Batches that fit in a single chunk, or a single worker, are
+    evaluated in-process to skip the pool overhead. Use as a context manager to
+    keep the pool alive across several batches.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive number")
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def chunks(self, calculations: Iterable) -> Iterable[Tuple[List[str], List[str], bytes]]:
+        """Split calculations into (a_values, b_values, codes) column chunks."""
+        iterator = iter(calculations)
+        while True:
+            chunk = list(islice(iterator, self.chunk_size))
+            if not chunk:
+                return
+            yield ([str(a) for a, _, _ in chunk], [str(b) for _, b, _ in chunk],
+                   bytes(to_code(operation) for _, _, operation in chunk))
+
+    def evaluate(self, calculations: Iterable) -> list:
+        """Evaluate (a, b, operation) triples and return the results in input order.
+
+        ``operation`` is an operation function or name. Failed calculations yield
+        the exception instead of a result.
+        """
+        calculations = list(calculations)
+        number_type = NumericMode.number_type
+        if self.workers == 1 or len(calculations) <= self.chunk_size:
+            return [perform(number_type(a), number_type(b), OPERATIONS[to_code(operation)])
+                    for a, b, operation in calculations]
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        context = getcontext()
+        chunks = list(self.chunks(calculations))
+        outputs = self.executor.map(evaluate_chunk, *zip(*chunks),
+                                    [context.prec] * len(chunks), [context.rounding] * len(chunks),
+                                    [NumericMode.mode] * len(chunks))
+        results = []
+        for chunk_results, errors in outputs:
+            offset = len(results)
+            results.extend(number_type(result) if result is not None else None for result in chunk_results)
+            for position, error in errors.items():
+                results[offset + position] = error
+        return results
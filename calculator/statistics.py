@@ -0,0 +1,230 @@
+import math
+import os
+from bisect import bisect_right
+from decimal import Decimal
+from itertools import accumulate
+from typing import Iterable, Iterator
+
+from calculator.numeric import NumericMode
+
+DEFAULT_SKETCH_SIZE = 200
+DESCRIPTION_LIMIT = 80  # Characters of a statistics command's arguments kept in its history row
+
+class NumberFiles:
+    """Which files ``@path`` arguments may read numbers from.
+
+    Any file by default, as REPL and batch users name their own files. With a
+    data directory set, paths are taken relative to it and may not leave it.
+    Server sessions without a data directory turn file arguments off, since
+    any client could otherwise read any file the process can.
+    """
+    enabled: bool = True
+    directory = None
+
+    @classmethod
+    def configure(cls, enabled: bool = True, directory=None):
+        cls.enabled = enabled
+        cls.directory = directory
+
+    @classmethod
+    def resolve(cls, name: str) -> str:
+        """Return the path to open for ``@name``. Raises ValueError if it may not be read."""
+        if not cls.enabled:
+            raise ValueError("Reading numbers from files is disabled here. Set STATS_DATA_DIR to allow it.")
+        if cls.directory is None:
+            return name
+        root = os.path.realpath(cls.directory)
+        path = os.path.realpath(os.path.join(root, name))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"{name} is outside the data directory.")
+        return path
+
+def iter_file_numbers(name: str) -> Iterator:
+    """Yield the numbers in a file, one line at a time.
+
+    Errors name the file and line but never echo its contents, which may not
+    belong to whoever asked.
+    """
+    try:
+        handle = open(NumberFiles.resolve(name), encoding="utf-8")  # pylint: disable=consider-using-with
+    except OSError:
+        raise ValueError(f"Cannot read numbers from {name}.") from None
+    with handle:
+        for line_number, line in enumerate(handle, 1):
+            for token in line.replace(",", " ").split():
+                try:
+                    value = NumericMode.parse(token)
+                except ValueError:
+                    raise ValueError(f"Invalid number in {name}, line {line_number}.") from None
+                yield value
+
+def iter_numbers(args: Iterable[str]) -> Iterator:
+    """Yield the numbers given as arguments, in the active numeric mode.
+
+    An argument of the form ``@path`` is replaced by the numbers in that file
+    (see NumberFiles), separated by whitespace, commas or newlines. Files are
+    read one line at a time, so they can be longer than memory. Raises
+    ValueError for anything that is not a number.
+    """
+    for arg in args:
+        if arg.startswith("@"):
+            yield from iter_file_numbers(arg[1:])
+        else:
+            yield NumericMode.parse(arg)
+
+def describe_inputs(args: Iterable[str], count: int) -> str:
+    """Describe the arguments of a statistics command for its history row, in at most DESCRIPTION_LIMIT characters.
+
+    Short argument lists are kept as typed. Longer ones are cut at a space and
+    end with the count of numbers, so a row stays small however many numbers
+    were given.
+    """
+    text = " ".join(args)
+    if len(text) <= DESCRIPTION_LIMIT:
+        return text
+    suffix = f" ... ({count} numbers)"
+    return text[:DESCRIPTION_LIMIT - len(suffix)].rsplit(" ", 1)[0] + suffix
+
+def square_root(value):
+    return value.sqrt() if isinstance(value, Decimal) else math.sqrt(value)
+
+class RunningMoments:
+    """Count, mean and variance of a stream of numbers, in one pass and constant memory.
+
+    Uses Welford's update, which stays accurate where summing the values and
+    their squares would cancel. Two instances built over separate parts of a
+    stream can be merged.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean_value = 0
+        self.m2 = 0  # Sum of squared differences from the running mean
+
+    @classmethod
+    def of(cls, numbers: Iterable) -> "RunningMoments":
+        moments = cls()
+        for value in numbers:
+            moments.add(value)
+        return moments
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean_value
+        self.mean_value += delta / self.count
+        self.m2 += delta * (value - self.mean_value)
+
+    def merge(self, other: "RunningMoments"):
+        """Fold in the moments of another part of the stream."""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean_value - self.mean_value
+        self.mean_value += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def mean(self):
+        if self.count == 0:
+            raise ValueError("At least one number is required.")
+        return self.mean_value
+
+    @property
+    def variance(self):
+        """Sample variance (divided by count - 1), like statistics.variance."""
+        if self.count < 2:
+            raise ValueError("At least two numbers are required.")
+        return self.m2 / (self.count - 1)
+
+    @property
+    def stddev(self):
+        return square_root(self.variance)
+
+class QuantileSketch:
+    """Mergeable quantile sketch of a stream of numbers in bounded memory (KLL).
+
+    Numbers are kept in levels; an item on level h stands for 2**h numbers of
+    the stream. When the sketch is full, a level is sorted and every other item
+    is promoted to the next level, alternating which half is kept so the
+    result does not depend on chance. Memory grows only with the logarithm of
+    the stream length, and quantiles are exact until ``size`` numbers have
+    been added; beyond that, the rank of a result is off by roughly 1.7/size
+    of the count.
+    """
+
+    def __init__(self, size: int = DEFAULT_SKETCH_SIZE):
+        if size < 2:
+            raise ValueError("Sketch size must be at least 2")
+        self.size = size
+        self.levels = [[]]
+        self.offsets = [0]  # Which half of each level was kept last
+        self.count = 0
+        self.stored = 0
+        self.capacity_total = self.capacity(0)
+
+    @classmethod
+    def of(cls, numbers: Iterable, size: int = DEFAULT_SKETCH_SIZE) -> "QuantileSketch":
+        sketch = cls(size)
+        for value in numbers:
+            sketch.add(value)
+        return sketch
+
+    def capacity(self, level: int) -> int:
+        """Items a level may hold: lower levels get geometrically less room than the top one."""
+        return max(math.ceil(self.size * (2 / 3) ** (len(self.levels) - level - 1)), 2)
+
+    def add(self, value):
+        self.levels[0].append(value)
+        self.count += 1
+        self.stored += 1
+        if self.stored >= self.capacity_total:
+            self.compress()
+
+    def merge(self, other: "QuantileSketch"):
+        """Fold in a sketch of another part of the stream."""
+        while len(self.levels) < len(other.levels):
+            self.grow()
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self.stored = sum(map(len, self.levels))
+        while self.stored >= self.capacity_total:
+            self.compress()
+
+    def grow(self):
+        self.levels.append([])
+        self.offsets.append(0)
+        self.capacity_total = sum(self.capacity(level) for level in range(len(self.levels)))
+
+    def compress(self):
+        for level in range(len(self.levels)):
+            items = self.levels[level]
+            if len(items) < self.capacity(level):
+                continue
+            if level + 1 == len(self.levels):
+                self.grow()
+            items.sort()
+            leftover = [items.pop()] if len(items) % 2 else []
+            self.levels[level + 1].extend(items[self.offsets[level]::2])
+            self.offsets[level] ^= 1
+            self.levels[level] = leftover
+            self.stored = sum(map(len, self.levels))
+            if self.stored < self.capacity_total:
+                return
+
+    def quantile(self, fraction):
+        """Return the value at ``fraction`` (0 to 1) of the sorted stream, interpolating between neighbours."""
+        if self.count == 0:
+            raise ValueError("At least one number is required.")
+        if not 0 <= fraction <= 1:
+            raise ValueError("Percentile must be between 0 and 100.")
+        items = sorted((value, 1 << level) for level, values in enumerate(self.levels) for value in values)
+        ends = list(accumulate(weight for _, weight in items))  # Rank just past each item
+        rank = fraction * (self.count - 1)
+        whole = int(rank)
+        lower = items[bisect_right(ends, whole)][0]
+        if rank == whole:
+            return lower
+        upper = items[bisect_right(ends, whole + 1)][0]
+        return lower + (upper - lower) * (rank - whole)
@@ -0,0 +1,70 @@
+import numpy as np
+
+from calculator.operations import OPERATIONS, OPERATION_CODES
+
+ADD, SUBTRACT, MULTIPLY, DIVIDE = range(len(OPERATIONS))
+
+def to_codes(operations) -> np.ndarray:
+    """Convert operation names or codes into an array of operation codes."""
+    ops = np.asarray(operations)
+    if ops.dtype.kind in "iu":
+        if ops.size and (ops.min() < 0 or ops.max() >= len(OPERATIONS)):
+            raise ValueError("Unknown operation code")
+        return ops.astype(np.uint8)
+    names, inverse = np.unique(ops, return_inverse=True)
+    try:
+        lookup = np.array([OPERATION_CODES[str(name)] for name in names], dtype=np.uint8)
+    except KeyError as e:
+        raise ValueError(f"Unknown operation: {e.args[0]}") from e
+    return lookup[inverse].reshape(ops.shape)
+
+def evaluate(a, b, codes: np.ndarray) -> np.ma.MaskedArray:
+    """Evaluate every (a, b, operation) triple in one vectorized pass.
+
+    Divisions by zero, which raise ValueError in calculator.operations.divide,
+    are masked in the returned array instead.
+    """
+    a, b, codes = np.broadcast_arrays(np.asarray(a, dtype=np.float64),
+                                      np.asarray(b, dtype=np.float64),
+                                      codes)
+    results = np.empty(a.shape, dtype=np.float64)
+
+    mask = codes == ADD
+    np.add(a, b, out=results, where=mask)
+    mask = codes == SUBTRACT
+    np.subtract(a, b, out=results, where=mask)
+    mask = codes == MULTIPLY
+    np.multiply(a, b, out=results, where=mask)
+
+    division = codes == DIVIDE
+    zero_division = division & (b == 0)
+    np.divide(a, b, out=results, where=division & ~zero_division)
+    results[zero_division] = np.nan
+    return np.ma.masked_array(results, mask=zero_division)
+
+class CalculationBatch:
+    """A block of calculations stored as columns instead of Calculation objects."""
+    __slots__ = ("a", "b", "codes", "results")
+
+    def __init__(self, a: np.ndarray, b: np.ndarray, codes: np.ndarray, results: np.ma.MaskedArray):
+        self.a = a
+        self.b = b
+        self.codes = codes
+        self.results = results
+
+    @staticmethod
+    def create(a, b, operations):
+        codes = to_codes(operations)
+        a, b, codes = np.broadcast_arrays(np.asarray(a, dtype=np.float64),
+                                          np.asarray(b, dtype=np.float64),
+                                          codes)
+        return CalculationBatch(a, b, codes, evaluate(a, b, codes))
+
+    def perform(self) -> np.ma.MaskedArray:
+        return self.results
+
+    def __len__(self):
+        return self.results.size
+
+    def __repr__(self):
+        return f"CalculationBatch({len(self)} calculations)"
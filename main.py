@@ -1,4 +1,5 @@
 # import sys
+import argparse
 from calculator import Calculator
 from decimal import Decimal, InvalidOperation
 from app import App
@@ -26,9 +27,27 @@ def calculate_and_print(a, b, operation_name):
     except Exception as e:
         print(f"An error occurred: {e}")
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Advanced Python Calculator")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="run commands from FILE ('-' for stdin) instead of the interactive REPL")
+    parser.add_argument('--serve', action='store_true',
+                        help="serve the calculator to TCP clients (one command per line) instead of the REPL")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on with --serve")
+    parser.add_argument('--port', type=int, default=8765, help="port to listen on with --serve")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile the session; pstats and collapsed stacks are written to logs/")
+    args = parser.parse_args(argv)
+
     app = App()  # Initialize the App class
-    app.start()  # Start the app REPL loop
+    if args.profile:
+        app.settings['PROFILE'] = 'true'  # Same as setting PROFILE in the environment
+    if args.serve:
+        app.serve(args.host, args.port)  # Line-protocol server for concurrent clients
+    elif args.batch:
+        app.run_batch(args.batch)  # Stream commands without prompting
+    else:
+        app.start()  # Start the app REPL loop
     # if len(sys.argv) != 4:
     #     print("Usage: python calculator_main.py <number1> <number2> <operation>")
     #     sys.exit(1)
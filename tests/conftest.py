@@ -3,7 +3,10 @@ Conftest module for pytest configuration and test data generation.
 """
 
 from decimal import Decimal
+import pytest
 from faker import Faker
+from app import ShowHistoryManager, ClearHistoryManager
+from calculator.numeric import NumericMode
 from calculator.operations import add, subtract, multiply, divide
 
 fake = Faker()
@@ -34,6 +37,21 @@ def generate_test_data(num_records):
 
         yield a, b, operation_name, operation_func, expected
 
+@pytest.fixture(autouse=True)
+def isolated_history(tmp_path, monkeypatch):
+    """Keep history written by commands under test out of the working directory."""
+    history_path = str(tmp_path / "calculation_history.csv")
+    monkeypatch.setattr(ShowHistoryManager, "FILE_PATH", history_path)
+    monkeypatch.setattr(ShowHistoryManager, "BACKEND", "csv")
+    monkeypatch.setattr(ClearHistoryManager, "FILE_PATH", history_path)
+    return history_path
+
+@pytest.fixture(autouse=True)
+def restore_numeric_mode():
+    """Return to the default decimal mode after tests that switch it."""
+    yield
+    NumericMode.configure("decimal")
+
 def pytest_addoption(parser):
     """Add command line options for pytest."""
     parser.addoption("--num_records", action="store", default=5, type=int, help="Number of test records to generate")
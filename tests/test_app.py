@@ -2,6 +2,7 @@
 
 """Tests for the App class in the calculator app."""
 
+import io
 import pytest
 from app import App
 
@@ -24,6 +25,88 @@ def test_app_start_unknown_command(capfd, monkeypatch):
     with pytest.raises(SystemExit):
         app.start()
 
-    # # Verify that the unknown command was handled as expected
-    # captured = capfd.readouterr()
-    # assert "No such command: unknown_command" in captured.out  # Ensure the error message is printed
\ No newline at end of file
+    # Verify that the unknown command was handled as expected
+    captured = capfd.readouterr()
+    assert "No such command: unknown_command" in captured.out  # Ensure the error message is printed
+
+def test_app_run_batch(tmp_path, monkeypatch, capsys):
+    """Test that batch mode streams commands from a file and records history."""
+    from app import ShowHistoryManager  # pylint: disable=import-outside-toplevel
+    monkeypatch.setattr(ShowHistoryManager, 'FILE_PATH', str(tmp_path / 'history.csv'))
+    script = tmp_path / 'commands.txt'
+    script.write_text("# sample batch\nadd 1 2\n\nmultiply 3 4\ndivide 1 0\n", encoding='utf-8')
+
+    app = App()
+    assert app.run_batch(str(script)) == 3
+
+    captured = capsys.readouterr()
+    assert "The result of 1 + 2 is 3" in captured.out
+    assert "The result of 3 * 4 is 12" in captured.out
+    assert "cannot do division by zero." in captured.out
+    assert "Processed 3 lines" in captured.err
+    rows, _ = ShowHistoryManager.get_store().read_range(0)
+    assert [row[0] for row in rows] == ['add', 'multiply']
+
+def test_app_run_batch_stdin_exit(monkeypatch, capsys):
+    """Test that batch mode reads stdin and stops on 'exit'."""
+    monkeypatch.setattr('sys.stdin', io.StringIO("menu\nexit\nadd 1 1\n"))
+    app = App()
+    with pytest.raises(SystemExit):
+        app.run_batch('-')
+    captured = capsys.readouterr()
+    assert "Available commands:" in captured.out
+    assert "Processed 1 lines" in captured.err
+
+def test_app_run_batch_missing_file(tmp_path, capsys):
+    """Test that a batch file that cannot be read gives a one-line error and exit status 1."""
+    app = App()
+    with pytest.raises(SystemExit) as exit_info:
+        app.run_batch(str(tmp_path / 'missing.txt'))
+    assert exit_info.value.code == 1
+    assert capsys.readouterr().err.endswith(f"\nCannot read batch file {tmp_path / 'missing.txt'}: No such file or directory.\n")
+
+def test_app_dispatches_plugin_and_history_commands(capfd):
+    """Test that REPL lines are routed to plugins and the built-in history commands."""
+    app = App()
+    app.load_plugins()
+    for line in ['ADD 2 3', 'subtract 5 1', 'history', 'delete 0', 'delete x', 'clear history', 'clear']:
+        app.handle_command(line)
+    out = capfd.readouterr().out
+    assert "The result of 2 + 3 is 5" in out
+    assert "Calculation History:" in out
+    assert "Deleted row at index 0" in out
+    assert "Invalid format. Please use 'delete <index>'." in out
+    assert "History cleared." in out
+    assert "Invalid format. Please use 'clear history'." in out
+
+def test_app_history_pagination(capfd):
+    """Test the paginated forms of the history command."""
+    app = App()
+    app.load_plugins()
+    for i in range(6):
+        app.handle_command(f'add {i} 100')
+    capfd.readouterr()
+
+    app.handle_command('history 2 2')
+    out = capfd.readouterr().out
+    assert "102" in out and "103" in out and "101" not in out and "104" not in out
+    assert "Showing rows 2-3 of 6." in out
+
+    app.handle_command('history tail 1')
+    out = capfd.readouterr().out
+    assert "105" in out and "104" not in out
+
+    app.handle_command('history 10 5')
+    assert "No rows in that range (6 rows in history)." in capfd.readouterr().out
+
+    for line in ['history tail', 'history -1 2', 'history a b']:
+        app.handle_command(line)
+        assert "Invalid format." in capfd.readouterr().out
+
+def test_app_env_flag():
+    """Test that boolean settings accept 1, true, yes and on in any case, and nothing else."""
+    app = App()
+    for value, expected in [('1', True), ('TRUE', True), ('Yes', True), ('on', True), ('0', False), ('off', False)]:
+        app.settings['PROFILE'] = value
+        assert app.env_flag('PROFILE') is expected
+    assert app.env_flag('NOT_SET') is False
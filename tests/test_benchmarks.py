@@ -0,0 +1,27 @@
+"""Tests for the benchmark suite harness."""
+
+from benchmarks import suite
+
+def test_suite_runs_selected_benchmarks():
+    """A small run produces machine-readable results for every selected benchmark."""
+    results = suite.run_suite(sizes=[200], runs=1, only=["history", "calculator.add"])
+    assert set(results["benchmarks"]) == {
+        "calculator.add", "history.add[200]", "history.load[200]", "history.delete[200]"}
+    for result in results["benchmarks"].values():
+        assert result["median_s"] > 0 and result["ops_per_s"] > 0
+    assert results["meta"]["history_backend"] == "csv"
+
+def test_compare_flags_only_slowdowns_beyond_threshold():
+    """Benchmarks slower than the baseline by more than the threshold are reported."""
+    baseline = {"benchmarks": {"fast": {"median_s": 1.0}, "slow": {"median_s": 1.0}, "gone": {"median_s": 1.0}}}
+    results = {"benchmarks": {"fast": {"median_s": 1.1}, "slow": {"median_s": 1.5}, "new": {"median_s": 9.0}}}
+    assert suite.compare(results, baseline, threshold=0.2) == [("slow", 1.0, 1.5, 0.5)]
+
+def test_main_writes_json_and_fails_on_regression(tmp_path):
+    """--json saves the results and --baseline exits with 1 on a regression."""
+    output = tmp_path / "results.json"
+    assert suite.main(["--sizes", "", "--runs", "1", "--only", "calculator.add", "--with-logging", "--json", str(output)]) == 0
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text('{"benchmarks": {"calculator.add": {"median_s": 1e-9}}}', encoding="utf-8")
+    assert suite.main(["--sizes", "", "--runs", "1", "--only", "calculator.add", "--with-logging", "--baseline", str(baseline)]) == 1
+    assert '"calculator.add"' in output.read_text(encoding="utf-8")
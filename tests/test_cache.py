@@ -0,0 +1,88 @@
+"""Tests for the calculation result cache."""
+
+from decimal import Decimal, localcontext
+import pytest
+
+from app import App
+from app.plugins.cache import CacheCommand
+from calculator import Calculator
+from calculator.cache import ResultCache
+from calculator.calculation import Calculation
+from calculator.operations import add, divide
+
+@pytest.fixture
+def enabled_cache():
+    """Enable a small shared cache for the duration of a test."""
+    Calculation.cache = ResultCache(maxsize=2)
+    yield Calculation.cache
+    Calculation.cache = None
+
+def test_cache_hits_and_misses(enabled_cache):
+    """Repeated calculations are served from the cache."""
+    assert Calculator.add(Decimal('2'), Decimal('3')) == Decimal('5')
+    assert Calculator.add(Decimal('2'), Decimal('3')) == Decimal('5')
+    stats = enabled_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+def test_cache_distinguishes_operand_types(enabled_cache):
+    """2 and 2.0 are cached separately so results keep their type and formatting."""
+    assert str(Calculation(2, 3, add).perform()) == "5"
+    assert str(Calculation(2.0, 3.0, add).perform()) == "5.0"
+    assert enabled_cache.hits == 0
+
+def test_cache_respects_decimal_context(enabled_cache):
+    """The decimal precision is part of the key."""
+    full = Calculation(Decimal('1'), Decimal('3'), divide).perform()
+    with localcontext() as context:
+        context.prec = 3
+        short = Calculation(Decimal('1'), Decimal('3'), divide).perform()
+    assert short == Decimal('0.333')
+    assert full != short
+
+def test_cache_evicts_least_recently_used(enabled_cache):
+    """The least recently used entry is evicted once the cache is full."""
+    enabled_cache.perform(add, 1, 1)
+    enabled_cache.perform(add, 2, 2)
+    enabled_cache.perform(add, 1, 1)  # 1 + 1 is now the most recently used
+    enabled_cache.perform(add, 3, 3)
+    keys = [key[2] for key in enabled_cache.entries]
+    assert keys == ["1", "3"]
+
+def test_cache_replays_errors(enabled_cache):
+    """Division by zero is cached and raised again on every hit."""
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            Calculation(Decimal('1'), Decimal('0'), divide).perform()
+    assert enabled_cache.hits == 1
+
+def test_cache_rejects_invalid_size():
+    """A cache must hold at least one entry."""
+    with pytest.raises(ValueError):
+        ResultCache(0)
+
+def test_cache_command(enabled_cache, capfd):
+    """The cache command prints statistics and clears the cache."""
+    enabled_cache.perform(add, 1, 1)
+    CacheCommand().execute()
+    assert "1/2 entries, 0 hits, 1 misses" in capfd.readouterr().out
+    CacheCommand().execute("clear")
+    assert enabled_cache.stats()["size"] == 0
+    Calculation.cache = None
+    CacheCommand().execute()
+    assert "disabled" in capfd.readouterr().out
+
+def test_app_enables_cache_from_environment(monkeypatch, capfd):
+    """CALCULATION_CACHE_SIZE enables the cache and the REPL uses it."""
+    monkeypatch.setenv("CALCULATION_CACHE_SIZE", "16")
+    try:
+        app = App()
+        app.load_plugins()
+        app.handle_command("add 1 2")
+        app.handle_command("add 1 2")
+        app.handle_command("cache")
+        out = capfd.readouterr().out
+        assert "The result of 1 + 2 is 3" in out
+        assert "1 hits, 1 misses" in out
+    finally:
+        Calculation.cache = None
@@ -3,9 +3,10 @@
 from decimal import Decimal
 import pytest
 
+from calculator import Calculator
 from calculator.calculation import Calculation
 from calculator.calculation_history import Calculations
-from calculator.operations import add, subtract
+from calculator.operations import add, subtract, divide
 
 @pytest.fixture
 def setup_calculations():
@@ -45,4 +46,116 @@ def test_find_by_operation(setup_calculations):
 def test_get_latest_with_empty_history():
     """Test getting the latest calculation when the history is empty."""
     Calculations.clear_history()
-    assert Calculations.get_latest() is None, "Expected None for latest calculation with empty history"
\ No newline at end of file
+    assert Calculations.get_latest() is None, "Expected None for latest calculation with empty history"
+
+@pytest.fixture
+def restore_configuration():
+    """Put the default list-backed, uncapped history back after the test."""
+    yield
+    Calculations.configure()
+
+def test_calculation_has_no_instance_dict():
+    """Calculation uses __slots__ instead of a per-instance __dict__."""
+    assert not hasattr(Calculation(Decimal('1'), Decimal('2'), add), '__dict__')
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_drop_oldest_eviction(columnar, restore_configuration):
+    """With a cap and drop_oldest, only the newest entries are kept."""
+    Calculations.configure(max_size=3, columnar=columnar)
+    for i in range(5):
+        Calculations.add_calculation(Calculation(Decimal(i), Decimal('1'), add))
+    history = Calculations.get_history()
+    assert len(history) == 3
+    assert [calc.a for calc in history] == [Decimal('2'), Decimal('3'), Decimal('4')]
+    assert Calculations.get_latest().a == Decimal('4')
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_ignore_new_eviction(columnar, restore_configuration):
+    """With a cap and ignore_new, calculations beyond the cap are not recorded."""
+    Calculations.configure(max_size=2, eviction="ignore_new", columnar=columnar)
+    for i in range(4):
+        Calculations.add_calculation(Calculation(Decimal(i), Decimal('1'), subtract))
+    assert [calc.a for calc in Calculations.get_history()] == [Decimal('0'), Decimal('1')]
+
+def test_columnar_history_round_trip(restore_configuration):
+    """The columnar store rebuilds equivalent calculations."""
+    Calculations.configure(columnar=True)
+    Calculations.add_calculation(Calculation(Decimal('10'), Decimal('5'), add))
+    Calculations.add_calculation(Calculation(Decimal('20'), Decimal('3'), subtract))
+    latest = Calculations.get_latest()
+    assert latest.perform() == Decimal('17')
+    assert len(Calculations.find_by_operation("add")) == 1
+
+def test_configure_rejects_unknown_policy():
+    """Unknown eviction policies and non-positive caps are rejected."""
+    with pytest.raises(ValueError):
+        Calculations.configure(eviction="random")
+    with pytest.raises(ValueError):
+        Calculations.configure(max_size=0)
+
+def test_memory_usage_reports_bytes_per_entry(restore_configuration):
+    """The columnar store uses fewer bytes per entry than Calculation objects."""
+    Calculations.configure()
+    for i in range(1000):
+        Calculations.add_calculation(Calculation(Decimal(i), Decimal('1.5'), add))
+    list_usage = Calculations.memory_usage()
+    Calculations.configure(columnar=True)
+    for i in range(1000):
+        Calculations.add_calculation(Calculation(Decimal(i), Decimal('1.5'), add))
+    columnar_usage = Calculations.memory_usage()
+    assert list_usage["entries"] == columnar_usage["entries"] == 1000
+    assert columnar_usage["bytes_per_entry"] < list_usage["bytes_per_entry"]
+
+def test_find_in_range(setup_calculations):
+    """Range lookups work on operands and results."""
+    Calculations.add_calculation(Calculation(Decimal('1'), Decimal('0'), divide))
+    assert [calc.a for calc in Calculations.find_in_range("result", Decimal('15'), Decimal('17'))] == [Decimal('10'), Decimal('20')]
+    assert [calc.a for calc in Calculations.find_in_range("a", high=Decimal('10'))] == [Decimal('10'), Decimal('1')]
+    assert [calc.b for calc in Calculations.find_in_range("b", low=Decimal('4'))] == [Decimal('5')]
+    with pytest.raises(ValueError):
+        Calculations.find_in_range("operation")
+
+def test_query_combines_filters(setup_calculations):
+    """query filters by operation and range and keeps the latest matches."""
+    for i in range(5):
+        Calculations.add_calculation(Calculation(Decimal(i), Decimal('1'), add))
+    latest_adds = Calculations.query(operation="add", latest=2)
+    assert [calc.a for calc in latest_adds] == [Decimal('3'), Decimal('4')]
+    small_adds = Calculations.query(operation="add", field="result", high=Decimal('3'))
+    assert [calc.a for calc in small_adds] == [Decimal('0'), Decimal('1'), Decimal('2')]
+    assert len(Calculations.query()) == 7
+    assert [calc.a for calc in Calculations.get_latest_n(1)] == [Decimal('4')]
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_indexes_skip_evicted_entries(columnar, restore_configuration):
+    """Indexed lookups never return calculations evicted from a capped history."""
+    Calculations.configure(max_size=10, columnar=columnar)
+    for i in range(2000):
+        Calculations.add_calculation(Calculation(Decimal(i), Decimal('1'), add if i % 2 else subtract))
+    adds = Calculations.find_by_operation("add")
+    assert [calc.a for calc in adds] == [Decimal(i) for i in range(1991, 2000, 2)]
+    assert Calculations.find_in_range("a", high=Decimal('1989')) == []
+    assert Calculations.index.size < 2000
+
+def test_indexing_reuses_computed_results(restore_configuration):
+    """Calculator results are indexed as computed, and a rebuild carries them over without recomputing."""
+    calls = []
+
+    def counted_add(x, y):
+        calls.append((x, y))
+        return x + y
+    Calculations.configure(max_size=10)
+    for i in range(1100):
+        Calculator._perform_operation(Decimal(i), Decimal('1'), counted_add)  # pylint: disable=protected-access
+    assert len(calls) == 1100
+    assert [calc.a for calc in Calculations.find_in_range("result", low=Decimal('1098'))] == [Decimal('1097'), Decimal('1098'), Decimal('1099')]
+
+def test_nan_operands_are_left_out_of_range_indexes(setup_calculations):
+    """NaN cannot be ordered, so it is kept in the history but never breaks or matches a range lookup."""
+    Calculator.add(Decimal('NaN'), Decimal('1'))
+    Calculations.add_calculation(Calculation(Decimal('sNaN'), Decimal('1'), add), result=None)
+    for i in range(70):
+        Calculator.add(Decimal(i), Decimal('1'))
+    assert len(Calculations.get_history()) == 74
+    assert [calc.a for calc in Calculations.find_in_range("a", high=Decimal('1'))] == [Decimal('0'), Decimal('1')]
+    assert len(Calculations.find_by_operation("add")) == 73
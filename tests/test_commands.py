@@ -14,7 +14,11 @@ from app.commands import CommandHandler
     (AddCommand, ('2', '3'), "The result of 2 + 3 is 5\n"),
     (SubtractCommand, ('5', '3'), "The result of 5 - 3 is 2\n"),
     (MultiplyCommand, ('2', '3'), "The result of 2 * 3 is 6\n"),
-    (DivideCommand, ('6', '3'), "The result of 6 / 3 is 2.0\n"),
+    (DivideCommand, ('6', '3'), "The result of 6 / 3 is 2\n"),
+    (AddCommand, ('0.5', '0.25'), "The result of 0.5 + 0.25 is 0.75\n"),
+    (SubtractCommand, ('2.5', '1'), "The result of 2.5 - 1 is 1.5\n"),
+    (MultiplyCommand, ('1.5', '2'), "The result of 1.5 * 2 is 3.0\n"),
+    (DivideCommand, ('7.5', '2.5'), "The result of 7.5 / 2.5 is 3\n"),
 ])
 def test_command_execute(command_class, args, expected_output, capfd):
     """Test the execute method of various commands."""
@@ -98,4 +102,26 @@ def test_exit_command():
     """Test the exit command to ensure it raises SystemExit."""
     command = ExitCommand()
     with pytest.raises(SystemExit):
-        command.execute()
\ No newline at end of file
+        command.execute()
+
+def test_command_handler_dispatch(capfd):
+    """Test that the handler dispatches case-insensitively and reports errors."""
+    handler = CommandHandler()
+    handler.register_command('add', AddCommand())
+    handler.execute_command('Add 1 2')
+    handler.execute_command('add 1')
+    handler.execute_command('power 2 3')
+    handler.execute_command('   ')
+    out, _ = capfd.readouterr()
+    assert "The result of 1 + 2 is 3" in out
+    assert "An error occurred: Error: 'add' command requires exactly 2 arguments." in out
+    assert "No such command: power" in out
+    assert "No command entered." in out
+
+def test_command_handler_build_dispatch_table():
+    """Test that the dispatch table can be rebuilt from the registered commands."""
+    handler = CommandHandler()
+    handler.commands['menu'] = MenuCommand(handler)
+    assert 'menu' not in handler.dispatch
+    handler.build_dispatch_table()
+    assert handler.dispatch['menu'] == handler.commands['menu'].execute
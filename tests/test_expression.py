@@ -0,0 +1,50 @@
+"""Tests for the expression evaluator and the eval command."""
+
+from decimal import Decimal
+import pytest
+from app import App, ShowHistoryManager
+from calculator.expression import compile_cached, compile_expression, evaluate_expression
+
+@pytest.mark.parametrize("text, value", [
+    ("1 + 2 * 3", "7"),
+    ("(1 + 2) * 3", "9"),
+    ("10 - 4 - 3", "3"),
+    ("8 / 4 / 2", "1"),
+    ("-3 + +5", "2"),
+    ("-(2 - 5) * 2", "6"),
+    ("0.1 + 0.2", "0.3"),
+    ("1 / 4", "0.25"),
+])
+def test_evaluate_expression(text, value):
+    """Precedence, associativity, unary signs and parentheses follow arithmetic rules exactly."""
+    assert evaluate_expression(text) == Decimal(value)
+
+@pytest.mark.parametrize("text", ["1 +", "2 ** 3", "abs(1)", "x + 1", "1 // 2", "'a'", "1j", "(1, 2)"])
+def test_invalid_expressions_are_rejected(text):
+    """Anything beyond numbers, + - * / and parentheses raises ValueError."""
+    with pytest.raises(ValueError):
+        evaluate_expression(text)
+
+def test_division_by_zero_raises():
+    """Division by zero inside an expression raises the operation's error."""
+    with pytest.raises(ValueError, match="Cannot divide by zero"):
+        evaluate_expression("1 / (2 - 2)")
+
+def test_compiled_expressions_are_cached():
+    """The same text compiles once and is reused."""
+    compile_cached.cache_clear()
+    first = compile_expression("6 * 7")
+    assert compile_expression("6 * 7") is first
+    assert compile_cached.cache_info().hits == 1
+
+def test_eval_command_records_one_history_entry(capfd):
+    """'eval' prints the result and appends a single history row for the whole expression."""
+    app = App()
+    app.load_plugins()
+    app.handle_command("eval (1 + 2) * 3 - 4 / 2")
+    assert "The result of (1 + 2) * 3 - 4 / 2 is 7" in capfd.readouterr().out
+    rows, total = ShowHistoryManager.get_store().read_range(0)
+    assert total == 1
+    assert rows[0] == ["eval", "(1 + 2) * 3 - 4 / 2", "", "7"]
+    app.handle_command("eval 1 +")
+    assert "An error occurred: Invalid expression: 1 +" in capfd.readouterr().out
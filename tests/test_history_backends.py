@@ -0,0 +1,172 @@
+"""Tests for the pluggable history backends and the migration tool."""
+
+import os
+import pytest
+
+from app import App, ShowHistoryManager
+from app.history.backends import BACKENDS, RowIndex, create_backend, migrate_history
+from app.history.migrate import main as migrate_main
+from app.history.store import HistoryStore
+
+BACKEND_NAMES = sorted(BACKENDS)
+
+def history_path(tmp_path, backend):
+    """Path for a history of the given backend inside tmp_path."""
+    return str(tmp_path / f"history{BACKENDS[backend].extension}")
+
+@pytest.mark.parametrize("backend", BACKEND_NAMES)
+def test_backend_round_trip(tmp_path, backend):
+    """Rows, deletions and exact decimal text survive a reload."""
+    path = history_path(tmp_path, backend)
+    store = HistoryStore(path, backend=backend)
+    store.append("add", "0.1", "0.2", "0.3")
+    store.append("divide", "1", "3", "0.3333333333333333333333333333")
+    store.append("multiply", "2", "3", "6")
+    store.delete(0)
+
+    reloaded = HistoryStore(path, backend=backend)
+    reloaded.load()
+    assert reloaded.rows == [["divide", "1", "3", "0.3333333333333333333333333333"], ["multiply", "2", "3", "6"]]
+
+@pytest.mark.parametrize("backend", BACKEND_NAMES)
+def test_backend_compaction_and_clear(tmp_path, backend):
+    """Compaction keeps only live rows and clear removes the stored history."""
+    path = history_path(tmp_path, backend)
+    store = HistoryStore(path, compact_threshold=1, backend=backend)
+    for i in range(3):
+        store.append("add", i, 1, i + 1)
+    store.delete(1)
+    store.compact()
+    store.append("subtract", 5, 1, 4)
+
+    reloaded = HistoryStore(path, backend=backend)
+    reloaded.load()
+    assert [row[1] for row in reloaded.rows] == ["0", "2", "5"]
+    assert reloaded.pending_deletes == 0
+
+    reloaded.clear()
+    assert not reloaded.backend.exists()
+
+@pytest.mark.parametrize("backend", BACKEND_NAMES)
+def test_backend_batched_writes_keep_order(tmp_path, backend):
+    """Deletions buffered between appends are replayed in order."""
+    path = history_path(tmp_path, backend)
+    store = HistoryStore(path, backend=backend)
+    store.begin_batch(buffer_size=100)
+    store.append("add", 1, 1, 2)
+    store.append("add", 2, 2, 4)
+    store.delete(0)
+    store.append("add", 3, 3, 6)
+    store.end_batch()
+
+    reloaded = HistoryStore(path, backend=backend)
+    reloaded.load()
+    assert [row[1] for row in reloaded.rows] == ["2", "3"]
+
+def test_unknown_backend():
+    """Unknown backend names are rejected."""
+    with pytest.raises(ValueError, match="Unknown history backend"):
+        create_backend("parquet", "history")
+
+def test_migrate_history(tmp_path):
+    """History can be copied from the CSV log into another backend."""
+    source = HistoryStore(str(tmp_path / "history.csv"))
+    source.append("add", "1.10", "2.20", "3.30")
+    source.append("subtract", 5, 1, 4)
+    source.delete(1)
+
+    assert migrate_history(source.backend, create_backend("sqlite", str(tmp_path / "history.db"))) == 1
+    assert migrate_main(["--source", str(tmp_path / "history.csv"), "--to", "columnar"]) == 0
+
+    for backend in ("sqlite", "columnar"):
+        migrated = HistoryStore(history_path(tmp_path, backend), backend=backend)
+        migrated.load()
+        assert migrated.rows == [["add", "1.10", "2.20", "3.30"]]
+
+def test_app_selects_backend_from_environment(monkeypatch, isolated_history):
+    """HISTORY_BACKEND switches the backend and keeps the history file name."""
+    monkeypatch.setenv("HISTORY_BACKEND", "sqlite")
+    App()
+    assert ShowHistoryManager.BACKEND == "sqlite"
+    assert ShowHistoryManager.FILE_PATH == isolated_history[:-len(".csv")] + ".db"
+    ShowHistoryManager.add_calculation("add", 1, 2, 3)
+    assert ShowHistoryManager.get_store().backend.name == "sqlite"
+
+@pytest.mark.parametrize("backend", BACKEND_NAMES)
+@pytest.mark.parametrize("with_delete", [False, True])
+def test_backend_read_range(tmp_path, backend, with_delete):
+    """Pages and tails read from the backend match slices of the full history."""
+    path = history_path(tmp_path, backend)
+    store = HistoryStore(path, backend=backend)
+    for i in range(20):
+        store.append("add", i, 1, i + 1)
+    if with_delete:
+        store.delete(3)
+    expected = [row[1] for row in store.read_range(0)[0]]
+
+    fresh = HistoryStore(path, backend=backend)
+    rows, total = fresh.read_range(5, 10)
+    assert not fresh.loaded
+    assert total == len(expected)
+    assert [row[1] for row in rows] == expected[5:10]
+    rows, total = fresh.read_range(-3)
+    assert [row[1] for row in rows] == expected[-3:]
+    assert fresh.read_range(100, 110) == ([], total)
+
+def test_columnar_streams_long_values(tmp_path):
+    """Values longer than one read chunk are reassembled."""
+    backend = create_backend("columnar", str(tmp_path / "history.col"))
+    backend.write([["add", "1" * 5000, "2", "3"], ["add", "4", "5", "9"]])
+    assert list(backend.iter_values("operand1", chunk_size=64)) == ["1" * 5000, "4"]
+
+def test_columnar_rejects_oversized_values_before_writing(tmp_path):
+    """A value beyond the 16-bit length prefix fails the whole write, and nothing is left on disk."""
+    path = str(tmp_path / "history.col")
+    backend = create_backend("columnar", path)
+    with pytest.raises(ValueError, match="too long for the columnar backend"):
+        backend.write([["add", "1", "2", "3"], ["mean", "1 " * 40000, "", "1"]])
+    assert not os.path.exists(path)
+    backend.write([["add", "1", "2", "3"]])
+    assert sorted(os.listdir(path)) == sorted(backend.COLUMN_FILES)
+    store = HistoryStore(path, backend="columnar")
+    with pytest.raises(ValueError):
+        store.append("mean", "1 " * 40000, "", "1")
+    assert store.read_range(0) == ([["add", "1", "2", "3"]], 1)
+
+def test_columnar_reads_an_empty_store_directory(tmp_path):
+    """A store directory without its column files reads as an empty history and can be written again."""
+    path = tmp_path / "history.col"
+    path.mkdir()
+    store = HistoryStore(str(path), backend="columnar")
+    assert store.read_range(0) == ([], 0)
+    assert not store.summarize().operations
+    store.append("add", 1, 2, 3)
+    store.append("add", 4, 5, 9)
+    assert store.delete(0) == ["add", "1", "2", "3"]
+    assert HistoryStore(str(path), backend="columnar").read_range(0) == ([["add", "4", "5", "9"]], 1)
+
+def test_csv_index_follows_appends_and_rewrites(tmp_path, monkeypatch):
+    """Rows are found through the persisted offset index, which is extended on read and rebuilt after a rewrite."""
+    monkeypatch.setattr(RowIndex, "CHUNK_SIZE", 32)  # Index a few lines at a time
+    path = str(tmp_path / "history.csv")
+    backend = create_backend("csv", path)
+    backend.write([["add", str(i), "1", str(i + 1)] for i in range(20)])
+    assert backend.read_ids(7, 9) == [["add", "7", "1", "8"], ["add", "8", "1", "9"]]
+    with open(backend.index_path, "rb") as handle:
+        assert RowIndex.HEADER.unpack(handle.read(RowIndex.HEADER.size))[2] == 20
+    backend.write([["multiply", "x" * 100, "2", "3"]])  # Longer than a chunk
+    assert create_backend("csv", path).read_range(-2) == ([["add", "19", "1", "20"], ["multiply", "x" * 100, "2", "3"]], 21)
+    backend.rewrite([["subtract", "5", "2", "3"]])
+    assert not os.path.exists(backend.index_path)
+    assert backend.read_range(0) == ([["subtract", "5", "2", "3"]], 1)
+
+def test_csv_index_of_another_file_is_rebuilt(tmp_path):
+    """An index left behind by a log that was replaced outside the app is not trusted."""
+    path = str(tmp_path / "history.csv")
+    backend = create_backend("csv", path)
+    backend.write([["add", str(i), "1", str(i + 1)] for i in range(10)])
+    assert backend.state() == (10, [])
+    other = create_backend("csv", str(tmp_path / "other.csv"))
+    other.write([["divide", "8", "2", "4"]])
+    os.replace(other.path, path)
+    assert backend.read_range(0) == ([["divide", "8", "2", "4"]], 1)
@@ -0,0 +1,92 @@
+"""Stress tests for several processes writing to one history."""
+
+import multiprocessing
+import os
+import pytest
+
+from app.history.locking import FileLock
+from app.history.store import HistoryStore
+
+PROCESSES = int(os.environ.get("HISTORY_STRESS_PROCESSES", "4"))
+ROWS_PER_PROCESS = 150
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+
+def write_history(path, backend, writer, delete_every, deleted):
+    """Append ROWS_PER_PROCESS rows, deleting the oldest row every ``delete_every`` appends."""
+    store = HistoryStore(path, compact_threshold=5, backend=backend)
+    for i in range(ROWS_PER_PROCESS):
+        store.append("add", writer, i, f"{writer}-{i}")
+        if delete_every and i % delete_every == delete_every - 1:
+            row = store.delete(0)
+            if row is not None:
+                deleted.put(row[3])
+    store.wait_for_compaction()
+
+def run_writers(path, backend, delete_every=0):
+    """Run PROCESSES writers at once; returns the results of the rows they deleted."""
+    context = multiprocessing.get_context("fork")
+    deleted = context.Queue()
+    writers = [context.Process(target=write_history, args=(path, backend, writer, delete_every, deleted))
+               for writer in range(PROCESSES)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join(60)
+    assert [writer.exitcode for writer in writers] == [0] * PROCESSES
+    results = []
+    while not deleted.empty():
+        results.append(deleted.get())
+    return results
+
+def check_rows(rows, deleted):
+    """No row is lost or duplicated, and each writer's rows keep their order."""
+    results = [row[3] for row in rows]
+    written = {f"{writer}-{i}" for writer in range(PROCESSES) for i in range(ROWS_PER_PROCESS)}
+    assert len(results) == len(set(results))
+    assert set(results) == written - set(deleted)
+    for writer in range(PROCESSES):
+        sequence = [int(row[2]) for row in rows if row[1] == str(writer)]
+        assert sequence == sorted(sequence)
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite", "columnar"])
+def test_concurrent_appends_lose_nothing(tmp_path, backend):
+    """Rows appended by several processes at once all end up in the history."""
+    path = str(tmp_path / f"history.{backend}")
+    run_writers(path, backend)
+    store = HistoryStore(path, backend=backend)
+    assert len(store) == PROCESSES * ROWS_PER_PROCESS
+    check_rows(store.read_range(0)[0], [])
+
+@pytest.mark.parametrize("backend", ["csv", "sqlite", "columnar"])
+def test_concurrent_deletes_and_compaction_lose_nothing(tmp_path, backend):
+    """Deletes and background compactions in one process keep rows appended by the others."""
+    path = str(tmp_path / f"history.{backend}")
+    deleted = run_writers(path, backend, delete_every=10)
+    assert len(deleted) == PROCESSES * ROWS_PER_PROCESS // 10
+    store = HistoryStore(path, backend=backend)
+    store.load()
+    assert len(store) == PROCESSES * ROWS_PER_PROCESS - len(deleted)
+    check_rows(store.rows, deleted)
+
+def test_store_notices_changes_made_by_other_processes(tmp_path):
+    """A store's cached count and rows are refreshed after another store writes."""
+    path = str(tmp_path / "history.csv")
+    first, second = HistoryStore(path), HistoryStore(path)
+    first.append("add", 1, 1, 2)
+    first.load()
+    second.append("add", 2, 2, 4)
+    assert len(first) == 2
+    assert first.delete(1) == ["add", "2", "2", "4"]
+    assert [row[3] for row in second.read_range(0)[0]] == ["2"]
+
+def test_file_lock_is_reentrant_but_not_upgradable(tmp_path):
+    """Nested acquisitions are free; upgrading a shared lock is refused."""
+    lock = FileLock(str(tmp_path / "history.lock"))
+    with lock.exclusive(), lock.shared(), lock.exclusive():
+        assert lock.depth == 3
+    with lock.shared():
+        with pytest.raises(RuntimeError):
+            with lock.exclusive():
+                pass
+    assert lock.depth == 0
@@ -0,0 +1,114 @@
+"""Tests for the append-only history store."""
+
+import os
+import threading
+
+from app.history.store import HistoryStore, COLUMNS
+from app import ShowHistoryManager
+
+def test_append_writes_one_line_per_calculation(tmp_path):
+    """Each append adds exactly one record after the header."""
+    path = tmp_path / "history.csv"
+    store = HistoryStore(str(path))
+    store.append("add", 1, 2, 3)
+    size_after_first = path.stat().st_size
+    store.append("multiply", 2, 3, 6)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines == [",".join(COLUMNS), "add,1,2,3", "multiply,2,3,6"]
+    assert path.stat().st_size > size_after_first
+    assert store.read_range(-1) == ([["multiply", "2", "3", "6"]], 2)
+
+def test_delete_survives_reload(tmp_path):
+    """Deletions are logged and replayed when the store is loaded again."""
+    path = str(tmp_path / "history.csv")
+    store = HistoryStore(path)
+    for i in range(4):
+        store.append("add", i, i, i + i)
+    assert store.delete(1) == ["add", "1", "1", "2"]
+    assert store.delete(10) is None
+
+    reloaded = HistoryStore(path)
+    reloaded.load()
+    assert [row[1] for row in reloaded.rows] == ["0", "2", "3"]
+
+def test_compaction_rewrites_live_rows(tmp_path):
+    """Reaching the compaction threshold rewrites the log without the deleted rows."""
+    path = tmp_path / "history.csv"
+    store = HistoryStore(str(path), compact_threshold=2)
+    for i in range(3):
+        store.append("add", i, 0, i)
+    store.delete(0)
+    store.delete(0)
+    store.wait_for_compaction()
+    assert store.pending_deletes == 0
+    assert path.read_text(encoding="utf-8").splitlines() == [",".join(COLUMNS), "add,2,0,2"]
+    assert not os.path.exists(f"{path}.tombstones")
+
+def test_delete_records_tombstone_without_rewriting(tmp_path):
+    """A delete appends the row id to the tombstone file and leaves the log untouched."""
+    path = tmp_path / "history.csv"
+    store = HistoryStore(str(path))
+    for i in range(5):
+        store.append("add", i, 0, i)
+    log = path.read_text(encoding="utf-8")
+    assert store.delete(1) == ["add", "1", "0", "1"]
+    assert store.delete(1) == ["add", "2", "0", "2"]
+    assert not store.loaded
+    assert path.read_text(encoding="utf-8") == log
+    assert (tmp_path / "history.csv.tombstones").read_text(encoding="utf-8") == "1\n2\n"
+    assert [row[1] for row in HistoryStore(str(path)).read_range(0)[0]] == ["0", "3", "4"]
+
+def test_writes_during_background_compaction_are_kept(tmp_path, monkeypatch):
+    """Rows appended and deleted while a compaction runs survive the swap."""
+    path = str(tmp_path / "history.csv")
+    store = HistoryStore(path, compact_threshold=2)
+    for i in range(6):
+        store.append("add", i, 0, i)
+    release = threading.Event()
+    prepare_rewrite = store.backend.prepare_rewrite
+
+    def slow_prepare_rewrite(rows):
+        release.wait(5)
+        return prepare_rewrite(rows)
+
+    monkeypatch.setattr(store.backend, "prepare_rewrite", slow_prepare_rewrite)
+    store.delete(0)
+    store.delete(0)
+    assert store.compactor is not None
+    store.append("add", 6, 0, 6)
+    store.delete(1)  # Row "3"
+    release.set()
+    store.wait_for_compaction()
+
+    assert store.pending_deletes == 1
+    reloaded = HistoryStore(path)
+    reloaded.load()
+    assert [row[1] for row in reloaded.rows] == ["2", "4", "5", "6"]
+
+def test_legacy_delete_markers_are_upgraded(tmp_path):
+    """Logs with inline delete markers from older versions are replayed and rewritten."""
+    path = tmp_path / "history.csv"
+    path.write_text(",".join(COLUMNS) + "\nadd,1,1,2\nadd,2,2,4\n!delete,0,,\nadd,3,3,6\n", encoding="utf-8")
+    store = HistoryStore(str(path))
+    assert [row[1] for row in store.read_range(0)[0]] == ["2", "3"]
+    assert "!delete" not in path.read_text(encoding="utf-8")
+
+def test_clear_removes_file_and_rows(tmp_path):
+    """Clearing empties the store and removes the log."""
+    path = tmp_path / "history.csv"
+    store = HistoryStore(str(path))
+    store.append("add", 1, 1, 2)
+    store.clear()
+    assert not path.exists()
+    assert len(store) == 0
+
+def test_show_history_manager_uses_store(tmp_path, monkeypatch, capfd):
+    """ShowHistoryManager adds, shows and deletes through the store."""
+    monkeypatch.setattr(ShowHistoryManager, "FILE_PATH", str(tmp_path / "history.csv"))
+    ShowHistoryManager.add_calculation("add", 1.0, 2.0, 3.0)
+    ShowHistoryManager.show_history()
+    assert "add" in capfd.readouterr().out
+    ShowHistoryManager.delete_calculation(0)
+    assert "Deleted row at index 0" in capfd.readouterr().out
+    ShowHistoryManager.delete_calculation(0)
+    assert "Invalid index: 0" in capfd.readouterr().out
@@ -0,0 +1,139 @@
+"""Tests for the per-operation history aggregates and the summary command."""
+
+import random
+from decimal import Decimal
+import pytest
+
+from app import App, ShowHistoryManager
+from app.history.backends import CsvBackend
+from app.history.store import HistoryStore
+from app.history.summary import HistorySummary
+
+BACKENDS = ["csv", "sqlite", "columnar"]
+
+def totals(summary):
+    return {name: (stats.count, stats.total, stats.minimum, stats.maximum)
+            for name, stats in summary.operations.items()}
+
+@pytest.fixture
+def scans(monkeypatch):
+    """Count full history scans."""
+    calls = []
+    original = CsvBackend.iter_live_rows
+
+    def counting(backend):
+        calls.append(backend.path)
+        return original(backend)
+    monkeypatch.setattr(CsvBackend, "iter_live_rows", counting)
+    return calls
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_writes_update_the_aggregates(tmp_path, backend):
+    """Appends, deletes and clear keep the summary equal to one built from the live rows."""
+    store = HistoryStore(str(tmp_path / "history"), backend=backend)
+    for i in range(1, 5):
+        store.append("add", i, i, i + i)
+    store.append("divide", 1, 3, "0.3333333333333333333333333333")
+    store.append("divide", 1, 0, "Error")
+    store.delete(1)
+    summary = store.summarize()
+    assert totals(summary) == {"add": (3, Decimal(16), Decimal(2), Decimal(8)),
+                               "divide": (1, Decimal("0.3333333333333333333333333333"),
+                                          Decimal("0.3333333333333333333333333333"),
+                                          Decimal("0.3333333333333333333333333333"))}
+    assert totals(summary) == totals(HistorySummary.build(store.backend.iter_live_rows()))
+    store.clear()
+    assert not store.summarize().operations
+
+def test_summary_is_reused_across_restarts(tmp_path, scans):
+    """A new store picks up the persisted aggregates instead of scanning the history."""
+    path = str(tmp_path / "history.csv")
+    store = HistoryStore(path)
+    for i in range(5):
+        store.append("multiply", i, 2, i * 2)
+    assert store.summarize().count == 5
+    restarted = HistoryStore(path)
+    restarted.append("multiply", 5, 2, 10)
+    assert totals(restarted.summarize()) == {"multiply": (6, Decimal(30), Decimal(0), Decimal(10))}
+    assert not scans
+
+def test_deleting_extremes_needs_no_scan(tmp_path, scans):
+    """Deleting an operation's minimum or maximum moves on to the next kept value without a scan."""
+    store = HistoryStore(str(tmp_path / "history.csv"))
+    for i in range(100):
+        store.append("add", i, 1, i + 1)
+    for deleted in range(10):
+        store.delete(0)
+        store.delete(len(store) - 1)
+        stats = store.summarize().operations["add"]
+        assert (stats.minimum, stats.maximum) == (Decimal(deleted + 2), Decimal(99 - deleted))
+    assert HistoryStore(store.file_path).summarize().operations["add"].minimum == Decimal(11)
+    assert not scans
+
+def test_rescan_once_the_kept_extremes_are_used_up(tmp_path, scans, monkeypatch):
+    """Only deleting every kept low (or high) result since the last scan leaves the next extreme unknown."""
+    monkeypatch.setattr("app.history.summary.EXTREMES", 2)
+    store = HistoryStore(str(tmp_path / "history.csv"))
+    for i in range(5):
+        store.append("add", i, 1, i + 1)
+    store.delete(0)
+    store.delete(0)
+    assert store.summary.stale and not scans
+    assert store.summarize().operations["add"].minimum == Decimal(3)
+    store.summarize()
+    assert len(scans) == 1
+
+def test_random_changes_match_a_rebuild(tmp_path, monkeypatch):
+    """Kept extremes stay exact under random appends and deletes with repeated values."""
+    monkeypatch.setattr("app.history.summary.EXTREMES", 3)
+    generator = random.Random(5)
+    store = HistoryStore(str(tmp_path / "history.csv"), compact_threshold=1000)  # No background compaction
+    for _ in range(300):
+        if len(store) and generator.random() < 0.4:
+            store.delete(generator.randrange(len(store)))
+        else:
+            store.append(generator.choice(["add", "multiply"]), 0, 0, generator.randrange(10))
+        for name, stats in store.summary.operations.items():
+            expected = HistorySummary.build(store.backend.iter_live_rows()).operations[name]
+            assert (stats.count, stats.total) == (expected.count, expected.total)
+            assert stats.minimum in (None, expected.minimum) and stats.maximum in (None, expected.maximum)
+            assert stats.lowest == expected.lowest[:len(stats.lowest)]
+            assert stats.highest == expected.highest[len(expected.highest) - len(stats.highest):]
+
+def test_changes_by_another_store_are_picked_up(tmp_path, scans):
+    """A summary persisted before another process wrote the history is rebuilt, not trusted."""
+    path = str(tmp_path / "history.csv")
+    store = HistoryStore(path)
+    store.append("add", 1, 1, 2)
+    store.summarize()
+    other = HistoryStore(path)
+    other.summary_checked = True  # Writes without keeping the aggregates, like an older version would
+    other.append("add", 5, 5, 10)
+    assert totals(store.summarize()) == {"add": (2, Decimal(12), Decimal(2), Decimal(10))}
+    assert len(scans) == 1
+
+def test_unreadable_summary_is_rebuilt(tmp_path, scans):
+    path = str(tmp_path / "history.csv")
+    HistoryStore(path).append("subtract", 5, 2, 3)
+    with open(f"{path}.summary", "w", encoding="utf-8") as handle:
+        handle.write("{not json")
+    assert totals(HistoryStore(path).summarize()) == {"subtract": (1, Decimal(3), Decimal(3), Decimal(3))}
+    assert len(scans) == 1
+
+def test_summary_command(capsys):
+    """'summary' prints one line of aggregates per operation."""
+    app = App()
+    app.load_plugins()
+    app.handle_command("summary")
+    assert "No history available." in capsys.readouterr().out
+    for command in ("add 1 2", "add 3 4", "multiply 2 5"):
+        app.handle_command(command)
+    capsys.readouterr()
+    app.handle_command("summary")
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split() == ["operation", "count", "sum", "min", "max", "mean"]
+    assert lines[1].split() == ["add", "2", "10", "3", "7", "5"]
+    assert lines[2].split() == ["multiply", "1", "10", "10", "10", "10"]
+    app.handle_command("summary all")
+    assert capsys.readouterr().out == "Invalid format. Please use 'summary'.\n"
+    assert ShowHistoryManager.get_store().summary is not None
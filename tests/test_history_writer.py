@@ -0,0 +1,155 @@
+"""Tests for write-behind history writing."""
+
+import os
+import subprocess
+import sys
+import time
+import pytest
+
+from app import App, ShowHistoryManager
+from app.history.store import HistoryStore
+from app.history.writer import WriteBehindWriter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def stored_results(path):
+    return [row[3] for row in HistoryStore(path).read_range(0)[0]]
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+@pytest.fixture
+def fsyncs(monkeypatch):
+    """Count backend fsyncs."""
+    calls = []
+    monkeypatch.setattr("app.history.backends.CsvBackend.fsync", lambda backend: calls.append(backend.path))
+    return calls
+
+def test_appends_are_written_in_groups(tmp_path, fsyncs):
+    """Appends return at once; a full batch wakes the writer, which writes and fsyncs it as one group."""
+    path = str(tmp_path / "history.csv")
+    store = HistoryStore(path)
+    writer = WriteBehindWriter(store, batch_size=3, flush_interval=60).start()
+    store.append("add", 1, 1, 2)
+    store.append("add", 2, 2, 4)
+    assert not os.path.exists(path)
+    store.append("add", 3, 3, 6)
+    assert wait_until(lambda: writer.groups == 1)
+    assert stored_results(path) == ["2", "4", "6"] and len(fsyncs) == 1
+    store.append("add", 4, 4, 8)
+    writer.stop()
+    assert stored_results(path) == ["2", "4", "6", "8"] and len(fsyncs) == 2
+    assert store.buffer is None and writer.records == 4
+
+def test_flush_interval_bounds_the_delay(tmp_path, fsyncs):
+    """A partial group is written once the flush interval has passed."""
+    path = str(tmp_path / "history.csv")
+    store = HistoryStore(path)
+    writer = WriteBehindWriter(store, batch_size=1000, flush_interval=0.02).start()
+    store.append("add", 1, 1, 2)
+    assert wait_until(lambda: writer.records == 1)
+    assert stored_results(path) == ["2"]
+    writer.stop()
+
+@pytest.mark.parametrize("durability, fsyncs_before_stop", [("batch", 2), ("interval", 1), ("exit", 0)])
+def test_durability_settings(tmp_path, fsyncs, durability, fsyncs_before_stop):
+    """fsync after every group, at most once per interval, or only when stopping."""
+    store = HistoryStore(str(tmp_path / "history.csv"))
+    writer = WriteBehindWriter(store, batch_size=1, flush_interval=60, durability=durability, fsync_interval=60)
+    writer.last_fsync -= 60  # The first group is already due for an interval fsync
+    writer.start()
+    for i in range(2):
+        store.append("add", i, i, i + i)
+        assert wait_until(lambda i=i: writer.groups == i + 1)
+    assert len(fsyncs) == fsyncs_before_stop
+    writer.stop()
+    assert len(fsyncs) == fsyncs_before_stop + (0 if durability == "batch" else 1)
+
+def test_sqlite_history_is_written_from_the_writer_thread(tmp_path):
+    """The writer thread uses its own SQLite connection, so rows appended on either thread are kept."""
+    store = HistoryStore(str(tmp_path / "history.db"), backend="sqlite")
+    store.append("add", 0, 0, 0)  # Opens a connection on the main thread first
+    writer = WriteBehindWriter(store, batch_size=2, flush_interval=60).start()
+    for i in range(1, 6):
+        store.append("add", i, i, i + i)
+    assert wait_until(lambda: writer.records >= 2)
+    writer.stop()
+    assert writer.thread is None and len(store) == 6
+    assert [row[3] for row in store.read_range(0)[0]] == ["0", "2", "4", "6", "8", "10"]
+
+def test_failed_group_is_kept_and_retried(tmp_path, monkeypatch):
+    """A group whose write fails with an OSError stays buffered, and the writer keeps running to write it later."""
+    store = HistoryStore(str(tmp_path / "history.csv"))
+    original = type(store.backend).write
+    failures = [OSError("disk full")]
+
+    def failing_write(backend, records):
+        if failures:
+            raise failures.pop()
+        original(backend, records)
+    monkeypatch.setattr(type(store.backend), "write", failing_write)
+    writer = WriteBehindWriter(store, batch_size=2, flush_interval=0.02).start()
+    store.append("add", 1, 1, 2)
+    store.append("add", 2, 2, 4)
+    assert wait_until(lambda: writer.records == 2)
+    assert writer.thread.is_alive() and not failures
+    store.append("add", 3, 3, 6)
+    writer.stop()
+    assert stored_results(store.file_path) == ["2", "4", "6"]
+
+
+def test_unwritable_record_is_dropped_once(tmp_path, caplog):
+    """A record the backend can never store is logged and dropped; the rest of its group and later ones are written."""
+    store = HistoryStore(str(tmp_path / "history.col"), backend="columnar")
+    writer = WriteBehindWriter(store, batch_size=3, flush_interval=0.02).start()
+    store.append("add", 1, 1, 2)
+    store.append("mean", "1 " * 40000, "", 1)  # Too long for the columnar length prefix
+    store.append("add", 2, 2, 4)
+    assert wait_until(lambda: writer.records == 2)
+    store.append("add", 3, 3, 6)
+    assert wait_until(lambda: writer.records == 3)
+    writer.stop()
+    assert [record.getMessage() for record in caplog.records if record.levelname == "ERROR"] == [
+        "Dropped a mean history record that cannot be written: History value too long for the columnar backend: "
+        "80000 bytes in operand1 (at most 65535)."]
+    assert len(store) == 3
+    assert [row[3] for row in HistoryStore(store.file_path, backend="columnar").read_range(0)[0]] == ["2", "4", "6"]
+
+def test_invalid_settings_are_rejected(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.csv"))
+    with pytest.raises(ValueError, match="Unknown durability"):
+        WriteBehindWriter(store, durability="never")
+    with pytest.raises(ValueError):
+        WriteBehindWriter(store, batch_size=0)
+
+def test_repl_flushes_on_keyboard_interrupt(monkeypatch):
+    """Records queued by the REPL are written when Ctrl-C ends the session."""
+    monkeypatch.setenv("HISTORY_WRITE_BEHIND", "on")
+    monkeypatch.setenv("HISTORY_FLUSH_MS", "60000")
+    inputs = iter(["add 1 2", "multiply 3 4"])
+
+    def fake_input(_):
+        try:
+            return next(inputs)
+        except StopIteration:
+            raise KeyboardInterrupt from None
+    monkeypatch.setattr("builtins.input", fake_input)
+    app = App()
+    assert app.history_writer is not None
+    with pytest.raises(SystemExit):
+        app.start()
+    assert app.history_writer is None
+    assert stored_results(ShowHistoryManager.FILE_PATH) == ["3", "12"]
+
+def test_sys_exit_flushes_at_interpreter_exit(tmp_path):
+    """A plain sys.exit() still writes the queued records, through the atexit hook."""
+    path = str(tmp_path / "history.csv")
+    env = dict(os.environ, HISTORY_WRITE_BEHIND="on", HISTORY_FLUSH_MS="60000", HISTORY_FSYNC="exit",
+               HISTORY_FILE=path)
+    code = "import sys, main; app = main.App(); app.load_plugins(); app.handle_command('add 2 2'); sys.exit(3)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, check=False)
+    assert result.returncode == 3
+    assert stored_results(path) == ["4"]
@@ -0,0 +1,54 @@
+"""Tests for queue-based logging."""
+
+import logging
+import threading
+from logging.handlers import QueueHandler
+from app import App
+from app.log_queue import DeferredQueueHandler, start_queue_logging, stop_queue_logging
+
+class ListHandler(logging.Handler):
+    """Collects formatted messages and the thread that handled them."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+        self.threads = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+        self.threads.append(threading.current_thread().name)
+
+def test_queue_logging_hands_records_to_a_listener_thread():
+    """Records go through the queue, are formatted by the listener and the handlers come back on stop."""
+    logger = logging.getLogger("calculator.test.queue")
+    logger.setLevel(logging.INFO)
+    target = ListHandler()
+    logger.addHandler(target)
+    listener = start_queue_logging(logger)
+    try:
+        assert [type(handler) for handler in logger.handlers] == [DeferredQueueHandler]
+        assert start_queue_logging(logger) is None  # Already queued
+        logger.info("The result of %s + %s is %s", 1, 2, 3)
+    finally:
+        stop_queue_logging(listener, logger)
+    assert target.messages == ["The result of 1 + 2 is 3"]
+    assert target.threads != ["MainThread"]
+    assert logger.handlers == [target]
+    logger.removeHandler(target)
+
+def test_app_enables_queue_logging_from_environment(monkeypatch):
+    """LOG_QUEUE=true moves the root handlers behind a queue."""
+    root = logging.getLogger()
+    listeners = []
+    monkeypatch.setenv("LOG_QUEUE", "true")
+    monkeypatch.setattr("app.log_queue.start_queue_logging",
+                        lambda: listeners.append(start_queue_logging()) or listeners[-1])
+    try:
+        App()
+        assert any(isinstance(handler, QueueHandler) for handler in root.handlers)
+    finally:
+        for listener in listeners:
+            if listener is not None:
+                stop_queue_logging(listener)
+    assert all(not isinstance(handler, QueueHandler) for handler in root.handlers)
+    assert root.handlers
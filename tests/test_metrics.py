@@ -0,0 +1,83 @@
+"""Tests for command and history latency metrics."""
+
+import json
+import pytest
+from app import App
+from app.metrics import METRICS, LatencyHistogram, Metrics
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    """Start every test with empty, enabled metrics."""
+    METRICS.reset()
+    METRICS.enabled = True
+    yield
+    METRICS.reset()
+    METRICS.enabled = True
+
+def test_histogram_percentiles_are_close():
+    """Bucketed percentiles stay within the bucket resolution of the exact values."""
+    histogram = LatencyHistogram()
+    for i in range(1, 1001):
+        histogram.record(i / 1e5)  # 10 us .. 10 ms, uniform
+    assert histogram.count == 1000
+    for percent, exact in ((50, 5e-3), (95, 9.5e-3), (99, 9.9e-3)):
+        assert histogram.percentile(percent) == pytest.approx(exact, rel=0.15)
+    assert histogram.percentile(100) == pytest.approx(1e-2)
+
+def test_timed_counts_errors():
+    """Exceptions inside a timed block are recorded as errors and re-raised."""
+    metrics = Metrics()
+    with metrics.timed("work"):
+        pass
+    with pytest.raises(ValueError):
+        with metrics.timed("work"):
+            raise ValueError
+    summary = metrics.snapshot()["work"]
+    assert summary["count"] == 2 and summary["errors"] == 1
+
+def test_commands_and_history_are_recorded(capfd):
+    """Dispatching through the app records the command, the dispatch and the history write."""
+    app = App()
+    app.load_plugins()
+    app.handle_command("add 1 2")
+    app.handle_command("divide 1 0")
+    snapshot = METRICS.snapshot()
+    assert snapshot["command.add"]["count"] == 1
+    assert snapshot["command.divide"]["errors"] == 1
+    assert snapshot["app.dispatch"]["count"] == 2
+    assert snapshot["history.add"]["count"] == 1
+
+    capfd.readouterr()
+    app.handle_command("stats")
+    table = capfd.readouterr().out
+    assert "command.add" in table and "p99 ms" in table
+    app.handle_command("stats json")
+    assert json.loads(capfd.readouterr().out)["command.add"]["count"] == 1
+
+def test_prometheus_export(tmp_path, capfd):
+    """'stats prometheus' prints a scrapeable histogram and never writes a caller-supplied path."""
+    app = App()
+    app.load_plugins()
+    app.handle_command("multiply 2 3")
+    capfd.readouterr()
+    path = tmp_path / "metrics.prom"
+    app.handle_command(f"stats prometheus {path}")
+    assert not path.exists() and "Invalid format" in capfd.readouterr().out
+    app.handle_command("stats prometheus")
+    text = capfd.readouterr().out
+    assert "# TYPE calculator_latency_seconds histogram" in text
+    assert 'calculator_latency_seconds_count{name="command.multiply"} 1' in text
+    assert 'calculator_latency_seconds_bucket{name="command.multiply",le="+Inf"} 1' in text
+    app.handle_command("stats reset")
+    assert "reset" in capfd.readouterr().out
+    assert "command.multiply" not in METRICS.snapshot()
+
+def test_metrics_can_be_disabled(monkeypatch, capfd):
+    """METRICS=off stops recording."""
+    monkeypatch.setenv("METRICS", "off")
+    app = App()
+    app.load_plugins()
+    app.handle_command("add 1 2")
+    assert METRICS.snapshot() == {}
+    app.handle_command("stats")
+    assert "disabled" in capfd.readouterr().out
@@ -0,0 +1,60 @@
+"""Tests for the decimal/float numeric mode."""
+
+from decimal import Decimal, getcontext
+import pytest
+
+from app import App
+from app.plugins.add import AddCommand
+from app.plugins.divide import DivideCommand
+from calculator.expression import evaluate_expression
+from calculator.numeric import DEFAULT_PRECISION, NumericMode
+from calculator.parallel import ParallelEvaluator
+
+def test_decimal_mode_is_exact_and_float_mode_is_binary(capsys):
+    """The same command gives exact results in decimal mode and binary rounding in float mode."""
+    AddCommand().execute("0.1", "0.2")
+    NumericMode.configure("float")
+    AddCommand().execute("0.1", "0.2")
+    assert capsys.readouterr().out.splitlines() == [
+        "The result of 0.1 + 0.2 is 0.3", "The result of 0.1 + 0.2 is 0.30000000000000004"]
+
+def test_decimal_precision_applies_to_commands_and_expressions(capsys):
+    """DECIMAL_PRECISION limits the significant digits of every result."""
+    NumericMode.configure("decimal", 5)
+    DivideCommand().execute("2", "3")
+    assert capsys.readouterr().out == "The result of 2 / 3 is 0.66667\n"
+    assert evaluate_expression("1 / 7") == Decimal("0.14286")
+
+def test_expressions_and_parallel_follow_the_mode():
+    """Expressions are recompiled per mode and parallel workers use the caller's mode."""
+    assert isinstance(evaluate_expression("0.1 + 0.2"), Decimal)
+    NumericMode.configure("float")
+    assert evaluate_expression("0.1 + 0.2") == 0.1 + 0.2
+    with ParallelEvaluator(workers=2, chunk_size=1) as evaluator:
+        assert evaluator.evaluate([("0.1", "0.2", "add"), ("1", "3", "divide")]) == [0.1 + 0.2, 1 / 3]
+
+def test_invalid_modes_and_numbers_are_rejected():
+    """Unknown modes, non-positive precision and non-numeric operands raise ValueError."""
+    with pytest.raises(ValueError, match="Unknown numeric mode"):
+        NumericMode.configure("binary")
+    with pytest.raises(ValueError):
+        NumericMode.configure("decimal", 0)
+    with pytest.raises(ValueError, match="Invalid number"):
+        NumericMode.parse("abc")
+    with pytest.raises(ValueError, match="valid numbers"):
+        DivideCommand().execute("6", "x")
+
+def test_app_reads_numeric_mode_settings(monkeypatch):
+    """NUMERIC_MODE and DECIMAL_PRECISION are applied on startup; invalid values are ignored."""
+    monkeypatch.setenv("NUMERIC_MODE", "float")
+    App()
+    assert NumericMode.number_type is float
+    monkeypatch.setenv("NUMERIC_MODE", "decimal")
+    monkeypatch.setenv("DECIMAL_PRECISION", "12")
+    App()
+    assert NumericMode.number_type is Decimal and getcontext().prec == 12
+    monkeypatch.setenv("DECIMAL_PRECISION", "lots")
+    App()
+    assert getcontext().prec == 12
+    NumericMode.configure("decimal")
+    assert getcontext().prec == DEFAULT_PRECISION
@@ -0,0 +1,61 @@
+"""Tests for process-pool parallel evaluation."""
+
+from decimal import Decimal, localcontext
+import pytest
+
+from calculator import Calculator
+from calculator.calculation_history import Calculations
+from calculator.operations import OPERATIONS, OPERATION_CODES, add, divide
+from calculator.parallel import ParallelEvaluator
+
+CALCULATIONS = [(i, i % 7, op) for i, op in enumerate(["add", "subtract", "multiply", "divide"] * 25)]
+
+def expected_results():
+    results = []
+    for a, b, op in CALCULATIONS:
+        try:
+            results.append(OPERATIONS[OPERATION_CODES[op]](Decimal(a), Decimal(b)))
+        except ValueError:
+            results.append(None)
+    return results
+
+def test_parallel_results_keep_input_order():
+    """Chunks evaluated by several workers are merged back in input order."""
+    expected = expected_results()
+    with ParallelEvaluator(workers=2, chunk_size=7) as evaluator:
+        results = evaluator.evaluate(CALCULATIONS)
+    assert [None if isinstance(result, ValueError) else result for result in results] == expected
+    assert str(results[7]) == "Cannot divide by zero"
+
+def test_parallel_uses_callers_decimal_context():
+    """Workers evaluate with the caller's decimal precision."""
+    with localcontext() as context:
+        context.prec = 5
+        with ParallelEvaluator(workers=2, chunk_size=1) as evaluator:
+            results = evaluator.evaluate([(1, 3, divide), (2, 3, "divide")])
+    assert results == [Decimal("0.33333"), Decimal("0.66667")]
+
+def test_evaluate_parallel_records_history_in_order():
+    """Calculator.evaluate_parallel appends one history entry per input, in order."""
+    Calculations.clear_history()
+    results = Calculator.evaluate_parallel([(1, 2, add), (6, 0, "divide"), (5, 5, "multiply")], workers=2, chunk_size=1)
+    assert results[0] == Decimal(3) and isinstance(results[1], ValueError) and results[2] == Decimal(25)
+    assert [repr(calculation) for calculation in Calculations.get_history()] == [
+        "Calculation(1, 2, add)", "Calculation(6, 0, divide)", "Calculation(5, 5, multiply)"]
+
+def test_evaluate_parallel_indexes_worker_results(monkeypatch):
+    """History indexing takes the workers' results instead of recomputing the batch in the parent."""
+    def recompute(calculation):
+        raise AssertionError(f"{calculation} was computed again")
+    monkeypatch.setattr("calculator.calculation_history.result_of", recompute)
+    Calculations.clear_history()
+    Calculator.evaluate_parallel([(1, 2, add), (6, 0, "divide"), (5, 5, "multiply")], workers=2, chunk_size=1)
+    assert [repr(calculation) for calculation in Calculations.find_in_range("result")] == [
+        "Calculation(1, 2, add)", "Calculation(5, 5, multiply)"]
+
+def test_parallel_rejects_bad_input():
+    """Unknown operations and chunk sizes are rejected."""
+    with pytest.raises(ValueError, match="Unknown operation"):
+        ParallelEvaluator(workers=1).evaluate([(1, 2, "power")])
+    with pytest.raises(ValueError):
+        ParallelEvaluator(chunk_size=0)
@@ -0,0 +1,81 @@
+"""Tests for the plugin manifest and lazy plugin loading."""
+
+import subprocess
+import sys
+import pytest
+
+from app import App
+from app.commands import CommandHandler, LazyCommand
+from app.plugin_manifest import MANIFEST_FILE, load_manifest
+
+PLUGIN_SOURCE = '''from app.commands import Command
+
+class {name}Command(Command):
+    def execute(self, *args):
+        print("{name}", *args)
+'''
+
+@pytest.fixture
+def plugins(tmp_path, monkeypatch):
+    """A throwaway plugins package on sys.path; returns a function that adds a plugin to it."""
+    package = tmp_path / "fakeplugins"
+    package.mkdir()
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    def add_plugin(name):
+        (package / name.lower()).mkdir()
+        (package / name.lower() / "__init__.py").write_text(PLUGIN_SOURCE.format(name=name), encoding="utf-8")
+    yield package, add_plugin
+    for module in [module for module in sys.modules if module.startswith("fakeplugins")]:
+        del sys.modules[module]
+
+def test_manifest_is_reused_until_plugins_change(plugins):
+    """A fresh manifest is used without importing plugins; adding a plugin rebuilds it."""
+    package, add_plugin = plugins
+    add_plugin("Hello")
+    assert load_manifest("fakeplugins", str(package)) == {"hello": "HelloCommand"}
+    assert (package / MANIFEST_FILE).exists()
+
+    del sys.modules["fakeplugins.hello"]
+    assert load_manifest("fakeplugins", str(package)) == {"hello": "HelloCommand"}
+    assert "fakeplugins.hello" not in sys.modules
+
+    add_plugin("Goodbye")
+    assert load_manifest("fakeplugins", str(package)) == {"goodbye": "GoodbyeCommand", "hello": "HelloCommand"}
+
+def test_broken_plugins_are_left_out_of_the_manifest(plugins):
+    """Plugins that fail to import are logged and skipped."""
+    package, add_plugin = plugins
+    add_plugin("Hello")
+    (package / "broken").mkdir()
+    (package / "broken" / "__init__.py").write_text("import not_a_real_module\n", encoding="utf-8")
+    assert load_manifest("fakeplugins", str(package)) == {"hello": "HelloCommand"}
+
+def test_lazy_command_imports_its_module_on_first_use(plugins, capsys):
+    """The plugin module is imported on the first call and then replaces the placeholder."""
+    _, add_plugin = plugins
+    add_plugin("Hello")
+    handler = CommandHandler()
+    handler.register_lazy_command("hello", "fakeplugins.hello", "HelloCommand")
+    assert isinstance(handler.commands["hello"], LazyCommand)
+    assert "fakeplugins.hello" not in sys.modules
+
+    handler.execute_command("hello world")
+    handler.execute_command("HELLO again")
+    assert capsys.readouterr().out == "Hello world\nHello again\n"
+    assert type(handler.commands["hello"]).__name__ == "HelloCommand"
+    assert handler.dispatch["hello"] == handler.commands["hello"].execute
+
+def test_startup_registers_plugins_without_importing_them():
+    """With a current manifest, loading plugins imports none of the plugin modules."""
+    App().load_plugins()  # Make sure the manifest is up to date
+    code = (
+        "import sys, main; app = main.App(); app.load_plugins(); "
+        "print(','.join(sorted(app.command_handler.commands))); "
+        "print(','.join(sorted(m for m in sys.modules if m.startswith('app.plugins.'))))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    registered, imported = result.stdout.splitlines()
+    assert {"add", "subtract", "multiply", "divide", "eval", "menu", "history"} <= set(registered.split(","))
+    assert imported == "app.plugins.menu"  # Built in, imported by the app itself
@@ -0,0 +1,71 @@
+"""Tests for the session profiler."""
+
+import glob
+import os
+import pstats
+import cProfile
+import pytest
+from app import App
+from app.profiler import collapsed_stacks
+
+def test_batch_run_writes_profile_when_enabled(tmp_path, monkeypatch, capsys):
+    """PROFILE=true writes pstats and collapsed stacks to logs/ and prints a summary."""
+    monkeypatch.setenv("PROFILE", "true")
+    monkeypatch.setenv("PROFILE_TOP", "5")
+    script = tmp_path / "commands.txt"
+    script.write_text("add 1 2\nmultiply 3 4\n", encoding="utf-8")
+    before = set(glob.glob(os.path.join("logs", "profile-batch-*")))
+    app = App()
+    try:
+        assert app.run_batch(str(script)) == 2
+        created = set(glob.glob(os.path.join("logs", "profile-batch-*"))) - before
+        assert {os.path.splitext(path)[1] for path in created} == {".pstats", ".collapsed"}
+        pstats_path = next(path for path in created if path.endswith(".pstats"))
+        assert pstats.Stats(pstats_path).total_calls > 0
+        err = capsys.readouterr().err
+        assert "Profile written to" in err and "cumulative" in err
+    finally:
+        for path in set(glob.glob(os.path.join("logs", "profile-batch-*"))) - before:
+            os.remove(path)
+
+def test_repl_session_writes_profile_when_enabled(monkeypatch, capsys):
+    """PROFILE=true profiles the interactive REPL too, up to the 'exit' command."""
+    monkeypatch.setenv("PROFILE", "true")
+    inputs = iter(["add 1 2", "exit"])
+    monkeypatch.setattr("builtins.input", lambda _: next(inputs))
+    before = set(glob.glob(os.path.join("logs", "profile-repl-*")))
+    app = App()
+    try:
+        with pytest.raises(SystemExit):
+            app.start()
+        created = set(glob.glob(os.path.join("logs", "profile-repl-*"))) - before
+        assert {os.path.splitext(path)[1] for path in created} == {".pstats", ".collapsed"}
+        assert "Profile written to" in capsys.readouterr().err
+    finally:
+        for path in set(glob.glob(os.path.join("logs", "profile-repl-*"))) - before:
+            os.remove(path)
+
+def test_profiling_is_off_by_default(capsys):
+    """Without PROFILE nothing is profiled."""
+    app = App()
+    with app.profiling("batch"):
+        pass
+    assert "Profile written" not in capsys.readouterr().err
+
+def test_collapsed_stacks_follow_callers():
+    """Each function's own time is reported under the stack of its callers."""
+    def leaf():
+        total = 0
+        for i in range(20000):
+            total += i
+        return total
+
+    def middle():
+        return leaf()
+
+    profile = cProfile.Profile()
+    profile.runcall(middle)
+    lines = collapsed_stacks(pstats.Stats(profile))
+    leaf_lines = [line for line in lines if ":leaf " in line]
+    assert leaf_lines and ":middle;" in leaf_lines[0]
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
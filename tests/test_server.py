@@ -0,0 +1,63 @@
+"""Tests for the asyncio line-protocol server."""
+
+import asyncio
+from app import App, ShowHistoryManager
+from app.server import CalculatorServer, PROMPT
+
+async def send(reader, writer, line):
+    writer.write(f"{line}\n".encode("utf-8"))
+    await writer.drain()
+    return (await reader.readuntil(PROMPT.encode("utf-8"))).decode("utf-8")[:-len(PROMPT)]
+
+def run_with_server(scenario):
+    """Start a server on a free port, run scenario(server) against it and shut it down."""
+    app = App()
+    app.load_plugins()
+    server = CalculatorServer(app.command_handler, ShowHistoryManager.get_store(), port=0, flush_interval=0.01)
+
+    async def main():
+        await server.start()
+        try:
+            return await scenario(server)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+def test_server_runs_commands_for_concurrent_clients():
+    """Each client gets its own output while history is shared by every session."""
+    async def scenario(server):
+        clients = [await asyncio.open_connection("127.0.0.1", server.port) for _ in range(5)]
+        for reader, _ in clients:
+            await reader.readuntil(PROMPT.encode("utf-8"))  # Greeting
+        outputs = await asyncio.gather(*(send(reader, writer, f"add {i} 1")
+                                         for i, (reader, writer) in enumerate(clients)))
+        unknown = await send(*clients[0], "bogus")
+        for _, writer in clients:
+            writer.close()
+        return outputs, unknown
+
+    outputs, unknown = run_with_server(scenario)
+    assert outputs == [f"The result of {i} + 1 is {i + 1}\n" for i in range(5)]
+    assert unknown == "No such command: bogus\n"
+    rows, total = ShowHistoryManager.get_store().read_range(0)
+    assert total == 5
+    assert sorted(row[1] for row in rows) == [str(i) for i in range(5)]
+
+def test_exit_closes_only_that_session():
+    """'exit' disconnects the client that sent it and the server keeps serving."""
+    async def scenario(server):
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        await reader.readuntil(PROMPT.encode("utf-8"))
+        writer.write(b"exit\n")
+        farewell = await reader.read()
+        writer.close()
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        await reader.readuntil(PROMPT.encode("utf-8"))
+        output = await send(reader, writer, "multiply 3 4")
+        writer.close()
+        return farewell, output
+
+    farewell, output = run_with_server(scenario)
+    assert farewell == b"Exiting...\n"
+    assert output == "The result of 3 * 4 is 12\n"
@@ -0,0 +1,22 @@
+"""Tests that keep heavy dependencies off the startup path."""
+
+import subprocess
+import sys
+
+def test_startup_does_not_import_heavy_modules():
+    """Importing main and building the App must not import pandas, numpy or dotenv."""
+    code = (
+        "import sys, main; main.App(); "
+        "print(','.join(sorted(m for m in ('pandas', 'numpy', 'dotenv') if m in sys.modules)))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+def test_history_command_imports_pandas_on_demand(tmp_path, monkeypatch, capfd):
+    """Showing history still works once pandas is imported lazily."""
+    from app import ShowHistoryManager  # pylint: disable=import-outside-toplevel
+    monkeypatch.setattr(ShowHistoryManager, "FILE_PATH", str(tmp_path / "history.csv"))
+    ShowHistoryManager.add_calculation("add", 1, 2, 3)
+    ShowHistoryManager.show_history()
+    assert ShowHistoryManager.history_df is not None
+    assert "add" in capfd.readouterr().out
@@ -0,0 +1,135 @@
+"""Tests for the streaming statistics and the statistics commands."""
+
+import random
+import statistics
+from decimal import Decimal
+import pytest
+
+from app import App, ShowHistoryManager
+from calculator.numeric import NumericMode
+from calculator.statistics import NumberFiles, QuantileSketch, RunningMoments, describe_inputs, iter_numbers
+
+def rank_of(value, ordered):
+    return sum(1 for item in ordered if item <= value) / len(ordered)
+
+def test_running_moments_match_statistics_module():
+    """Welford's update gives the same mean and sample variance, also when merged from parts."""
+    numbers = [Decimal(n) for n in ("2", "4", "4", "4", "5", "5", "7", "9")]
+    moments = RunningMoments.of(numbers)
+    assert moments.mean == Decimal(5)
+    assert moments.variance == pytest.approx(statistics.variance(numbers), rel=Decimal("1e-25"))
+    assert moments.stddev == pytest.approx(statistics.stdev(numbers), rel=Decimal("1e-25"))
+    merged = RunningMoments.of(numbers[:3])
+    merged.merge(RunningMoments.of(numbers[3:]))
+    assert merged.count == 8 and merged.mean == pytest.approx(moments.mean, rel=Decimal("1e-25"))
+    assert merged.variance == pytest.approx(moments.variance, rel=Decimal("1e-25"))
+    with pytest.raises(ValueError, match="two numbers"):
+        _ = RunningMoments.of(numbers[:1]).variance
+
+def test_sketch_is_exact_for_short_streams():
+    """Until the sketch is full, quantiles interpolate between the actual values."""
+    sketch = QuantileSketch.of([Decimal(n) for n in (5, 1, 4, 2, 3, 6)])
+    assert sketch.quantile(Decimal("0.5")) == Decimal("3.5")
+    assert sketch.quantile(0) == 1 and sketch.quantile(1) == 6
+    with pytest.raises(ValueError, match="At least one number"):
+        QuantileSketch().quantile(0.5)
+
+def test_sketch_memory_is_bounded_and_ranks_are_close():
+    """A long stream keeps a few hundred items, and merged sketches answer like one sketch."""
+    generator = random.Random(7)
+    numbers = [generator.random() for _ in range(50000)]
+    ordered = sorted(numbers)
+    halves = QuantileSketch.of(numbers[:20000])
+    halves.merge(QuantileSketch.of(numbers[20000:]))
+    for sketch in (QuantileSketch.of(numbers), halves):
+        assert sketch.count == len(numbers) and sketch.stored < 1000
+        for fraction in (0.01, 0.5, 0.99):
+            assert rank_of(sketch.quantile(fraction), ordered) == pytest.approx(fraction, abs=0.02)
+
+def test_numbers_are_streamed_from_files(tmp_path):
+    path = tmp_path / "numbers.txt"
+    path.write_text("1 2\n3,4\n\n5\n", encoding="utf-8")
+    assert list(iter_numbers(["0", f"@{path}"])) == [Decimal(n) for n in range(6)]
+    with pytest.raises(ValueError, match="Invalid number: x"):
+        list(iter_numbers(["1", "x"]))
+
+def test_file_errors_do_not_echo_the_contents(tmp_path):
+    """A bad token in a file is reported by file name and line, never by its text."""
+    path = tmp_path / "secret.txt"
+    path.write_text("1\nsecret-token-abc\n", encoding="utf-8")
+    with pytest.raises(ValueError) as error:
+        list(iter_numbers([f"@{path}"]))
+    assert str(error.value) == f"Invalid number in {path}, line 2."
+    with pytest.raises(ValueError, match="Cannot read numbers from"):
+        list(iter_numbers([f"@{tmp_path / 'missing.txt'}"]))
+
+def test_files_are_limited_to_the_data_directory(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "numbers.txt").write_text("1 2", encoding="utf-8")
+    (tmp_path / "outside.txt").write_text("3", encoding="utf-8")
+    monkeypatch.setenv("STATS_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setattr(NumberFiles, "directory", None)
+    App()
+    assert list(iter_numbers(["@numbers.txt"])) == [Decimal(1), Decimal(2)]
+    for name in ("../outside.txt", str(tmp_path / "outside.txt")):
+        with pytest.raises(ValueError, match="outside the data directory"):
+            list(iter_numbers([f"@{name}"]))
+
+def test_server_sessions_cannot_read_files(tmp_path, monkeypatch):
+    """Without a data directory, clients of --serve get no file access; the REPL keeps it afterwards."""
+    from app.server import CalculatorServer  # pylint: disable=import-outside-toplevel
+    path = tmp_path / "numbers.txt"
+    path.write_text("1", encoding="utf-8")
+    errors = []
+
+    async def serve_forever(_):
+        with pytest.raises(ValueError, match="disabled") as error:
+            list(iter_numbers([f"@{path}"]))
+        errors.append(error)
+    monkeypatch.setattr(CalculatorServer, "serve_forever", serve_forever)
+    App().serve(port=0)
+    assert len(errors) == 1
+    assert list(iter_numbers([f"@{path}"])) == [Decimal(1)]
+
+def test_statistics_commands(tmp_path, capsys):
+    """The commands run through the command handler and record one history row each."""
+    path = tmp_path / "numbers.txt"
+    path.write_text("\n".join(str(n) for n in range(1, 101)), encoding="utf-8")
+    app = App()
+    app.load_plugins()
+    for command in ("mean 1 2 3 4", "var 1 2 3 4", "stddev 2 4 4 4 5 5 7 9", f"median @{path}",
+                    f"percentile 90 @{path}", "mean", "percentile 101 1 2"):
+        app.handle_command(command)
+    assert capsys.readouterr().out.splitlines() == [
+        "The mean of 4 numbers is 2.5",
+        "The variance of 4 numbers is 1.666666666666666666666666667",
+        "The standard deviation of 8 numbers is 2.138089935299395077476427847",
+        "The median of 100 numbers is 50.5",
+        "The percentile 90 of 100 numbers is 90.1",
+        "An error occurred: Error: 'mean' command requires numbers or @file arguments, e.g. 'mean 1 2 3'.",
+        "An error occurred: Percentile must be between 0 and 100.",
+    ]
+    rows, total = ShowHistoryManager.get_store().read_range(0)
+    assert total == 5
+    assert rows[0] == ["mean", "1 2 3 4", "", "2.5"] and rows[4] == ["percentile", f"@{path}", "90", "90.1"]
+
+def test_history_rows_stay_small(monkeypatch, isolated_history, capsys):
+    """Long argument lists are shortened in the history row, so even the columnar backend can store it."""
+    assert describe_inputs(["1", "2", "@numbers.txt"], 12) == "1 2 @numbers.txt"
+    numbers = [str(n) for n in range(20000)]
+    described = describe_inputs(numbers, 20000)
+    assert len(described) <= 80 and described.startswith("0 1 2 ") and described.endswith(" ... (20000 numbers)")
+    monkeypatch.setattr(ShowHistoryManager, "FILE_PATH", isolated_history.replace(".csv", ".col"))
+    monkeypatch.setattr(ShowHistoryManager, "BACKEND", "columnar")
+    app = App()
+    app.load_plugins()
+    app.handle_command("mean " + " ".join(numbers))
+    assert capsys.readouterr().out == "The mean of 20000 numbers is 9999.5\n"
+    assert ShowHistoryManager.get_store().read_range(0) == ([["mean", described, "", "9999.5"]], 1)
+
+def test_statistics_follow_the_numeric_mode(capsys):
+    NumericMode.configure("float")
+    app = App()
+    app.load_plugins()
+    app.handle_command("mean 0.1 0.2")
+    assert capsys.readouterr().out == f"The mean of 2 numbers is {(0.1 + 0.2) / 2}\n"
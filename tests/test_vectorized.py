@@ -0,0 +1,43 @@
+"""Tests for vectorized bulk evaluation."""
+
+from decimal import Decimal
+import numpy as np
+import pytest
+
+from calculator import Calculator
+from calculator.calculation_history import Calculations
+from calculator.operations import add, subtract, multiply, divide
+from calculator.vectorized import to_codes, OPERATION_CODES
+
+def test_evaluate_bulk_matches_scalar_operations():
+    """Bulk results match the scalar operations for each element."""
+    Calculations.clear_history()
+    a = [10, 20, 3, 8]
+    b = [5, 3, 4, 2]
+    ops = ["add", "subtract", "multiply", "divide"]
+    results = Calculator.evaluate_bulk(a, b, ops)
+    expected = [func(Decimal(x), Decimal(y)) for func, x, y in zip((add, subtract, multiply, divide), a, b)]
+    assert results.tolist() == [float(value) for value in expected]
+    assert len(Calculations.get_batches()) == 1
+    assert len(Calculations.get_history()) == 0
+
+def test_evaluate_bulk_masks_division_by_zero():
+    """Divisions by zero are masked instead of raising."""
+    results = Calculator.evaluate_bulk([1, 4, 6], [0, 2, 0], [OPERATION_CODES["divide"]] * 3)
+    assert results.mask.tolist() == [True, False, True]
+    assert results[1] == 2.0
+
+def test_to_codes():
+    """Operation names and codes both convert to codes; unknown ones are rejected."""
+    assert to_codes(["divide", "add", "divide"]).tolist() == [3, 0, 3]
+    assert to_codes(np.array([1, 2])).dtype == np.uint8
+    with pytest.raises(ValueError):
+        to_codes(["power"])
+    with pytest.raises(ValueError):
+        to_codes([7])
+
+def test_clear_history_clears_batches():
+    """Clearing history also drops vectorized batches."""
+    Calculator.evaluate_bulk([1], [1], ["add"])
+    Calculations.clear_history()
+    assert not Calculations.get_batches()